@@ -0,0 +1,142 @@
+# archive.py
+
+import copy
+import glob
+import hashlib
+import json
+import logging
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import fantasyfootball.schemas  # Register schemas
+from fantasyfootball.config import DATA_DIR, CACHE_DIR
+from fantasyfootball.factories.schema_factory import SchemaFactory
+
+logger = logging.getLogger(__name__)
+
+# archive directory under DATA_DIR -> schema applied to its rows
+ARCHIVE_SCHEMAS = {
+    'year-by-year': 'prf_year_by_year',
+    'game-by-game': 'prf_game_by_game',
+}
+ARCHIVE_CACHE_DIR = os.path.join(CACHE_DIR, 'archive')
+
+def _file_hash(file_path):
+    sha1 = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+def _schema_fingerprint(schema):
+    return hashlib.sha1(repr(schema.COLUMNS).encode('utf-8')).hexdigest()
+
+def archive_files(name, data_dir=DATA_DIR):
+    """Returns the csv files of an archive, oldest season first"""
+    return sorted(glob.glob(os.path.join(data_dir, name, '*.csv')))
+
+def read_manifest(name, cache_dir=ARCHIVE_CACHE_DIR):
+    try:
+        with open(os.path.join(cache_dir, f'{name}.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def is_current(manifest, files, schema):
+    """
+    Checks a cache manifest against the archive files; a file whose size and mtime changed is only
+    considered modified when its content hash changed too, so a fresh checkout does not force a rebuild.
+    The mtimes of such files are updated in the manifest, so they are hashed only once
+    """
+    if manifest is None or manifest.get('schema') != _schema_fingerprint(schema):
+        return False
+    entries = manifest['files']
+    if sorted(entries) != sorted(os.path.basename(file_path) for file_path in files):
+        return False
+    for file_path in files:
+        entry = entries[os.path.basename(file_path)]
+        stat = os.stat(file_path)
+        if (entry['size'], entry['mtime']) != (stat.st_size, stat.st_mtime_ns):
+            if entry['size'] != stat.st_size or entry['sha1'] != _file_hash(file_path):
+                return False
+            entry['mtime'] = stat.st_mtime_ns
+    return True
+
+def read_archive_files(files, workers=None):
+    """Parses the csv files in a thread pool and concatenates them in file order"""
+    workers = workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        frames = list(executor.map(pd.read_csv, files))
+    return pd.concat(frames, ignore_index=True)
+
+def load_archive(name, data_dir=DATA_DIR, cache_dir=ARCHIVE_CACHE_DIR, use_cache=True, workers=None):
+    """
+    Loads every season of a bundled archive as one typed dataframe
+    The first load parses the csv files in parallel, applies the archive schema and writes a pickled cache;
+    later loads read the cache until a file is added, removed or its content changes
+    :name: archive directory, one of ARCHIVE_SCHEMAS
+    :use_cache: set to False to always parse the csv files
+    :workers: threads used to parse the files
+    """
+    schema = SchemaFactory.create(ARCHIVE_SCHEMAS[name])
+    files = archive_files(name, data_dir)
+    if not files:
+        raise FileNotFoundError(f"No csv files found in {os.path.join(data_dir, name)}")
+
+    cache_path = os.path.join(cache_dir, f'{name}.pkl')
+    if use_cache:
+        manifest = read_manifest(name, cache_dir)
+        stored = copy.deepcopy(manifest)
+        if is_current(manifest, files, schema) and os.path.exists(cache_path):
+            with open(cache_path, 'rb') as f:
+                df = pickle.load(f)
+            if manifest != stored:  # only touched files' mtimes changed
+                _write_manifest(name, cache_dir, manifest)
+            return df
+
+    df = schema.apply(read_archive_files(files, workers)).reset_index(drop=True)
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f'{cache_path}.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+        manifest = {
+            'schema': _schema_fingerprint(schema),
+            'files': {os.path.basename(file_path): {'size': os.stat(file_path).st_size,
+                                                    'mtime': os.stat(file_path).st_mtime_ns,
+                                                    'sha1': _file_hash(file_path)}
+                      for file_path in files},
+        }
+        _write_manifest(name, cache_dir, manifest)
+        logger.info(f"Cached {len(df)} rows of {name} to {cache_path}")
+    return df
+
+def _write_manifest(name, cache_dir, manifest):
+    with open(os.path.join(cache_dir, f'{name}.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from pathlib import Path
+
+    # Cold (parse + schema + cache write) versus warm (cache read) loads, against sequential untyped read_csv
+    data_dir = str(Path(__file__).resolve().parents[1] / 'data')
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name in ARCHIVE_SCHEMAS:
+            start = time.perf_counter()
+            raw = pd.concat((pd.read_csv(file_path) for file_path in archive_files(name, data_dir)), ignore_index=True)
+            baseline = time.perf_counter() - start
+
+            start = time.perf_counter()
+            load_archive(name, data_dir, cache_dir)
+            cold = time.perf_counter() - start
+
+            start = time.perf_counter()
+            df = load_archive(name, data_dir, cache_dir)
+            warm = time.perf_counter() - start
+            print(f"{name}: read_csv {baseline:.3f}s, cold {cold:.3f}s, warm {warm:.3f}s "
+                  f"({raw.memory_usage(deep=True).sum() / 1e6:.1f} MB untyped, {df.memory_usage(deep=True).sum() / 1e6:.1f} MB typed)")
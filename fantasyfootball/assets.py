@@ -0,0 +1,216 @@
+# assets.py
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import pandas as pd
+import requests
+from PIL import Image
+from fantasyfootball.config import LOGO_DIR, ASSET_MANIFEST
+
+logger = logging.getLogger(__name__)
+
+TEAMS_URL = r'https://raw.githubusercontent.com/nflverse/nflfastR-data/master/teams_colors_logos.csv'
+# asset kind -> column of the teams csv holding its url; each kind is a directory under LOGO_DIR
+ASSET_COLUMNS = {
+    'espn': 'team_logo_espn',
+    'wikipedia': 'team_logo_wikipedia',
+    'wordmarks': 'team_wordmark',
+}
+# longest side in pixels of the resized copies written next to every asset, as '<team>_<size>.png'
+VARIANT_SIZES = (100,)
+
+def _sha1(content):
+    return hashlib.sha1(content).hexdigest()
+
+def _write_atomic(file_path, content):
+    """Writes through a temporary file so readers never see half a file"""
+    tmp_path = f'{file_path}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, file_path)
+
+def read_manifest(manifest_path=ASSET_MANIFEST):
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'teams': {}, 'assets': {}}
+
+def write_manifest(manifest, manifest_path=ASSET_MANIFEST):
+    _write_atomic(manifest_path, json.dumps(manifest, indent=1, sort_keys=True).encode('utf-8'))
+
+def _file_matches(file_path, entry):
+    """The local file is still the one the manifest describes"""
+    try:
+        if os.path.getsize(file_path) != entry.get('size'):
+            return False
+        with open(file_path, 'rb') as f:
+            return _sha1(f.read()) == entry.get('sha1')
+    except OSError:
+        return False
+
+def _conditional_get(session, url, entry, file_path, timeout):
+    """
+    Downloads url unless the server says the copy described by entry is current (ETag or Last-Modified)
+    :return: (response, status) with status 'not modified' (304), 'unchanged' (same content hash) or 'downloaded'
+    """
+    headers = {}
+    if entry and _file_matches(file_path, entry):
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    response = session.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        return response, 'not modified'
+    response.raise_for_status()
+    if entry and entry.get('sha1') == _sha1(response.content) and _file_matches(file_path, entry):
+        return response, 'unchanged'
+    return response, 'downloaded'
+
+def _entry(url, response, content, previous=None):
+    """Manifest entry of a fetched file; a 304 keeps the previous validators unless the server sent new ones"""
+    previous = previous or {}
+    return {'url': url,
+            'etag': response.headers.get('ETag', previous.get('etag')),
+            'last_modified': response.headers.get('Last-Modified', previous.get('last_modified')),
+            'sha1': _sha1(content) if content is not None else previous.get('sha1'),
+            'size': len(content) if content is not None else previous.get('size')}
+
+def make_variants(file_path, sizes=VARIANT_SIZES):
+    """
+    Writes resized copies of an image whose longest side is each size in pixels, as '<stem>_<size>.png'
+    Images already smaller than a size are copied as they are
+    :return: size -> file name of the variant
+    """
+    stem = os.path.splitext(file_path)[0]
+    variants = {}
+    with Image.open(file_path) as image:
+        image.load()
+        for size in sizes:
+            variant = image.copy()
+            if variant.mode == 'P':  # palette images are only resized with nearest neighbour
+                variant = variant.convert('RGBA')
+            if variant.mode == 'RGBA':
+                variant = variant.convert('RGBa')
+            variant.thumbnail((size, size), Image.LANCZOS)
+            if variant.mode == 'RGBa':
+                variant = variant.convert('RGBA')
+            buffer = io.BytesIO()
+            variant.save(buffer, format='PNG')
+            variant_path = f'{stem}_{size}.png'
+            _write_atomic(variant_path, buffer.getvalue())
+            variants[str(size)] = os.path.basename(variant_path)
+    return variants
+
+def get_teams(session, manifest, logo_dir=LOGO_DIR, teams_url=TEAMS_URL, timeout=30):
+    """
+    Returns the nflverse teams csv, downloaded only when it changed since the last sync
+    """
+    file_path = os.path.join(logo_dir, 'teams_colors_logos.csv')
+    entry = manifest.get('teams')
+    response, status = _conditional_get(session, teams_url, entry, file_path, timeout)
+    if status == 'downloaded':
+        _write_atomic(file_path, response.content)
+    manifest['teams'] = _entry(teams_url, response, response.content if status != 'not modified' else None, entry)
+    logger.info(f"Teams csv: {status}")
+    return pd.read_csv(file_path)
+
+def sync_asset(session, team, kind, url, entry, logo_dir=LOGO_DIR, sizes=VARIANT_SIZES, timeout=30):
+    """
+    Brings one team asset up to date: downloads it when the server or the content hash says it changed,
+    and writes its resized variants when it changed or a variant is missing
+    :return: the report row and the new manifest entry (None when the download failed)
+    """
+    start = time.perf_counter()
+    extension = os.path.splitext(urlparse(url).path)[1] or '.png'
+    name = f'{team}{extension}'
+    file_path = os.path.join(logo_dir, kind, name)
+    report = {'team': team, 'kind': kind, 'file': f'{kind}/{name}', 'status': None, 'bytes': 0, 'error': None}
+    try:
+        response, status = _conditional_get(session, url, entry if (entry or {}).get('url') == url else None,
+                                            file_path, timeout)
+        content = response.content if status != 'not modified' else None
+        if status == 'downloaded':
+            _write_atomic(file_path, content)
+            report['bytes'] = len(content)
+        new_entry = {**_entry(url, response, content, entry), 'team': team, 'kind': kind, 'file': report['file']}
+        variants = (entry or {}).get('variants', {})
+        missing = any(str(size) not in variants or not os.path.exists(os.path.join(logo_dir, kind, variants[str(size)]))
+                      for size in sizes)
+        if status == 'downloaded' or missing:
+            variants = make_variants(file_path, sizes)
+        new_entry['variants'] = variants
+        report['status'] = status
+    except (requests.RequestException, OSError) as e:
+        logger.warning(f"Could not sync {kind} asset of {team} from {url}: {e}")
+        report.update(status='error', error=str(e))
+        new_entry = None
+    report['seconds'] = time.perf_counter() - start
+    return report, new_entry
+
+def sync_assets(kinds=tuple(ASSET_COLUMNS), teams=None, logo_dir=LOGO_DIR, manifest_path=None,
+                teams_url=TEAMS_URL, sizes=VARIANT_SIZES, workers=8, timeout=30):
+    """
+    Syncs team logos and wordmarks from the nflverse teams csv into logo_dir/<kind>/<team>.png, fetching
+    concurrently and skipping files the server reports as unchanged (ETag/Last-Modified) or whose content
+    hash did not change, then records every file, its validators, hash and variants in the manifest read by
+    config's nfl_logo_*_path_map
+    :kinds: asset kinds, keys of ASSET_COLUMNS
+    :teams: team abbreviations to sync, defaults to every team in the csv
+    :manifest_path: defaults to logo_dir/manifest.json, config.ASSET_MANIFEST for the default logo_dir
+    :workers: concurrent downloads
+    :return: one report row per asset with its status ('downloaded', 'not modified', 'unchanged' or 'error')
+    """
+    manifest_path = manifest_path or os.path.join(logo_dir, os.path.basename(ASSET_MANIFEST))
+    manifest = read_manifest(manifest_path)
+    manifest.setdefault('assets', {})
+    for kind in kinds:
+        os.makedirs(os.path.join(logo_dir, kind), exist_ok=True)
+    with requests.Session() as session:
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        df = get_teams(session, manifest, logo_dir, teams_url, timeout)
+        if teams is not None:
+            df = df.loc[df['team_abbr'].isin(teams)]
+        jobs = [(team, kind, url) for kind in kinds
+                for team, url in zip(df['team_abbr'], df[ASSET_COLUMNS[kind]]) if isinstance(url, str)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda job: sync_asset(session, *job, manifest['assets'].get(f'{job[1]}/{job[0]}'), logo_dir, sizes,
+                                       timeout), jobs))
+    for (team, kind, _), (_, entry) in zip(jobs, results):
+        if entry is not None:
+            manifest['assets'][f'{kind}/{team}'] = entry
+    write_manifest(manifest, manifest_path)
+    report = pd.DataFrame([result[0] for result in results],
+                          columns=['team', 'kind', 'file', 'status', 'bytes', 'seconds', 'error'])
+    logger.info(f"Synced {len(report)} assets: {report['status'].value_counts().to_dict()}")
+    return report
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sync the team logos and wordmarks")
+    parser.add_argument('--kinds', nargs='+', default=list(ASSET_COLUMNS), choices=list(ASSET_COLUMNS))
+    parser.add_argument('--teams', nargs='+', help="Team abbreviations, defaults to every team")
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(VARIANT_SIZES), help="Variant sizes in pixels")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent downloads")
+    parser.add_argument('--teams-url', default=TEAMS_URL, help="Teams csv with the asset urls")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    start = time.perf_counter()
+    report = sync_assets(args.kinds, args.teams, sizes=args.sizes, workers=args.workers, teams_url=args.teams_url)
+    print(report.groupby(['kind', 'status']).size().to_string())
+    print(f"{len(report)} assets in {time.perf_counter() - start:.2f}s")
@@ -1,11 +1,18 @@
 #config.py
 
+import functools
+import json
 import pandas as pd
 from os import path
 import numpy as np
+from fantasyfootball import scoring, vor
 
 DATA_DIR = r'..\data'
 FIGURE_DIR = r'..\figures'
+# caches and precomputed tables live in the repository's data directory, wherever the process runs
+CACHE_DIR = path.join(path.dirname(__file__), '..', 'data', 'cache')
+PLAYER_INDEX_DIR = path.join(path.dirname(__file__), '..', 'data', 'player-index')
+WEEKLY_POINTS_DIR = path.join(path.dirname(__file__), '..', 'data', 'weekly-points')
 DRIVER_PATH = r'..\chrome-driver\chromedriver.exe'
 
 #scoring systems
@@ -108,127 +115,59 @@ scoring_List = [sean, justin, work]
 
 def fantasy_pros_pts(my_df, my_dict=ppr):
     """Adds a column to a dataframe for fantasy points based on custom league specs for Fantasy Pros Projections"""
-    my_df = my_df.copy()
-    my_df[f'{my_dict["name"]}_custom_pts'] = (
-      my_df['receiving_rec'] * my_dict['receiving_rec']
-      + my_df['receiving_yds'] * my_dict['receiving_yds']
-      + my_df['receiving_td'] * my_dict['receiving_td']
-      + my_df['rushing_yds'] * my_dict['rushing_yds']
-      + my_df['rushing_td'] * my_dict['rushing_td']
-      + my_df['passing_yds'] * my_dict['passing_yds']
-      + my_df['passing_td'] * my_dict['passing_td']
-      + my_df['passing_int'] * my_dict['passing_int']
-      + my_df['fumbles'] * my_dict['fumbles']
-    )
-    return my_df
+    return scoring.add_league_points(my_df, [my_dict], stats=scoring.FANTASY_PROS_STATS)
 
 def pro_football_reference_pts(my_df, my_dict=ppr):
     """Adds a column to a dataframe for fantasy points based on custom league specs for Pro Football Reference data"""
-    my_df = my_df.copy()
-    my_df[f'{my_dict["name"]}_custom_pts'] = (
-      my_df['receiving_rec'] * my_dict['receiving_rec']
-      + my_df['receiving_yds'] * my_dict['receiving_yds']
-      + my_df['receiving_td'] * my_dict['receiving_td']
-      + my_df['rushing_yds'] * my_dict['rushing_yds']
-      + my_df['rushing_td'] * my_dict['rushing_td']
-      + my_df['passing_yds'] * my_dict['passing_yds']
-      + my_df['passing_td'] * my_dict['passing_td']
-      + my_df['passing_int'] * my_dict['passing_int']
-      + my_df['fumbles'] * my_dict['fumbles']
-      + my_df['fumbles_lost'] * my_dict['fumbles_lost']
-    )
-    return my_df
+    return scoring.add_league_points(my_df, [my_dict], stats=scoring.PRO_FOOTBALL_REFERENCE_STATS)
+
+# suffixes and symbols dropped from player names before building merge ids; applied in this order
+ID_NAME_REMOVALS = ["'", ' III', ' II', ' IV', ' V', 'Jr']
+ID_NAME_TRANSLATION = str.maketrans('', '', '.-')
+# prefixes remembered across calls; a few seasons of every source's players fit in it
+ID_NAME_CACHE_SIZE = 8192
 
+@functools.lru_cache(maxsize=ID_NAME_CACHE_SIZE)
+def _id_name_prefix(name):
+    """Normalizes a player name to the 'fir_last' part of the merge id; None when the name has fewer than two words"""
+    if not isinstance(name, str):
+        return None
+    for removal in ID_NAME_REMOVALS:
+        name = name.replace(removal, '')
+    words = name.translate(ID_NAME_TRANSLATION).lower().split()
+    if len(words) < 2:
+        return None
+    return f'{words[0][0:3]}_{words[1]}'
 
 def unique_id_create(my_df, team=False):
-    """Derives a unique ID to allow for merges across different data sources"""
+    """Derives a unique ID to allow for merges across different data sources
+    Each distinct name is normalized once and remembered (up to ID_NAME_CACHE_SIZE names), so repeated merges of the same players only pay for a lookup"""
     my_df = my_df.copy()
-    char_list = ["'", ' III', ' II', ' IV', ' V', 'Jr',  '\.', '-'] #removed ' '
-    symbol_dict = dict(zip(char_list, len(char_list)*['']))
+    codes, names = pd.factorize(my_df['player_name'])
+    prefixes = np.array([_id_name_prefix(name) for name in names] + [None], dtype=object)
+    name_id = pd.Series(prefixes[codes], index=my_df.index)
     if team:
-        my_df = (my_df.assign(id = (
-                          my_df['player_name'].replace(symbol_dict, regex=True)
-                                              .str.lower()
-                                              .str.split()
-                                              .str[0].str[0:3]
-                         + '_' 
-                         + my_df['player_name'].replace(symbol_dict, regex=True)
-                                               .str.lower()
-                                               .str.split()
-                                               .str[1]
-                         + '_' 
-                         + my_df['pos']
-                         + '_' 
-                         + my_df['tm']
-                               ).str.lower())
-                )
-    else:            
-        my_df = (my_df.assign(id = (
-                           my_df['player_name'].replace(symbol_dict, regex=True)
-                                                .str.lower()
-                                                .str.split()
-                                                .str[0].str[0:3]
-                         + '_' 
-                          + my_df['player_name'].replace(symbol_dict, regex=True)
-                                                .str.lower()
-                                                .str.split()
-                                                .str[1]
-                         + '_' 
-                         + my_df['pos']
-                               ).str.lower())
-                )
-    return my_df
+        my_id = name_id + '_' + my_df['pos'] + '_' + my_df['tm']
+    else:
+        my_id = name_id + '_' + my_df['pos']
+    return my_df.assign(id=my_id.str.lower())
 
 #VBD functions
 def value_over_last_starter(my_df, pos_list, my_dict=ppr):
     """Calculates the value for a low-end starter, given a datframe, league dict and pos list"""
-    replacement_value = {}
-    my_df = my_df.copy()
-    my_df.sort_values('adp', inplace=True)
-    for pos in pos_list:
-        pos_cutoff = my_dict[pos] * my_dict['team_n']
-        tdf = my_df.loc[my_df['pos'] == pos.upper(), [f'{my_dict["name"]}_custom_pts']]
-        tdf = tdf.head(pos_cutoff)
-        replacement_value[pos.upper()] = float(np.mean(tdf.tail(3)))
-    return replacement_value
+    return vor.replacement_values(my_df, my_dict, pos_list)['last starter'].to_dict()
 
 def value_over_avg_starter(my_df, pos_list, my_dict=ppr):
     """Calculates the avg output for a starter, given a daatframe, league dict and pos list"""
-    replacement_value = {}
-    my_df = my_df.copy()
-    my_df.sort_values('adp', inplace=True)
-    for pos in pos_list:
-        pos_cutoff = my_dict[pos] * my_dict['team_n']
-        tdf = my_df.loc[my_df['pos'] == pos.upper(), [f'{my_dict["name"]}_custom_pts']]
-        tdf = tdf.head(pos_cutoff)
-        replacement_value[pos.upper()] = float(np.mean(tdf))
-    return replacement_value
+    return vor.replacement_values(my_df, my_dict, pos_list)['avg starter'].to_dict()
 
 def value_over_replacement_player(my_df, pos_list, my_dict=ppr):
     """Calculates the replacement value for a starter, given a datframe, league dict and pos list"""
-    replacement_value = {}
-    my_df = my_df.copy()
-    my_df.sort_values('adp', inplace=True)
-    for pos in pos_list:
-        draft_cutoff = my_dict['rounds'] * my_dict['team_n']
-        tdf = my_df.head(draft_cutoff)
-        tdf = tdf.loc[my_df['pos'] == pos.upper(), [f'{my_dict["name"]}_custom_pts']]
-        replacement_value[pos.upper()] = float(np.mean(tdf.tail(3)))
-    return replacement_value
+    return vor.replacement_values(my_df, my_dict, pos_list)['replacement player'].to_dict()
 
 def value_through_n_picks(my_df, pos_list,  my_dict=ppr):
     """Calculates the value per pos through 100 picks, given a datframe, league dict and pos list"""
-    replacement_value = {}
-    pick_dict = {10: 100, 12: 120, 14: 140}
-    pick_n = pick_dict.get(my_dict['team_n'], 100)
-    my_df = my_df.copy()
-    my_df.sort_values('adp', inplace=True)
-    my_df.reset_index(inplace=True, drop=True)
-    my_df = my_df.head(pick_n)
-    for pos in pos_list:
-        tdf = my_df.loc[my_df['pos'] == pos.upper(), [f'{my_dict["name"]}_custom_pts']]
-        replacement_value[pos.upper()] = float(np.mean(tdf.tail(3))) # take the average of the last three players at the cutoff points
-    return replacement_value
+    return vor.replacement_values(my_df, my_dict, pos_list)['top n'].to_dict()
 
 
 #team abbreviation dicts
@@ -460,13 +399,41 @@ nfl_wordmarks = {
     'WAS': 'WAS_fullcolor.png'
     }
 
+LOGO_DIR = path.join(path.dirname(__file__), '..', 'figures', 'logos')
 WIKI_DIR = r'..\figures\logos\wikipedia'
 ESPN_DIR = r'..\figures\logos\espn'
 WORDMARK_DIR = r'..\figures\logos\wordmarks'
+# written by assets.sync_assets
+ASSET_MANIFEST = path.join(LOGO_DIR, 'manifest.json')
+
+def asset_path_map(kind, manifest_path=ASSET_MANIFEST, size=None):
+    """
+    Returns team -> file path of the synced assets of a kind ('espn', 'wikipedia' or 'wordmarks') from the asset manifest
+    :size: path of the resized variant of that size instead, for teams that have one
+    """
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            assets = json.load(f).get('assets', {})
+    except (OSError, ValueError):
+        return {}
+    logo_dir = path.dirname(manifest_path)
+    path_map = {}
+    for entry in assets.values():
+        if entry.get('kind') != kind:
+            continue
+        if size is None:
+            file_path = entry['file']
+        elif str(size) in entry.get('variants', {}):
+            file_path = f"{kind}/{entry['variants'][str(size)]}"
+        else:
+            continue
+        path_map[entry['team']] = path.join(logo_dir, *file_path.split('/'))
+    return path_map
 
-nfl_logo_png_path_map = {team: path.join(WIKI_DIR,filename) for team, filename in nfl_logo_map_wiki.items()}
-nfl_logo_espn_path_map = {team: path.join(ESPN_DIR,filename) for team, filename in nfl_logo_map_espn.items()}
-nfl_wordmark_path_map = {team: path.join(WORDMARK_DIR,filename) for team, filename in nfl_wordmarks.items()}
+# the bundled logos, replaced team by team by the synced ones once assets.py has run
+nfl_logo_png_path_map = {**{team: path.join(WIKI_DIR,filename) for team, filename in nfl_logo_map_wiki.items()}, **asset_path_map('wikipedia')}
+nfl_logo_espn_path_map = {**{team: path.join(ESPN_DIR,filename) for team, filename in nfl_logo_map_espn.items()}, **asset_path_map('espn')}
+nfl_wordmark_path_map = {**{team: path.join(WORDMARK_DIR,filename) for team, filename in nfl_wordmarks.items()}, **asset_path_map('wordmarks')}
 
 fftoday_team_map = {
     'Cardinals': 'ARI',
@@ -501,4 +468,16 @@ fftoday_team_map = {
     'Football': 'WAS',
     'Giants': 'NYG',
     'Jets': 'NYJ'
-    }
\ No newline at end of file
+    }
+
+if __name__ == "__main__":
+    import time
+    from pathlib import Path
+
+    # Merge id throughput on the historical draft frames, with the name cache cold and warm
+    frames = [pd.read_csv(file_path) for file_path in sorted((Path(__file__).resolve().parents[1] / 'data' / 'vor').glob('*.csv'))]
+    for label in ('cold', 'warm'):
+        start = time.perf_counter()
+        for frame in frames:
+            unique_id_create(frame)
+        print(f"{label}: {(time.perf_counter() - start) * 1000:.1f} ms for {len(frames)} frames")
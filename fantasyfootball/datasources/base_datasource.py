@@ -4,13 +4,15 @@ import logging
 import pandas as pd
 from fantasyfootball.connectors.base_connector import BaseConnector
 from fantasyfootball.parsers.base_parser import BaseParser
+from fantasyfootball.schemas.base_schema import BaseSchema
 
 logger = logging.getLogger(__name__)
 
 class BaseDataSource(ABC):
-    def __init__(self, connector: BaseConnector=None, parser: BaseParser=None):
+    def __init__(self, connector: BaseConnector=None, parser: BaseParser=None, schema: BaseSchema=None):
         self.connector = connector
         self.parser = parser
+        self.schema = schema
 
     @abstractmethod
     def get_data(self, **kwargs) -> pd.DataFrame:
@@ -49,6 +51,7 @@ class BaseDataSource(ABC):
             df = (
                 pd.read_html(html_buffer)[0]
                 .pipe(self._clean_columns)
+                .pipe(self._apply_schema)
             )
             logger.info("DataFrame created successfully.")
             return df
@@ -67,6 +70,19 @@ class BaseDataSource(ABC):
         dataframe.columns = [col.split('_')[-1] if 'level' in col else col for col in dataframe.columns]
         return dataframe
     
+    def _apply_schema(self, dataframe: pd.DataFrame, columns: list[str] = None) -> pd.DataFrame:
+        """
+        Types the parsed DataFrame with the dataset schema, if one was provided.
+
+        :param dataframe: The parsed DataFrame.
+        :param columns: Restrict typing to these columns (optional).
+        :return: The typed DataFrame.
+        """
+        if self.schema is None:
+            return dataframe
+        logger.debug(f"Applying {type(self.schema).__name__} to parsed data.")
+        return self.schema.apply(dataframe, columns=columns)
+
     def assign_columns(self, dataframe: pd.DataFrame, **columns: dict) -> pd.DataFrame:
         """
         Assigns metadata to the given DataFrame by optionally including player name, position, 
@@ -82,4 +98,4 @@ class BaseDataSource(ABC):
                 evaluated_columns[key] = value()  # Call the method and store the result
             else:
                 evaluated_columns[key] = value  # If not callable, keep the value as is
-        return dataframe.assign(**evaluated_columns)
+        return self._apply_schema(dataframe.assign(**evaluated_columns), columns=list(evaluated_columns))
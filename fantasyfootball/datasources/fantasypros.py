@@ -5,20 +5,22 @@ import pandas as pd
 from fantasyfootball.connectors.selenium_connector import SeleniumConnector
 from fantasyfootball.parsers.html_parser import HTMLParser
 from fantasyfootball.datasources.base_datasource import BaseDataSource
+from fantasyfootball.schemas.base_schema import BaseSchema
 from fantasyfootball.factories.datasource_factory import DatasourceFactory
 
 logger = logging.getLogger(__name__)
 
 @DatasourceFactory.register("fantasypros")
 class FantasyProsDatasource(BaseDataSource):
-    def __init__(self, connector: SeleniumConnector=None, parser: HTMLParser=None):
+    def __init__(self, connector: SeleniumConnector=None, parser: HTMLParser=None, schema: BaseSchema=None):
         """
         Initializes the datasource with a connector and a parser.
         
         :param connector: An instance of SeleniumConnector to fetch data.
         :param parser: An already instantiated FantasyProsParser for parsing data.
+        :param schema: The dataset schema applied while parsing (optional).
         """
-        super().__init__(connector=connector, parser=parser)
+        super().__init__(connector=connector, parser=parser, schema=schema)
 
     def get_data(self, endpoint: str, table_id: str, **kwargs) -> pd.DataFrame:
         return (
@@ -26,8 +28,9 @@ class FantasyProsDatasource(BaseDataSource):
                                        table_id=table_id,
                                        **kwargs)
                 .pipe(self._clean_columns)
-                .assign(as_of_date=self._extract_datetime(),
-                        **self._extract_week_and_year())
+                .pipe(self.assign_columns,
+                      as_of_date=self._extract_datetime(),
+                      **self._extract_week_and_year())
         )
 
     def _extract_datetime(self) -> str:
@@ -4,20 +4,22 @@ import pandas as pd
 from fantasyfootball.connectors.github_connector import GitHubConnector
 from fantasyfootball.parsers.html_parser import HTMLParser
 from fantasyfootball.datasources.base_datasource import BaseDataSource
+from fantasyfootball.schemas.base_schema import BaseSchema
 from fantasyfootball.factories.datasource_factory import DatasourceFactory
 
 logger = logging.getLogger(__name__)
 
 @DatasourceFactory.register("nflfastr")
 class NflfastrDatasource(BaseDataSource):
-    def __init__(self, connector: GitHubConnector= None, parser= None):
+    def __init__(self, connector: GitHubConnector= None, parser= None, schema: BaseSchema=None):
         """
         Initializes the datasource with a connector and a parser.
         
         :param connector: An instance of SeleniumConnector to fetch data.
         :param parser: An already instantiated FantasyProsParser for parsing data.
+        :param schema: The dataset schema applied while parsing (optional).
         """
-        super().__init__(connector=connector, parser=parser)
+        super().__init__(connector=connector, parser=parser, schema=schema)
 
     def get_data(self, endpoint: str, connector=None, **kwargs) -> pd.DataFrame:
         self.connector = connector or self.connector
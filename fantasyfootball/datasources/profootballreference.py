@@ -4,20 +4,22 @@ import pandas as pd
 from fantasyfootball.connectors.requests_connector import RequestsConnector
 from fantasyfootball.parsers.html_parser import HTMLParser
 from fantasyfootball.datasources.base_datasource import BaseDataSource
+from fantasyfootball.schemas.base_schema import BaseSchema
 from fantasyfootball.factories.datasource_factory import DatasourceFactory
 
 logger = logging.getLogger(__name__)
 
 @DatasourceFactory.register("profootballreference")
 class ProFootballReferenceDataSource(BaseDataSource):
-    def __init__(self, connector: RequestsConnector= None, parser: HTMLParser= None):
+    def __init__(self, connector: RequestsConnector= None, parser: HTMLParser= None, schema: BaseSchema=None):
         """
         Initializes the data source with a connector and a parser.
         
         :param connector: An instance of RequestsConnector for fetching data.
         :param parser: An instance of HTMLParser for parsing HTML content.
+        :param schema: The dataset schema applied while parsing (optional).
         """
-        super().__init__(connector=connector, parser=parser)
+        super().__init__(connector=connector, parser=parser, schema=schema)
 
     def get_data(self, endpoint: str, table_id: str, **kwargs) -> pd.DataFrame:
         return (
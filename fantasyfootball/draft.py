@@ -12,9 +12,12 @@ import matplotlib.style as style
 from datetime import date
 from fantasyfootball import config
 from fantasyfootball import tiers
-from fantasyfootball.config import FIGURE_DIR, DATA_DIR
+from fantasyfootball.config import FIGURE_DIR, DATA_DIR, CACHE_DIR
 from os import path
 from fantasyfootball import ffcalculator
+from fantasyfootball import weeklypoints
+from fantasyfootball import vor
+from fantasyfootball.utils.frame_cache import FrameCache
 
 pos_tier_dict_viz = {
     'RB' : 8,
@@ -29,8 +32,17 @@ league = config.sean
 weekly_stats_year = 2023
 today = date.today()
 date = today.strftime('%Y.%m.%d')
-weekly_path = path.join(DATA_DIR, rf'game-by-game\{weekly_stats_year}_weekly.csv')
+
+def weekly_file(year=weekly_stats_year):
+    """Path of a season's game-by-game csv"""
+    return path.join(weeklypoints.GAME_BY_GAME_DIR, f'{year}_weekly.csv')
+
+weekly_path = weekly_file(weekly_stats_year)
 replacement_method = 'avg starter'
+# seconds before a cached stage output is recomputed, whatever its key
+stage_ttl = 7 * 24 * 60 * 60
+# outputs of the DraftPipeline stages, in memory and on disk
+draft_cache = FrameCache(cache_dir=path.join(CACHE_DIR, 'draft'))
 
 def get_fantasy_pros_projections(week='draft', league=league, make_id=True):
     """Grabs fantasy pros stat projections for a given league type
@@ -42,10 +54,10 @@ def get_adp_data(league=league):
     return (ffcalculator.adp_process(league=league)
                         .pipe(config.unique_id_create))
 
-def combine_fantasy_pros_and_adp_data():
-    """Combines the FP stats DF and the ADP DF """
-    fp = get_fantasy_pros_projections()
-    adp = get_adp_data()
+def combine_fantasy_pros_and_adp_data(fp=None, adp=None):
+    """Combines the FP stats DF and the ADP DF; scrapes whichever is not passed in """
+    fp = get_fantasy_pros_projections() if fp is None else fp
+    adp = get_adp_data() if adp is None else adp
     return (fp.merge(adp, how='left', on='id')
                .sort_values('adp')
                .reset_index(drop=True)
@@ -66,45 +78,51 @@ def aggregate_weekly_stats(df, league=league, year=weekly_stats_year):
                            std_dev=(f'{league.get("name")}_custom_pts', 'std'))
                       .rename(columns={'avg_ppg' : f'{year}_avg_ppg', 'std_dev' : f'{year}_std_dev'})
          )
-def get_weekly_data(file_path=weekly_path):
-    """Puts together all weekly data functions in a single call """
+def get_weekly_data(file_path=None, league=league, year=weekly_stats_year):
+    """Puts together all weekly data functions in a single call
+    Reads the precomputed weekly points table when it scores the league and has the year, the year's csv otherwise;
+    pass a file_path to recompute from a csv instead"""
+    if file_path is None:
+        summary = weeklypoints.season_summary(league, year)
+        if summary is not None:
+            return summary
+        file_path = weekly_file(year)
     df = pd.read_csv(file_path)
-    return df.pipe(transform_weekly_stats).pipe(aggregate_weekly_stats)
+    return df.pipe(transform_weekly_stats, league).pipe(aggregate_weekly_stats, league, year)
 
-def merge_weekly_and_fantasy_pros_and_adp_data():
+def merge_weekly_and_fantasy_pros_and_adp_data(weekly=None, fp=None):
     """Combines weekly data, fantasy pros stat projections and ADP data in a single DF"""
-    weekly = get_weekly_data()
-    fp = combine_fantasy_pros_and_adp_data()
+    weekly = get_weekly_data() if weekly is None else weekly
+    fp = combine_fantasy_pros_and_adp_data() if fp is None else fp
     return (fp.merge(weekly, how='left', on='id')
                       .reset_index(drop=True)
                       .drop(columns=['id']))
 
-def map_replacement_value(league=league, method=replacement_method):
+def map_replacement_value(league=league, method=replacement_method, df=None):
     """Calculates a position specific replacement value and maps he value to the merged DF
     Method :: 'avg starter' : replacement value for an avg starter
               'top n' : position specific cut-off
               'replacement player' : player who should be available on waivers
               'last starter' : value for a low-end starter
+    df :: the merged DF; built from scratch when not passed in
               """
     pos_list = ['qb', 'wr', 'te', 'rb']
-    df = merge_weekly_and_fantasy_pros_and_adp_data()
-    if method == 'avg starter':
-        replacement_value = config.value_over_avg_starter(df, pos_list, league)
-    elif method == 'top n':
-        replacement_value = config.value_through_n_picks(df, pos_list, league)
-    elif method == 'replacement player':
-        replacement_value = config.value_over_replacement_player(df, pos_list, league)
-    elif method == 'last starter':
-        replacement_value = config.value_over_last_starter(df, pos_list, league)
+    df = merge_weekly_and_fantasy_pros_and_adp_data() if df is None else df
+    replacement_value = vor.replacement_values(df, league, pos_list)[method]
     return df.assign(vor= df[f'{league.get("name")}_custom_pts'] - df['pos'].map(replacement_value))
 
+def compare_replacement_methods(league=league, df=None):
+    """Returns the merged DF with a VOR column for every replacement method side by side, e.g. 'vor_avg_starter'"""
+    df = merge_weekly_and_fantasy_pros_and_adp_data() if df is None else df
+    return vor.value_over_replacement(df, league)
+
 def normalize_series(x):
     """Function used to normalize the VOR score using min-max normalization"""
     return (x - x.min()) / (x.max() - x.min())
 
-def transform_ranking_and_vor():
+def transform_ranking_and_vor(df=None):
     """Adds VOR differential, VOR rank and ADP rank; normalizes VOR score"""
-    df = map_replacement_value()
+    df = map_replacement_value() if df is None else df
     return (df.assign(vor_rank= lambda x: x['vor'].rank(ascending=False),
                               adp_rank= lambda x: x['overall'].rank(),
                               adp_vor_delta= lambda x: x['adp_rank'] - x['vor_rank'])
@@ -113,33 +131,153 @@ def transform_ranking_and_vor():
               .sort_values('vor', ascending=False)
               .reset_index(drop=True))
 
-def merge_ecr_data(league=league):
+def merge_ecr_data(league=league, df=None, ecr=None):
     """Takes the finalized VOR DF and combines with the ECR data scraped from Fantasy Pros """
-    df = transform_ranking_and_vor()
-    return (fp.fantasy_pros_ecr_process(league)
+    df = transform_ranking_and_vor() if df is None else df
+    ecr = fp.fantasy_pros_ecr_process(league) if ecr is None else ecr
+    return (ecr
               .merge(df, how='left', on=['player_name', 'pos', 'tm'])
               .reset_index(drop=True)
               .drop(columns=['bye_y'])
               .rename(columns={'bye_x': 'bye'}))
 
-def add_tiers_to_ecr(league=league):
-    """Adds tiers to the ECR DF using Gaussian Mixture Model """
-    df = merge_ecr_data()
-    pos_dict = tiers.draftable_position_quantity(league)
-    return tiers.assign_tier_to_df(df, tier_dict=pos_tier_dict_viz, kmeans=False, pos_n=pos_dict, covariance_type='diag')
+def add_tiers_to_ecr(league=league, df=None, tier_dict=pos_tier_dict_viz, kmeans=False, covariance_type='diag', adp=None):
+    """Adds tiers to the ECR DF using Gaussian Mixture Model
+    adp :: ADP DF used to size the draftable pool by position; scraped when not passed in """
+    df = merge_ecr_data() if df is None else df
+    pos_dict = tiers.draftable_position_quantity(league, adp=adp)
+    return tiers.assign_tier_to_df(df, tier_dict=tier_dict, kmeans=kmeans, pos_n=pos_dict, covariance_type=covariance_type)
 
-def run_draft_script(save=True, year=weekly_stats_year):
-    """Outputs final dataframe with ECR data with the additional tiers, weekly stats aggs, custom points and VOR columns """
-    df = add_tiers_to_ecr()
+def format_draft_board(df, league=league, year=weekly_stats_year):
+    """Renames and orders the columns of the tiered ECR DF for the saved draft board """
     df = df.rename(columns={
     f'{league.get("name")}_custom_pts': 'custom_points',
     f'{year}_avg_ppg': 'py_avg_ppg',
     f'{year}_std_dev': 'py_std_dev'
     })
-    df = df[['rank', 'pos_tiers', 'player_name', 'tm', 'pos_rank', 'pos', 'bye', 'best', 'worst', 'avg', 'std dev', 'adp',
-                    'adp_vor_delta', 'py_avg_ppg', 'py_std_dev', 'custom_points', 'vor']]
+    return df[['rank', 'pos_tiers', 'player_name', 'tm', 'pos_rank', 'pos', 'bye', 'best', 'worst', 'avg', 'std dev', 'adp',
+               'adp_vor_delta', 'py_avg_ppg', 'py_std_dev', 'custom_points', 'vor']]
+
+class DraftPipeline:
+    """
+    The draft board as explicit stages whose outputs are cached in memory and in CACHE_DIR's 'draft' folder
+
+    Each stage's cache key covers its own parameters and those of every stage upstream of it, so changing
+    a parameter (e.g. tier_dict or method) only reruns the stages downstream of it; the scraping stages
+    are keyed by date as well, so they are fetched once a day, and 'weekly' by weeklypoints.source_fingerprint, so it
+    is rebuilt when a game-by-game file or the scoring changes. Outputs older than `ttl` are recomputed regardless.
+
+        pipeline = DraftPipeline(league=config.sean)
+        board = pipeline.run()
+        pipeline.tier_dict = {**pos_tier_dict_viz, 'WR': 10}
+        board = pipeline.run()  # only reruns 'tiers' and 'board'
+    """
+    # stage -> upstream stages whose outputs it takes, in argument order
+    STAGES = {
+        'projections': [],
+        'adp': [],
+        'weekly': [],
+        'merged': ['projections', 'adp', 'weekly'],
+        'vor': ['merged'],
+        'ecr': [],
+        'ranked': ['vor', 'ecr'],
+        'tiers': ['ranked', 'adp'],
+        'board': ['tiers'],
+    }
+
+    def __init__(self, league=league, year=weekly_stats_year, method=replacement_method, tier_dict=pos_tier_dict_viz,
+                 kmeans=False, covariance_type='diag', day=date, cache=None, ttl=stage_ttl):
+        """
+        :param league: League dict from config.py.
+        :param year: Season of the weekly stats used for the prior year averages.
+        :param method: Replacement method, see map_replacement_value.
+        :param tier_dict: Number of tiers by position.
+        :param kmeans: Tier with KMeans instead of a Gaussian Mixture Model.
+        :param covariance_type: Covariance type of the Gaussian Mixture Model.
+        :param day: Date string the scraped stages are keyed by.
+        :param cache: FrameCache holding the stage outputs; defaults to draft_cache.
+        :param ttl: Seconds before a cached output is recomputed; None keeps outputs until they are invalidated.
+        """
+        self.league = league
+        self.year = year
+        self.method = method
+        self.tier_dict = tier_dict
+        self.kmeans = kmeans
+        self.covariance_type = covariance_type
+        self.day = day
+        self.cache = draft_cache if cache is None else cache
+        self.ttl = ttl
+
+    def stage_params(self, stage):
+        """The parameters a stage's own output depends on"""
+        league_key = tuple(sorted(self.league.items()))
+        return {
+            'projections': (league_key, self.day),
+            'adp': (league_key, self.day),
+            'weekly': (league_key, self.year, weeklypoints.source_fingerprint()),
+            'merged': (),
+            'vor': (league_key, self.method),
+            'ecr': (league_key, self.day),
+            'ranked': (league_key,),
+            'tiers': (league_key, tuple(sorted(self.tier_dict.items())) if isinstance(self.tier_dict, dict) else self.tier_dict,
+                      self.kmeans, self.covariance_type),
+            'board': (league_key, self.year),
+        }[stage]
+
+    def key(self, stage):
+        """Cache key of a stage, chained through the keys of its upstream stages"""
+        upstream = tuple(self.key(name) for name in self.STAGES[stage])
+        return self.cache.make_key(f'draft.{stage}', (upstream, self.stage_params(stage)), {})
+
+    def compute(self, stage, *inputs):
+        """Runs one stage on the outputs of its upstream stages"""
+        if stage == 'projections':
+            return get_fantasy_pros_projections(league=self.league)
+        if stage == 'adp':
+            return get_adp_data(league=self.league)
+        if stage == 'weekly':
+            return get_weekly_data(league=self.league, year=self.year)
+        if stage == 'merged':
+            projections, adp, weekly = inputs
+            return merge_weekly_and_fantasy_pros_and_adp_data(weekly, combine_fantasy_pros_and_adp_data(projections, adp))
+        if stage == 'vor':
+            return transform_ranking_and_vor(map_replacement_value(self.league, self.method, df=inputs[0]))
+        if stage == 'ecr':
+            return fp.fantasy_pros_ecr_process(self.league)
+        if stage == 'ranked':
+            return merge_ecr_data(self.league, *inputs)
+        if stage == 'tiers':
+            ranked, adp = inputs
+            return add_tiers_to_ecr(self.league, ranked, self.tier_dict, self.kmeans, self.covariance_type, adp=adp)
+        if stage == 'board':
+            return format_draft_board(inputs[0], self.league, self.year)
+        raise ValueError(f"Unknown stage '{stage}'. Available stages: {list(self.STAGES)}")
+
+    def run(self, stage='board'):
+        """Returns a stage's output, computing it and any missing upstream outputs first"""
+        if stage not in self.STAGES:
+            raise ValueError(f"Unknown stage '{stage}'. Available stages: {list(self.STAGES)}")
+        key = self.key(stage)
+        df = self.cache.get(key, ttl=self.ttl)
+        if df is None:
+            inputs = [self.run(name) for name in self.STAGES[stage]]
+            df = self.compute(stage, *inputs)
+            self.cache.put(key, df)
+            df = df.copy(deep=False)
+        return df
+
+    def invalidate(self, stage=None):
+        """Drops the cached outputs of a stage, or of every stage, for all parameters"""
+        self.cache.invalidate(None if stage is None else f'draft.{stage}-')
+
+def run_draft_script(save=True, year=weekly_stats_year, pipeline=None):
+    """Outputs final dataframe with ECR data with the additional tiers, weekly stats aggs, custom points and VOR columns """
+    pipeline = DraftPipeline(league=league, year=year) if pipeline is None else pipeline
+    df = pipeline.run()
     if save:
-        df.to_csv(path.join(DATA_DIR, rf'vor\{date}_{league.get("name")}_draft.csv'), index=False)
+        df.to_csv(path.join(DATA_DIR, rf'vor\{pipeline.day}_{pipeline.league.get("name")}_draft.csv'), index=False)
     return df.head()
 
-run_draft_script(save=True)
\ No newline at end of file
+
+if __name__ == "__main__":
+    run_draft_script(save=True)
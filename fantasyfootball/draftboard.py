@@ -0,0 +1,281 @@
+# draftboard.py
+
+import argparse
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+import pandas as pd
+from fantasyfootball import config
+from fantasyfootball.vor import TAIL_N
+
+logger = logging.getLogger(__name__)
+
+# replacement methods that only depend on the players of one position, so a pick only updates its own position
+LIVE_METHODS = ['avg starter', 'last starter']
+
+class DraftBoard:
+    """
+    A live draft board built on a draft.py board (run_draft_script or a saved data/vor csv).
+
+    Picks remove players from the available pool and only the drafted player's position is recomputed:
+    its open starter slots, its replacement value and, through it, the VOR of its remaining players.
+    Best available lists merge the top players of each position, so no pick re-sorts the whole board.
+    """
+
+    def __init__(self, board: pd.DataFrame, league: dict = config.sean, method: str = 'avg starter',
+                 points_col: str = 'custom_points'):
+        """
+        :param board: One row per player with 'player_name', 'pos', 'adp' and the points column.
+        :param league: League dict from config.py; its position keys give the starter slots.
+        :param method: Replacement method, one of LIVE_METHODS (see vor.replacement_values).
+        :param points_col: Projected points column.
+        """
+        if method not in LIVE_METHODS:
+            raise ValueError(f"Unknown live replacement method '{method}'. Available methods: {LIVE_METHODS}")
+        self.frame = board.reset_index(drop=True)
+        self.league = league
+        self.method = method
+        self.points = self.frame[points_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.available = np.ones(len(self.frame), dtype=bool)
+        self.picks = []
+        self._lock = threading.Lock()
+
+        pos = self.frame['pos'].astype(str).to_numpy()
+        adp_order = np.argsort(self.frame['adp'].to_numpy(dtype=np.float64, na_value=np.nan), kind='stable')
+        points_order = np.argsort(-np.nan_to_num(self.points, nan=-np.inf), kind='stable')
+        self.positions = list(pd.unique(pos))
+        self.slots = {p: league.get(p.lower(), 0) * league['team_n'] for p in self.positions}
+        self._adp_order = {p: adp_order[pos[adp_order] == p] for p in self.positions}
+        self._points_order = {p: points_order[pos[points_order] == p] for p in self.positions}
+        self._rows = {}
+        for row, name in enumerate(self.frame['player_name']):
+            self._rows.setdefault(str(name).strip().lower(), []).append(row)
+        self.drafted = dict.fromkeys(self.positions, 0)
+        self.replacement = {}
+        self.recompute()
+
+    def __len__(self):
+        return int(self.available.sum())
+
+    def _replacement_value(self, pos: str) -> float:
+        """
+        Replacement value of a position over its available players in adp order, with the starter slots still open;
+        once every slot is filled the best available player is the replacement level
+        """
+        rows = self._adp_order[pos]
+        rows = rows[self.available[rows]]
+        hi = min(max(self.slots[pos] - self.drafted[pos], 1), len(rows))
+        lo = 0 if self.method == 'avg starter' else max(hi - TAIL_N, 0)
+        values = self.points[rows[lo:hi]]
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else np.nan
+
+    def recompute(self):
+        """Recomputes every position from scratch"""
+        self.replacement = {pos: self._replacement_value(pos) for pos in self.positions}
+
+    def find(self, player) -> int:
+        """
+        Returns the board row of a player.
+        :param player: Board row number, or player name (case insensitive); the first available match wins.
+        """
+        if isinstance(player, (int, np.integer)):
+            if not 0 <= player < len(self.frame):
+                raise KeyError(f"No board row {player}")
+            return int(player)
+        rows = self._rows.get(str(player).strip().lower())
+        if not rows:
+            raise KeyError(f"'{player}' is not on the board")
+        return next((row for row in rows if self.available[row]), rows[0])
+
+    def pick(self, player, team=None) -> dict:
+        """
+        Records a pick and updates the drafted player's position.
+        :param player: Board row number or player name.
+        :param team: Drafting team, kept with the pick (optional).
+        :return: The drafted player, their position and its new replacement value.
+        """
+        with self._lock:
+            row = self.find(player)
+            if not self.available[row]:
+                raise ValueError(f"{self.frame.at[row, 'player_name']} has already been drafted")
+            pos = self.frame.at[row, 'pos']
+            self.available[row] = False
+            self.drafted[pos] += 1
+            self.replacement[pos] = self._replacement_value(pos)
+            self.picks.append((row, team))
+            return {'pick': len(self.picks), 'player_name': self.frame.at[row, 'player_name'], 'pos': pos,
+                    'team': team, 'replacement': self.replacement[pos]}
+
+    def undo(self) -> dict:
+        """Puts the last drafted player back on the board"""
+        with self._lock:
+            if not self.picks:
+                raise ValueError("No picks to undo")
+            row, team = self.picks.pop()
+            pos = self.frame.at[row, 'pos']
+            self.available[row] = True
+            self.drafted[pos] -= 1
+            self.replacement[pos] = self._replacement_value(pos)
+            return {'pick': len(self.picks) + 1, 'player_name': self.frame.at[row, 'player_name'], 'pos': pos,
+                    'team': team, 'replacement': self.replacement[pos]}
+
+    def best_available(self, n: int = 10, pos: str = None) -> pd.DataFrame:
+        """
+        Returns the n available players with the highest live VOR, optionally for one position.
+        Each position contributes its n best available players by points, which are its n best by VOR.
+        """
+        if pos and pos not in self.positions:
+            raise KeyError(f"Unknown position '{pos}'. Positions on the board: {self.positions}")
+        with self._lock:
+            rows, vor = [], []
+            for p in ([pos] if pos else self.positions):
+                top = self._points_order[p]
+                top = top[self.available[top]][:n]
+                rows.append(top)
+                vor.append(self.points[top] - self.replacement[p])
+            rows, vor = np.concatenate(rows), np.concatenate(vor)
+            best = np.argsort(-np.nan_to_num(vor, nan=-np.inf), kind='stable')[:n]
+            return (self.frame.iloc[rows[best]]
+                        .assign(live_vor=vor[best])
+                        .reset_index(drop=True))
+
+    def scarcity(self) -> pd.DataFrame:
+        """
+        Returns the state of every position: players left, open starter slots, replacement value,
+        VOR of the best available player and, when the board has tiers, players left in that tier
+        """
+        with self._lock:
+            summary = []
+            for pos in self.positions:
+                rows = self._points_order[pos]
+                rows = rows[self.available[rows]]
+                best = rows[0] if len(rows) else None
+                record = {'pos': pos,
+                          'available': len(rows),
+                          'open_slots': max(self.slots[pos] - self.drafted[pos], 0),
+                          'replacement': self.replacement[pos],
+                          'best_vor': self.points[best] - self.replacement[pos] if best is not None else np.nan}
+                if 'pos_tiers' in self.frame:
+                    tiers = self.frame['pos_tiers'].to_numpy()
+                    record['tier'] = tiers[best] if best is not None else np.nan
+                    record['tier_left'] = int((tiers[rows] == record['tier']).sum()) if best is not None else 0
+                summary.append(record)
+            return pd.DataFrame(summary)
+
+
+def make_handler(board: DraftBoard):
+    """Builds a request handler serving a board: GET /best?pos=&n=, GET /scarcity, POST /pick, POST /undo"""
+    class DraftBoardHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            payload = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            if url.path == '/best':
+                pos = query.get('pos')
+                try:
+                    best = board.best_available(int(query.get('n', 10)), pos.upper() if pos else None)
+                except (KeyError, ValueError) as e:
+                    return self._send(400, json.dumps({'error': str(e)}))
+                self._send(200, best.to_json(orient='records'))
+            elif url.path == '/scarcity':
+                self._send(200, board.scarcity().to_json(orient='records'))
+            else:
+                self._send(404, json.dumps({'error': f'Unknown path {url.path}'}))
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            try:
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if self.path == '/pick':
+                    result = board.pick(body['player'], body.get('team'))
+                elif self.path == '/undo':
+                    result = board.undo()
+                else:
+                    return self._send(404, json.dumps({'error': f'Unknown path {self.path}'}))
+            except (KeyError, ValueError) as e:
+                return self._send(400, json.dumps({'error': str(e)}))
+            self._send(200, pd.Series(result).to_json())
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return DraftBoardHandler
+
+def serve(board: DraftBoard, host: str = '127.0.0.1', port: int = 8000) -> ThreadingHTTPServer:
+    """Returns an HTTP server for the board; call serve_forever() on it, or run it in a thread"""
+    return ThreadingHTTPServer((host, port), make_handler(board))
+
+def run_cli(board: DraftBoard):
+    """Feeds picks from the terminal: 'pick <player> [@ team]', 'undo', 'best [pos] [n]', 'scarcity', 'quit'"""
+    while True:
+        try:
+            line = input('draft> ').strip()
+        except EOFError:
+            break
+        command, _, argument = line.partition(' ')
+        try:
+            if command == 'pick':
+                player, _, team = argument.partition('@')
+                start = time.perf_counter()
+                result = board.pick(player.strip(), team.strip() or None)
+                print(f"{result['pick']}. {result['player_name']} ({result['pos']}); "
+                      f"{result['pos']} replacement {result['replacement']:.1f} [{(time.perf_counter() - start) * 1000:.2f} ms]")
+            elif command == 'undo':
+                print(f"Undid {board.undo()['player_name']}")
+            elif command == 'best':
+                args = argument.split()
+                pos = next((arg.upper() for arg in args if not arg.isdigit()), None)
+                n = next((int(arg) for arg in args if arg.isdigit()), 10)
+                print(board.best_available(n, pos)[['player_name', 'pos', 'tm', 'adp', 'live_vor']].to_string())
+            elif command == 'scarcity':
+                print(board.scarcity().to_string(index=False))
+            elif command in ('quit', 'exit'):
+                break
+            elif command:
+                print(run_cli.__doc__)
+        except (KeyError, ValueError) as e:
+            print(e)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Live draft board")
+    parser.add_argument('board', type=str, help="Draft board csv, e.g. data/vor/<date>_<league>_draft.csv")
+    parser.add_argument('--league', type=str, default='sean', help="League name from config.py")
+    parser.add_argument('--method', type=str, default='avg starter', choices=LIVE_METHODS, help="Replacement method")
+    parser.add_argument('--serve', type=int, metavar='PORT', help="Serve the board over HTTP instead of the prompt")
+    parser.add_argument('--benchmark', action='store_true', help="Time a full draft of picks in adp order")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    league = next(league for league in config.scoring_List if league['name'] == args.league)
+    board = DraftBoard(pd.read_csv(args.board), league=league, method=args.method)
+    if args.benchmark:
+        order = board.frame.sort_values('adp').index[:league['team_n'] * league['rounds']]
+        latencies = []
+        for row in order:
+            start = time.perf_counter()
+            board.pick(int(row))
+            board.best_available()
+            latencies.append(time.perf_counter() - start)
+        latencies = np.array(latencies) * 1000
+        print(f"{len(latencies)} picks on a {len(board.frame)} player board: pick + best available "
+              f"median {np.median(latencies):.3f} ms, max {latencies.max():.3f} ms")
+    elif args.serve:
+        server = serve(board, port=args.serve)
+        print(f"Serving the draft board on http://127.0.0.1:{args.serve} (GET /best, GET /scarcity, POST /pick, POST /undo)")
+        server.serve_forever()
+    else:
+        run_cli(board)
@@ -0,0 +1,130 @@
+# draftsim.py
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from fantasyfootball import config
+
+logger = logging.getLogger(__name__)
+
+POOL_COLUMNS = ['player_name', 'pos', 'mean', 'std', 'low', 'high']
+# floor on a player's pick spread so consensus picks still move a little between simulations
+MIN_STD = 0.5
+
+def pool_from_adp(adp):
+    """
+    Returns the simulation pool from an ffcalculator.adp_process frame: the average draft position and its standard deviation
+    """
+    mean = adp['overall'] if 'overall' in adp else adp['adp']
+    std = adp['std. dev'] if 'std. dev' in adp else pd.Series(np.nan, index=adp.index)
+    return pd.DataFrame({'player_name': adp['player_name'], 'pos': adp['pos'],
+                         'mean': pd.to_numeric(mean, errors='coerce'), 'std': pd.to_numeric(std, errors='coerce'),
+                         'low': np.nan, 'high': np.nan})
+
+def pool_from_ecr(ecr):
+    """
+    Returns the simulation pool from a fantasypros.fantasy_pros_ecr_process frame: the average expert rank,
+    its standard deviation, and the best and worst rank as bounds
+    """
+    return pd.DataFrame({'player_name': ecr['player_name'], 'pos': ecr['pos'], 'mean': ecr['avg'], 'std': ecr['std dev'],
+                         'low': ecr['best'], 'high': ecr['worst']})
+
+def blend_pools(adp_pool, ecr_pool, adp_weight=0.5):
+    """
+    Blends an ADP and an ECR pool by player: the mean is the weighted average, the variance the weighted variance,
+    and the bounds come from the ECR; players only in one pool keep that pool's distribution
+    """
+    df = adp_pool.merge(ecr_pool, how='outer', on=['player_name', 'pos'], suffixes=('_adp', '_ecr'))
+    w = pd.Series(adp_weight, index=df.index).where(df['mean_ecr'].notna(), 1.0).where(df['mean_adp'].notna(), 0.0)
+    mean = w * df['mean_adp'].fillna(0) + (1 - w) * df['mean_ecr'].fillna(0)
+    var = w * df['std_adp'].fillna(0) ** 2 + (1 - w) * df['std_ecr'].fillna(0) ** 2
+    return (df.assign(mean=mean, std=np.sqrt(var), low=df['low_ecr'], high=df['high_ecr'])
+              .loc[:, POOL_COLUMNS]
+              .sort_values('mean', kind='stable')
+              .reset_index(drop=True))
+
+def snake_picks(slot, team_n=12, rounds=15):
+    """Returns the overall pick numbers (1 based) of a draft slot in a snake draft"""
+    picks = [r * team_n + (slot if r % 2 == 0 else team_n - slot + 1) for r in range(rounds)]
+    return np.array(picks)
+
+def _simulate_chunk(mean, std, low, high, picks, n_sims, seed):
+    """
+    Samples n_sims drafts and returns how often each player is still available at each pick (picks x players),
+    plus how often each player goes before the last pick
+    Each simulation ranks the players by a draw from their pick distribution; the draft takes them in that order
+    """
+    rng = np.random.default_rng(seed)
+    draws = rng.standard_normal((n_sims, len(mean)), dtype=np.float32)
+    draws *= std
+    draws += mean
+    np.clip(draws, low, high, out=draws)
+    order = np.argsort(draws, axis=1)
+    # pick number (0 based) of every player in every simulation
+    taken_at = np.empty_like(order)
+    np.put_along_axis(taken_at, order, np.arange(len(mean))[None, :], axis=1)
+    available = np.stack([(taken_at >= pick - 1).sum(axis=0) for pick in picks])
+    drafted = (taken_at < picks[-1] - 1).sum(axis=0)
+    return available, drafted
+
+def simulate_draft(pool, picks, n_sims=10_000, seed=0, workers=1, chunk_size=1_000):
+    """
+    Monte Carlo mock drafts from the pool's pick distributions, vectorized across simulations
+    Every team, including yours, drafts the best player by its sampled rank, so positional needs are not modelled
+    :pool: frame with POOL_COLUMNS, e.g. from pool_from_adp, pool_from_ecr or blend_pools
+    :picks: your overall pick numbers, e.g. snake_picks(slot)
+    :n_sims: number of simulated drafts
+    :seed: seed of the simulations; results do not depend on workers or on how chunks are scheduled
+    :workers: processes used to run the chunks; 1 runs them in this process
+    :chunk_size: simulations sampled at once
+    :return: the pool with the probability each player is available at each pick ('pick_<n>') and of being
+             drafted before the last pick ('drafted')
+    """
+    pool = pool.reset_index(drop=True)
+    picks = np.asarray(picks)
+    mean = pool['mean'].to_numpy(dtype=np.float32)
+    std = np.maximum(pool['std'].fillna(0).to_numpy(dtype=np.float32), MIN_STD)
+    low = pool['low'].fillna(1).to_numpy(dtype=np.float32) if 'low' in pool else np.float32(1)
+    high = pool['high'].fillna(np.inf).to_numpy(dtype=np.float32) if 'high' in pool else np.float32(np.inf)
+
+    sizes = [min(chunk_size, n_sims - start) for start in range(0, n_sims, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(mean, std, low, high, picks, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_chunk, *zip(*args)))
+    else:
+        results = [_simulate_chunk(*arg) for arg in args]
+
+    available = sum(result[0] for result in results) / n_sims
+    drafted = sum(result[1] for result in results) / n_sims
+    columns = {f'pick_{pick}': available[ix] for ix, pick in enumerate(picks)}
+    return pool.assign(**columns, drafted=drafted)
+
+def draftable_position_quantity(pool, league=config.sean, n_sims=10_000, seed=0, workers=1):
+    """
+    Expected number of players drafted by position over the league's draftable picks, the simulated
+    counterpart of tiers.draftable_position_quantity
+    """
+    n_picks = league['team_n'] * league['rounds']
+    sims = simulate_draft(pool, [n_picks + 1], n_sims, seed, workers)
+    return sims.groupby('pos')['drafted'].sum().round(1).to_dict()
+
+
+if __name__ == "__main__":
+    import time
+
+    # 10k simulations of a 12 team, 15 round draft on a synthetic 300 player pool
+    rng = np.random.default_rng(0)
+    n_players = 300
+    mean = np.sort(rng.uniform(1, 300, n_players))
+    pool = pd.DataFrame({'player_name': [f'Player {ix}' for ix in range(n_players)],
+                         'pos': rng.choice(['QB', 'RB', 'WR', 'TE', 'DST', 'K'], n_players),
+                         'mean': mean, 'std': 1 + mean * 0.08, 'low': np.nan, 'high': np.nan})
+    picks = snake_picks(5)
+    for workers in (1, 4):
+        start = time.perf_counter()
+        sims = simulate_draft(pool, picks, n_sims=10_000, workers=workers)
+        print(f"{workers} worker(s): {time.perf_counter() - start:.3f}s")
+    print(sims.loc[sims['pick_5'].between(0.05, 0.95), ['player_name', 'mean', 'pick_5', 'pick_20']].head())
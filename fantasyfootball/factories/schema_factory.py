@@ -0,0 +1,15 @@
+from typing import Any
+import logging
+from fantasyfootball.factories.base_factory import BaseFactory
+
+logger = logging.getLogger(__name__)
+
+class SchemaFactory(BaseFactory):
+    """
+    Factory object used to separate schema creation from use.
+
+    Will return any schema object that has been registered with the BaseFactory decorator when a registration key is passed.
+    Requires the schemas module to be imported to trigger registration.
+    """
+    
+    registry = {}
\ No newline at end of file
@@ -0,0 +1,157 @@
+# figurejobs.py
+
+import logging
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+import pandas as pd
+from fantasyfootball import config
+from fantasyfootball.config import FIGURE_DIR
+
+logger = logging.getLogger(__name__)
+
+# name: output file stem; func: a chart function taking save=; args/kwargs: its inputs, which are pickled to the worker
+FigureJob = namedtuple('FigureJob', ['name', 'func', 'args', 'kwargs'], defaults=((), {}))
+
+def _init_worker():
+    """Every worker renders headless"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+def render_job(job, figure_dir=FIGURE_DIR, fmt='png', dpi=None):
+    """
+    Runs one chart function with save=False and writes the figures it opened to figure_dir as '<name>.<fmt>',
+    or '<name>_<n>.<fmt>' when it opens several; meant to run in a worker process, whose pyplot state is its own
+    Style changes made by the chart (plt.style.use, sns.set_style) are undone once the job is done
+    :return: the files written and the seconds spent building the figures and rendering them to file
+    """
+    import matplotlib
+    from matplotlib import pyplot as plt
+    report = {'name': job.name, 'files': [], 'build_seconds': 0.0, 'render_seconds': 0.0, 'error': None}
+    open_before = set(plt.get_fignums())
+    try:
+        with matplotlib.rc_context():
+            start = time.perf_counter()
+            job.func(*job.args, **{'save': False, **job.kwargs})
+            report['build_seconds'] = time.perf_counter() - start
+            figures = [plt.figure(num) for num in plt.get_fignums() if num not in open_before]
+            start = time.perf_counter()
+            for ix, fig in enumerate(figures):
+                suffix = f'_{ix + 1}' if len(figures) > 1 else ''
+                file_path = os.path.join(figure_dir, f'{job.name}{suffix}.{fmt}')
+                fig.savefig(file_path, dpi=dpi, bbox_inches='tight')
+                report['files'].append(file_path)
+            report['render_seconds'] = time.perf_counter() - start
+    except Exception as e:
+        logger.exception(f"Figure job {job.name} failed")
+        report['error'] = f'{type(e).__name__}: {e}'
+    finally:
+        for num in set(plt.get_fignums()) - open_before:
+            plt.close(num)
+    report['seconds'] = report['build_seconds'] + report['render_seconds']
+    return report
+
+def run_figure_jobs(jobs, figure_dir=FIGURE_DIR, workers=None, fmt='png', dpi=None):
+    """
+    Renders figure jobs in a pool of headless (Agg) worker processes; the calling process's pyplot state and
+    backend are left alone. A failing job is logged and reported, the other jobs still run
+    :jobs: list of FigureJob
+    :workers: processes, defaults to the number of CPUs
+    :return: one row per job in the order given: files written, build/render/total seconds and any error
+    """
+    os.makedirs(figure_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    reports = {}
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(jobs), 1)), initializer=_init_worker,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {executor.submit(render_job, job, figure_dir, fmt, dpi): ix for ix, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            report = future.result()
+            reports[futures[future]] = report
+            logger.info(f"{report['name']}: {len(report['files'])} figure(s) in {report['seconds']:.2f}s")
+    return pd.DataFrame([reports[ix] for ix in range(len(jobs))],
+                        columns=['name', 'files', 'build_seconds', 'render_seconds', 'seconds', 'error'])
+
+def tier_jobs(leagues=(config.sean, config.work, config.justin), tier_dict=None, pos_n=35, ecr=None, draft=False,
+              players=None, **kwargs):
+    """
+    Returns one tiers.make_clustering_viz job per league and position, the ECR frames being scraped once here
+    :ecr: dict of league name to ECR frame, to skip scraping
+    :players: dict of league name to players to highlight
+    """
+    from fantasyfootball import fantasypros as fp
+    from fantasyfootball import tiers
+    tier_dict = tier_dict or {'RB': 8, 'QB': 6, 'WR': 5, 'TE': 5, 'DST': 6, 'K': 7}
+    date_str = date.today().strftime('%m.%d.%Y')
+    jobs = []
+    for league in leagues:
+        name = league['name']
+        df = (ecr or {}).get(name)
+        if df is None:
+            df = fp.fantasy_pros_ecr_process(league) if draft else fp.create_fantasy_pros_ecr_df(league)
+        for pos, k in tier_dict.items():
+            jobs.append(FigureJob(f'{date_str}_rangeofrankings_{name}_{pos}', tiers.make_clustering_viz,
+                                  kwargs={'tier_dict': {pos: k}, 'league': league, 'pos_n': pos_n, 'draft': draft,
+                                          'players': (players or {}).get(name), 'df': df, **kwargs}))
+    return jobs
+
+def flex_jobs(player_lists=None, league=config.sean, ecr=None, **kwargs):
+    """
+    Returns the tiersweekly.make_clustering_viz_flex jobs: the full FLEX chart plus one per league's player list
+    :player_lists: list of (league, players) pairs
+    """
+    from fantasyfootball import fantasypros as fp
+    from fantasyfootball import tiersweekly
+    df = fp.create_fantasy_pros_ecr_df(league) if ecr is None else ecr
+    date_str = date.today().strftime('%m.%d.%Y')
+    jobs = [FigureJob(f'{date_str}_rangeofrankings_FLEX', tiersweekly.make_clustering_viz_flex,
+                      kwargs={'league': league, 'df': df, **kwargs})]
+    for list_league, players in player_lists or []:
+        jobs.append(FigureJob(f'{date_str}_rangeofrankings_FLEX_{list_league["name"]}', tiersweekly.make_clustering_viz_flex,
+                              kwargs={'league': list_league, 'player_list': players, 'df': df, **kwargs}))
+    return jobs
+
+def nflfastr_jobs(fastr):
+    """
+    Returns the weekly nflfastR chart jobs; the transforms run here so only their small outputs go to the workers
+    :fastr: play-by-play from nflfastr.get_nfl_fast_r_data
+    """
+    from fantasyfootball import nflfastr
+    year, week = nflfastr.get_year_and_week(fastr)
+    charts = {
+        'edsr_vs_total': (nflfastr.team_scatter_viz, nflfastr.edsr_total_1d_transform(fastr), {}),
+        'neutral_pass_rate': (nflfastr.make_neutral_pass_rate_viz, nflfastr.neutral_pass_rate_transform(fastr), {}),
+        'second_and_long_pass_rate': (nflfastr.make_second_and_long_pass_rate_viz,
+                                      nflfastr.second_and_long_pass_transform(fastr), {'color': 'Greys_r'}),
+        'target_share_vs_ay_share': (nflfastr.target_share_vs_ay_share_viz,
+                                     nflfastr.target_share_vs_ay_share_transform(fastr), {}),
+        'carries_inside_5_yardline': (nflfastr.carries_inside_5_yardline_viz,
+                                      nflfastr.carries_inside_5_yardline_transform(fastr), {}),
+        'air_yard_density': (nflfastr.air_yard_density_viz, nflfastr.air_yard_density_transform(fastr), {}),
+        'receiver_yardline_breakdown': (nflfastr.make_stacked_bar_viz,
+                                        nflfastr.usage_yardline_breakdown_transform(fastr), {}),
+        'cpoe_vs_epa': (nflfastr.make_epa_vs_cpoe_viz, nflfastr.epa_vs_cpoe_transform(fastr, minimum_att=50), {}),
+    }
+    return [FigureJob(f'{year}_through_week_{week}_{name}', func, (df,), kwargs)
+            for name, (func, df, kwargs) in charts.items()]
+
+
+if __name__ == "__main__":
+    # every tier chart for three leagues on synthetic rankings, with one worker and with one per CPU
+    import sys
+    import tempfile
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tests'))
+    from fixtures import make_ecr
+    logging.basicConfig(level=logging.WARNING)
+    leagues = (config.sean, config.work, config.justin)
+    ecr = {league['name']: make_ecr(seed=ix) for ix, league in enumerate(leagues)}
+    jobs = tier_jobs(leagues, ecr=ecr, clf='ckmeans')
+    with tempfile.TemporaryDirectory() as figure_dir:
+        for workers in (1, os.cpu_count()):
+            start = time.perf_counter()
+            report = run_figure_jobs(jobs, figure_dir, workers=workers)
+            print(f"{len(jobs)} figures, {workers} worker(s): {time.perf_counter() - start:.2f}s wall")
+        print(report[['name', 'build_seconds', 'render_seconds', 'seconds']].to_string(index=False))
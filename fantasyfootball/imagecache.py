@@ -0,0 +1,123 @@
+# imagecache.py
+
+import logging
+import os
+import threading
+import matplotlib
+import numpy as np
+from matplotlib import image as mpimg
+from matplotlib.offsetbox import OffsetImage
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+_images = {}
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+def _to_uint8(array):
+    """imread gives floats in [0, 1] for PNGs and uint8 for other formats"""
+    return array if array.dtype == np.uint8 else np.round(np.clip(array, 0, 1) * 255).astype(np.uint8)
+
+def _downscale(array, zoom):
+    """Resizes an image by zoom with Lanczos resampling; RGBA is resized premultiplied so edges do not darken"""
+    image = Image.fromarray(_to_uint8(array))
+    size = (max(int(round(image.width * zoom)), 1), max(int(round(image.height * zoom)), 1))
+    if image.mode == 'RGBA':
+        return np.asarray(image.convert('RGBa').resize(size, Image.LANCZOS).convert('RGBA'))
+    return np.asarray(image.resize(size, Image.LANCZOS))
+
+def read_image(file_path, zoom=None):
+    """
+    Returns the decoded image, reading and decoding the file only the first time it is asked for
+    The cache is keyed by the file's path, size and modification time, so a replaced file is read again
+    :zoom: scale below 1 to keep a pre-downscaled copy instead, decoded once and resized once; the full size
+           image is then only kept if it was already cached
+    :return: read-only array shared by every caller; copy it before changing it
+    """
+    stat = os.stat(file_path)
+    zoom = zoom if zoom is not None and zoom < 1 else None
+    key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, zoom)
+    with _lock:
+        array = _images.get(key)
+        if array is not None:
+            _stats['hits'] += 1
+            return array
+        _stats['misses'] += 1
+    full = _images.get(key[:3] + (None,))
+    array = mpimg.imread(file_path) if full is None else full
+    if zoom is not None:
+        array = _downscale(array, zoom)
+    array.setflags(write=False)
+    with _lock:
+        _images[key] = array
+    return array
+
+def offset_image(file_path, zoom=1.0, downscale=True, dpi=None, **kwargs):
+    """
+    Returns an OffsetImage of a logo or wordmark that looks like OffsetImage(plt.imread(file_path), zoom=zoom)
+    OffsetImage draws zoom * dpi / 72 screen pixels per image pixel, so the image is drawn that much smaller
+    :downscale: when that scale is below 1, draw a copy resized once to it rather than the full image shrunk
+                on every draw
+    :dpi: resolution the figure is saved at, defaults to rcParams['figure.dpi']; at other resolutions the image
+          keeps its size but is resampled again
+    :kwargs: passed on to OffsetImage
+    """
+    dpi = dpi or matplotlib.rcParams['figure.dpi']
+    scale = zoom * dpi / 72
+    if downscale and scale < 1:
+        return OffsetImage(read_image(file_path, scale), zoom=72 / dpi, **kwargs)
+    return OffsetImage(read_image(file_path), zoom=zoom, **kwargs)
+
+def preload(file_paths, zoom=None):
+    """Decodes a set of images ahead of time, e.g. every team logo before a batch of charts"""
+    for file_path in file_paths:
+        read_image(file_path, zoom)
+
+def cache_info():
+    """Returns the hits, misses, number of cached arrays and their total size in bytes"""
+    with _lock:
+        return {**_stats, 'images': len(_images),
+                'bytes': sum(array.nbytes for array in {id(array): array for array in _images.values()}.values())}
+
+def clear():
+    """Drops every cached image"""
+    with _lock:
+        _images.clear()
+        _stats.update(hits=0, misses=0)
+
+
+if __name__ == "__main__":
+    import gc
+    import time
+    from fantasyfootball import config
+    matplotlib.use('Agg')
+    from matplotlib import pyplot as plt
+    from matplotlib.offsetbox import AnnotationBbox
+
+    # a 32 team logo chart drawn 4 times: decoding every logo per chart versus the cache, full size and downscaled
+    logo_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'figures', 'logos', 'espn')
+    logos = sorted({os.path.join(logo_dir, os.path.basename(p.replace('\\', '/')))
+                    for p in config.nfl_logo_espn_path_map.values()})[:32]
+
+    def chart(make_image):
+        fig, ax = plt.subplots(figsize=(20, 15))
+        for ix, logo in enumerate(logos):
+            ax.add_artist(AnnotationBbox(make_image(logo), xy=(ix % 8 / 8, ix // 8 / 4), frameon=False,
+                                         xycoords='axes fraction'))
+        fig.canvas.draw()
+        plt.close(fig)
+        gc.collect()
+
+    ways = {'imread per chart': lambda logo: OffsetImage(plt.imread(logo), zoom=.1),
+            'cached, full size': lambda logo: offset_image(logo, zoom=.1, downscale=False),
+            'cached, downscaled': lambda logo: offset_image(logo, zoom=.1)}
+    for name, make_image in ways.items():
+        clear()
+        timings = []
+        for _ in range(4):
+            start = time.perf_counter()
+            chart(make_image)
+            timings.append(time.perf_counter() - start)
+        print(f"{name}: first chart {timings[0] * 1000:.1f} ms, then {np.mean(timings[1:]) * 1000:.1f} ms per chart")
+    print(cache_info())
@@ -2,22 +2,30 @@
 
 import pandas as pd
 import matplotlib.pyplot as plt
-from matplotlib.offsetbox import AnnotationBbox, OffsetImage
+from matplotlib.offsetbox import AnnotationBbox
 from matplotlib import cm
 import fantasyfootball
 from os import path
-from fantasyfootball.config import DATA_DIR, FIGURE_DIR, pfr_to_fantpros, nfl_color_map, nfl_color_map_secondary, nfl_logo_espn_path_map, nfl_wordmark_path_map
+from fantasyfootball.config import DATA_DIR, FIGURE_DIR, CACHE_DIR, pfr_to_fantpros, nfl_color_map, nfl_color_map_secondary, nfl_logo_espn_path_map, nfl_wordmark_path_map
 import seaborn as sns
 import numpy as np
 from adjustText import adjust_text
 import requests
 from io import BytesIO
 import codecs
-import urllib.request
 from datetime import datetime
 from IPython.display import HTML
 import dataframe_image as dfi
+from fantasyfootball.utils.frame_cache import FrameCache
+from fantasyfootball import imagecache
+from fantasyfootball import assets
 
+ONE_DAY = 24 * 60 * 60
+# nflverse downloads are memoized in memory and under CACHE_DIR; call e.g. get_nfl_fast_r_data.invalidate(2023)
+# or nflverse_cache.invalidate() to force a refresh
+nflverse_cache = FrameCache(cache_dir=CACHE_DIR)
+
+@nflverse_cache.memoize(ttl=ONE_DAY)
 def get_nfl_schedule_data(*years, current_week=False):
     """Retrives NFL schedule information from the NFLfastr git repo for a given year(s) 
     :current_week: will return the upcoming week schedule
@@ -37,6 +45,7 @@ def get_current_season_year():
     """Returns the current/most recent NFL season year"""
     return get_nfl_schedule_data()['season'].max()
 
+@nflverse_cache.memoize(ttl=ONE_DAY)
 def get_nfl_fast_r_data(*years, regular_season=True, two_pt=False):
     """
     Retrives play by play data from the NFLfastr git repo for a given year(s) 
@@ -53,6 +62,7 @@ def get_nfl_fast_r_data(*years, regular_season=True, two_pt=False):
         df = df.loc[df['season_type'] == 'REG']
     return df if two_pt else df.loc[df['down']<=4]
 
+@nflverse_cache.memoize(ttl=ONE_DAY)
 def get_nfl_fast_r_roster(*years):
     """Retrives roster data from the NFLfastr git repo for a given year(s) """
     if not years or years[0] is None:
@@ -62,6 +72,7 @@ def get_nfl_fast_r_roster(*years):
                for year in years]
     return pd.concat(df_list)
 
+@nflverse_cache.memoize()
 def get_team_colors_and_logos_dataframe():
     return pd.read_csv(r'https://raw.githubusercontent.com/nflverse/nflfastR-data/master/teams_colors_logos.csv')
 
@@ -79,6 +90,12 @@ def convert_to_gsis_id(new_id):
         return new_id  
     return codecs.decode(new_id[4:-8].replace('-',''),"hex").decode('utf-8')
 
+def convert_to_gsis_ids(new_ids):
+    """Vectorized convert_to_gsis_id for a Series of ids; each distinct id is decoded once and mapped back to the rows"""
+    codes, uniques = pd.factorize(new_ids)
+    decoded = np.array([convert_to_gsis_id(new_id) for new_id in uniques] + [np.nan], dtype=object)
+    return pd.Series(decoded[codes], index=new_ids.index, name=new_ids.name)
+
 def get_year_and_week(df):
     """Extracts season and max week in an NFLfastr df; useful for labeling figures """
     year = int(df['game_id'].max().split('_')[0])
@@ -86,16 +103,9 @@ def get_year_and_week(df):
     return year, week
 
 def save_team_images(column='team_wordmark'):
-    """Function will loop through a dataframe column and save URL images locally"""
-    df = pd.read_csv(r'https://raw.githubusercontent.com/nflverse/nflfastR-data/master/teams_colors_logos.csv')
-    my_series = df[column]
-    my_list = my_series.to_list()
-    for im_url in my_list:
-        image_url = im_url
-        filename = image_url.split("/")[-1]
-        local_path = r'..\figures'
-        file_path = path.join(local_path, filename)
-        urllib.request.urlretrieve(image_url, file_path)
+    """Syncs the team images of a teams csv column (team_wordmark, team_logo_espn or team_logo_wikipedia); see assets.sync_assets"""
+    kind = next(kind for kind, asset_column in assets.ASSET_COLUMNS.items() if asset_column == column)
+    return assets.sync_assets(kinds=[kind])
 
 def target_share_vs_ay_share_transform(df):
     """Calculates the team target share and total air yards for a given receiver """
@@ -184,7 +194,7 @@ def carries_inside_5_yardline_viz(df, *team_filter, n=20, x_size=20, y_size=15,
     ax.barh(df.index, df['play_count'], color=df['color'])
     for carries, x, y in zip(df['play_count'], df['play_count'], df.index):
         ax.annotate(carries, xy=(x+0.02, y), fontsize=14)
-    images = [OffsetImage(plt.imread(file_path), zoom=.1) for file_path in df['logo'].to_list()]
+    images = [imagecache.offset_image(file_path, zoom=.1) for file_path in df['logo'].to_list()]
     x0 = [(df['play_count'].max() * 0.02)] * len(df['play_count'])
     for im, x, y in zip(images, x0, df.index):
         ax.add_artist(AnnotationBbox(im, xy=(x,y), frameon=False, xycoords='data'))
@@ -282,7 +292,7 @@ def air_yard_density_viz(df, *team_filter, x_size=30, y_size=35, team_logo=True,
 
         if team_logo:
             logo_path = selection['logo'].max()
-            image = OffsetImage(plt.imread(logo_path), zoom=.2)
+            image = imagecache.offset_image(logo_path, zoom=.2)
             ax.add_artist(AnnotationBbox(image, xy=(0.9,.9), frameon=False, xycoords='axes fraction'))
              
     for ax in axs_list:
@@ -292,9 +302,9 @@ def air_yard_density_viz(df, *team_filter, x_size=30, y_size=35, team_logo=True,
     year = df['year'].max()
     week = df['week'].max()
     fig.suptitle(f'{year} Top {axs_list_count} Players By Total Air Yards through Week {week}', fontsize=30, fontweight='bold', y=1.02)
-    plt.figtext(0.97, -0.01, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=14)
-    plt.figtext(0.5, -0.01, 'Air Yards', fontsize=20)
-    plt.figtext(-0.01, 0.5, 'Density', fontsize=20, rotation='vertical')
+    fig.text(0.97, -0.01, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=14)
+    fig.text(0.5, -0.01, 'Air Yards', fontsize=20)
+    fig.text(-0.01, 0.5, 'Density', fontsize=20, rotation='vertical')
 
     fig.tight_layout()
 
@@ -318,7 +328,7 @@ def team_scatter_viz(df, x_size=20, y_size=15, save=True):
     
     for x0, y0, logo_path in zip(x, y, logos):
         ax.scatter(x0, y0, color='black', s=.001, alpha=0.5)
-        image = OffsetImage(plt.imread(logo_path), zoom=.1)
+        image = imagecache.offset_image(logo_path, zoom=.1)
         ax.add_artist(AnnotationBbox(image, xy=(x0,y0), frameon=False, xycoords='data'))
     
     #mean lines
@@ -341,7 +351,7 @@ def team_scatter_viz(df, x_size=20, y_size=15, save=True):
     year = df['year'].max()
     week = df['week'].max()
     fig.suptitle(f'{year} {x_label} and {y_label} through Week {week}', fontsize=30, fontweight='bold', y=1.02)
-    plt.figtext(0.92, -0.01, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=12)
+    fig.text(0.92, -0.01, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=12)
     
     fig.tight_layout()
     
@@ -437,7 +447,7 @@ def make_stacked_bar_viz(df, x_size=15, y_size=20, n=25, save=True):
     ax.invert_yaxis()
     #figure title
     fig.suptitle(f'{year} {player_type} Yardline Breakdown through Week {week}', fontsize=30, fontweight='bold', x=0.55, y=1.02, ha='center')
-    plt.figtext(0.92, -0.01, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=12)
+    fig.text(0.92, -0.01, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=12)
     fig.tight_layout()
     if save:
         player_type_lower = player_type.lower()
@@ -519,7 +529,7 @@ def make_neutral_pass_rate_viz(df, save=True):
     fig, ax = plt.subplots(figsize=(30,15))
     color = df.index.map(nfl_color_map)
     logo = df.index.map(nfl_logo_espn_path_map)
-    images = [OffsetImage(plt.imread(logo_path), zoom=.1) for logo_path in logo]
+    images = [imagecache.offset_image(logo_path, zoom=.1) for logo_path in logo]
     x = df.index
     y = df['pass']
     ax.bar(x, y, color=color, width=0.5)
@@ -545,7 +555,7 @@ def make_neutral_pass_rate_viz(df, save=True):
     ax.tick_params(labelsize=16)
     
     #League average line label
-    plt.text(30.5,.53,'NFL Average',fontsize=14)
+    ax.text(30.5,.53,'NFL Average',fontsize=14)
     
     #footnotes
     ax.annotate('Data: @NFLfastR',xy=(.90,-0.05), fontsize=12, xycoords='axes fraction')
@@ -580,7 +590,7 @@ def make_second_and_long_pass_rate_viz(df, color='team', save=True):
         color = cm.get_cmap(color)
         color = color(np.linspace(0,.8,len(df)))
     logo = df.index.map(nfl_logo_espn_path_map)
-    images = [OffsetImage(plt.imread(logo_path), zoom=.1) for logo_path in logo]
+    images = [imagecache.offset_image(logo_path, zoom=.1) for logo_path in logo]
     x = df.index
     y = df['pass']
     ax.barh(x, y, color=color, height=0.5)
@@ -607,7 +617,7 @@ def make_second_and_long_pass_rate_viz(df, color='team', save=True):
     ax.margins(x=.05, y=.001)
     
     #League average line label
-    plt.text(y.mean() + 0.005, 30.5, 'NFL Average',fontsize=14)
+    ax.text(y.mean() + 0.005, 30.5, 'NFL Average',fontsize=14)
     
     #footnotes
     ax.annotate('Data: @NFLfastR\nFigure: @MulliganRob',xy=(.90,-0.05), fontsize=14, xycoords='axes fraction')
@@ -696,7 +706,8 @@ def receiver_summary_table(df):
     team_logo['team_logo_espn'] = team_logo['team_logo_espn'].apply(lambda x: f'<img src="{x}" width="50px">')                                              
     play_type = df['play_type'] == 'pass'
     df = (df.loc[play_type]
-            .assign(ez_tgts= lambda x: (x['air_yards']==x['yardline_100']))
+            .assign(ez_tgts= lambda x: (x['air_yards']==x['yardline_100']),
+                    rz_tgts= lambda x: x['yardline_100'] <= 20)
             .groupby(['receiver_id', 'receiver'])
             .agg(posteam=('posteam', 'last'),
                 games=('game_id', 'nunique'),
@@ -706,7 +717,7 @@ def receiver_summary_table(df):
                 rec_yards=('yards_gained', 'sum'),
                 targets=('play_id', 'count'),
                 rec_tds=('pass_touchdown', 'sum'),
-                rz_tgts=('yardline_100', lambda x: (x <= 20).sum()),
+                rz_tgts=('rz_tgts', 'sum'),
                 ez_tgts=('ez_tgts', 'sum'))
             .assign(target_share= lambda x: x['targets'] / x.groupby('posteam')['targets'].transform('sum') * 100,
                     yards_per_rec= lambda x: x['rec_yards'] / x['rec'],
@@ -747,16 +758,20 @@ def running_back_summary_table(df, minimum_attempts=100):
                                  .rename_axis(['rusher_id', 'rusher']))
     play_type = df['play_type'] == 'run'
     df = (df.loc[play_type]
+            .assign(pos_run= lambda x: x['yards_gained'] > 0,
+                    att_5_yd= lambda x: x['yardline_100'] <= 5)
             .groupby(['rusher_id', 'rusher'])
             .agg(posteam=('posteam', 'last'),
                 games=('game_id', 'nunique'),
                 attempts=('play_id', 'count'),
                 rush_yards=('yards_gained', 'sum'),
                 rush_tds=('rush_touchdown', 'sum'),
-                pos_run_rate=('yards_gained', lambda x: (x > 0).mean() * 100),
-                att_5_yd_rate=('yardline_100', lambda x: (x <= 5).mean() * 100))
+                pos_run_rate=('pos_run', 'mean'),
+                att_5_yd_rate=('att_5_yd', 'mean'))
             .merge(wr_table, how='left', left_index=True, right_index=True)
-            .assign(total_tds= lambda x: x['rush_tds'] + x['rec_tds'],
+            .assign(pos_run_rate= lambda x: x['pos_run_rate'] * 100,
+                    att_5_yd_rate= lambda x: x['att_5_yd_rate'] * 100,
+                    total_tds= lambda x: x['rush_tds'] + x['rec_tds'],
                     carry_share= lambda x: x['attempts'] / x.groupby('posteam')['attempts'].transform('sum') * 100,
                     yards_share= lambda x: x['rush_yards'] / x.groupby('posteam')['rush_yards'].transform('sum') * 100,
                     ypc= lambda x: x['rush_yards'] / x['attempts'],
@@ -936,7 +951,7 @@ def make_team_swarm(df, save=True, y_lim_min=-10, ylim_max=100):
         
         # word marks
         logo_path = nfl_wordmark_path_map[team]
-        image = OffsetImage(plt.imread(logo_path), zoom=.5)
+        image = imagecache.offset_image(logo_path, zoom=.5)
         ax.add_artist(AnnotationBbox(image, xy=(0.5,1.0), frameon=False, xycoords='axes fraction'))
     
     fig.tight_layout()
@@ -946,7 +961,7 @@ def make_team_swarm(df, save=True, y_lim_min=-10, ylim_max=100):
     year = df['year'].max()
     week = df['week'].max()
     fig.suptitle(f'{year} {col_name} Team By Team Distribution (Through Week {week})', fontsize=30, fontweight='bold', x=0.5, y=1.05, ha='center')
-    plt.figtext(0.92, -0.03, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=12)
+    fig.text(0.92, -0.03, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=12)
 
     if save:
         col_name_lower = col_name.lower().replace(' ', '_')
@@ -980,7 +995,7 @@ def make_team_kde(df, save=True):
         
         # word marks
         logo_path = nfl_wordmark_path_map[team]
-        image = OffsetImage(plt.imread(logo_path), zoom=.5)
+        image = imagecache.offset_image(logo_path, zoom=.5)
         ax.add_artist(AnnotationBbox(image, xy=(0.5,1.0), frameon=False, xycoords='axes fraction'))
     
     fig.tight_layout()
@@ -989,7 +1004,7 @@ def make_team_kde(df, save=True):
     year = df['year'].max()
     week = df['week'].max()
     fig.suptitle(f'{year} {col_name} Team By Team Distribution (Through Week {week})', fontsize=30, fontweight='bold', x=0.5, y=1.05, ha='center')
-    plt.figtext(0.92, -0.03, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=12)
+    fig.text(0.92, -0.03, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=12)
 
     if save:
         col_name_lower = col_name.lower().replace(' ', '_')
@@ -1030,7 +1045,7 @@ def make_team_jitter(df, save=True, play_type=False, y_lim_min=-10, ylim_max=60)
         
         # word marks
         logo_path = nfl_wordmark_path_map[team]
-        image = OffsetImage(plt.imread(logo_path), zoom=.5)
+        image = imagecache.offset_image(logo_path, zoom=.5)
         ax.add_artist(AnnotationBbox(image, xy=(0.6,1.0), frameon=False, xycoords='axes fraction'))
     
     fig.tight_layout()
@@ -1040,7 +1055,7 @@ def make_team_jitter(df, save=True, play_type=False, y_lim_min=-10, ylim_max=60)
     year = df['year'].max()
     week = df['week'].max()
     fig.suptitle(f'{year} {col_name} Team By Team Distribution (Through Week {week})', fontsize=30, fontweight='bold', x=0.5, y=1.05, ha='center')
-    plt.figtext(0.92, -0.03, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=12)
+    fig.text(0.92, -0.03, 'Data: @NFLfastR\nViz: @MulliganRob', fontsize=12)
 
     if save:
         col_name_lower = col_name.lower().replace(' ', '_')
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from nflfastr import get_nfl_fast_r_data, get_nfl_fast_r_roster, get_nfl_schedule_data, get_current_season_year
+from fantasyfootball.nflfastr import get_nfl_fast_r_data, get_nfl_fast_r_roster, get_nfl_schedule_data, get_current_season_year
+from fantasyfootball.playerindex import PlayerIndex
 
 def filter_passing_plays(df, offense=True):
     """
@@ -8,6 +10,13 @@ def filter_passing_plays(df, offense=True):
     Includes: completed passes, incomplete passes, interceptions, downs 1-4
     :df: pass a dataframe with play-by-play data from nflfastr
     """
+    return df.loc[passing_play_mask(df, offense=offense)]
+
+def passing_play_mask(df, offense=True):
+    """
+    Boolean mask of the plays that count towards passing stats, see filter_passing_plays
+    :df: pass a dataframe with play-by-play data from nflfastr
+    """
     comp_pass = df['complete_pass'] == 1
     inc_pass = df['incomplete_pass'] == 1
     int_pass = df['interception'] == 1
@@ -15,10 +24,8 @@ def filter_passing_plays(df, offense=True):
     na_down = ~df['down'].isna()
 
     if offense:
-        df = df.loc[(comp_pass | inc_pass | int_pass) & na_down]
-    else:
-        df = df.loc[(comp_pass | inc_pass | int_pass | sack) & na_down]
-    return df
+        return (comp_pass | inc_pass | int_pass) & na_down
+    return (comp_pass | inc_pass | int_pass | sack) & na_down
     
 def get_passing_stats(df=None, year=None, offense=True, weekly=False):
     """
@@ -39,7 +46,7 @@ def get_passing_stats(df=None, year=None, offense=True, weekly=False):
 
     # fumbles by QB when considered a passer
     fumbles= (df.loc[df['play_type'] == 'pass']
-                .assign(pass_fumbles= df.apply(lambda x: 1 if x['passer_player_id']==x['fumbled_1_player_id'] else 0,  axis='columns'))
+                .assign(pass_fumbles= (df['passer_player_id'] == df['fumbled_1_player_id']).astype(int))
                 .groupby(group).agg(pass_fumbles=('pass_fumbles', 'sum'))
                 )
     
@@ -53,7 +60,7 @@ def get_passing_stats(df=None, year=None, offense=True, weekly=False):
         df = df.loc[df['sack'] == 0]
 
     
-    qb = (df.assign(pass_tds= df.apply(lambda x: 1 if (x['touchdown'] ==1) & (x['td_team'] == x['posteam']) else 0, axis='columns')) # filter pick 6 and fumble return
+    qb = (df.assign(pass_tds= ((df['touchdown'] == 1) & (df['td_team'] == df['posteam'])).astype(int)) # filter pick 6 and fumble return
             .groupby(group)
             .agg(passing_games=('game_id', 'nunique'),
                  passing_yds=('passing_yards', 'sum'),
@@ -90,7 +97,8 @@ def get_receiving_stats(df=None, year=None, offense=True, weekly=False):
     if weekly:
         group.append('game_id')
         
-    wr = (df.assign(ez_tgts= lambda x: (x['air_yards']==x['yardline_100']))
+    wr = (df.assign(ez_tgts= lambda x: (x['air_yards']==x['yardline_100']),
+                    rz_tgts= lambda x: x['yardline_100'] <= 20)
             .groupby(group)
             .agg(rec_games=('game_id', 'nunique'),
                  rec_team=('posteam', 'last'),
@@ -101,7 +109,7 @@ def get_receiving_stats(df=None, year=None, offense=True, weekly=False):
                  targets=('play_id', 'count'),
                  rec=('complete_pass', 'sum'),
                  rec_fumbles=('fumble', 'sum'),
-                 rz_tgts=('yardline_100', lambda x: (x <= 20).sum()),
+                 rz_tgts=('rz_tgts', 'sum'),
                  ez_tgts=('ez_tgts', 'sum')
               )
              .assign(target_share= lambda x: x['targets'] / x.groupby('rec_team')['targets'].transform('sum') * 100,
@@ -135,7 +143,11 @@ def get_rushing_stats(df=None, year=None, offense=True, weekly=False):
     if weekly:
         group.append('game_id')
         
-    rb = (df.assign(rush_fumbles= df.apply(lambda x: 1 if x['fumbled_1_player_id'] == x['rusher_player_id'] else 0, axis='columns'))
+    # indicator columns keep the rate aggregations on the cythonized groupby mean
+    rb = (df.assign(rush_fumbles= (df['fumbled_1_player_id'] == df['rusher_player_id']).astype(int),
+                    pos_run= df['yards_gained'] > 0,
+                    att_5_yd= df['yardline_100'] <= 5,
+                    att_2_yd= df['yardline_100'] <= 2)
             .groupby(group)
             .agg(rush_games=('game_id', 'nunique'),
                  rush_team=('posteam', 'last'),
@@ -143,12 +155,15 @@ def get_rushing_stats(df=None, year=None, offense=True, weekly=False):
                  rushing_tds=('rush_touchdown', 'sum'),
                  att=('play_id', 'count'),
                  rush_fumbles=('rush_fumbles', 'sum'),
-                 pos_run_rate=('yards_gained', lambda x: (x > 0).mean() * 100),
-                att_5_yd_rate=('yardline_100', lambda x: (x <= 5).mean() * 100),
-                #att_5_yd=('yardline_100', lambda x: (x <= 5).sum()),
-                att_2_yd_rate=('yardline_100', lambda x: (x <= 2).mean() * 100) 
+                 pos_run_rate=('pos_run', 'mean'),
+                att_5_yd_rate=('att_5_yd', 'mean'),
+                #att_5_yd=('att_5_yd', 'sum'),
+                att_2_yd_rate=('att_2_yd', 'mean')
               )
-             .assign(carry_share= lambda x: x['att'] / x.groupby('rush_team')['att'].transform('sum') * 100,
+             .assign(pos_run_rate= lambda x: x['pos_run_rate'] * 100,
+                    att_5_yd_rate= lambda x: x['att_5_yd_rate'] * 100,
+                    att_2_yd_rate= lambda x: x['att_2_yd_rate'] * 100,
+                    carry_share= lambda x: x['att'] / x.groupby('rush_team')['att'].transform('sum') * 100,
                     yards_share= lambda x: x['rushing_yards'] / x.groupby('rush_team')['rushing_yards'].transform('sum') * 100,
                     ypc= lambda x: x['rushing_yards'] / x['att'],
                     td_rate= lambda x: x['rushing_tds'] / x['att'] * 100)
@@ -156,37 +171,177 @@ def get_rushing_stats(df=None, year=None, offense=True, weekly=False):
         )
     return rb
 
+# Stat families computed by get_player_stats: output column -> (play column, aggregation).
+# Play columns are shared across roles, e.g. 'yards' holds passing yards on passer rows and receiving yards on receiver rows;
+# integer counts keep their own column so they are not upcast by the float columns of other roles.
+STAT_FAMILIES = {
+    'qb': {'passing_games': ('game_id', 'nunique'),
+           'passing_yds': ('yards', 'sum'),
+           'pass_tds': ('pass_tds', 'sum'),
+           'interceptions': ('interception', 'sum'),
+           'completions': ('complete_pass', 'sum'),
+           'atts': ('play_id', 'count'),
+           'intended_pass_ay': ('air_yards', 'mean')},
+    'pass_fumbles': {'pass_fumbles': ('pass_fumbles', 'sum')},
+    'def_pass_yds': {'passing_yds': ('yards', 'sum')},
+    'wr': {'rec_games': ('game_id', 'nunique'),
+           'rec_team': ('posteam', 'last'),
+           'receiving_yards': ('yards', 'sum'),
+           'receiving_tds': ('tds', 'sum'),
+           'rec_ay': ('air_yards', 'sum'),
+           'adot': ('air_yards', 'mean'),
+           'targets': ('play_id', 'count'),
+           'rec': ('complete_pass', 'sum'),
+           'rec_fumbles': ('fumbles', 'sum'),
+           'rz_tgts': ('rz_tgts', 'sum'),
+           'ez_tgts': ('ez_tgts', 'sum')},
+    'rb': {'rush_games': ('game_id', 'nunique'),
+           'rush_team': ('posteam', 'last'),
+           'rushing_yards': ('yards', 'sum'),
+           'rushing_tds': ('tds', 'sum'),
+           'att': ('play_id', 'count'),
+           'rush_fumbles': ('rush_fumbles', 'sum'),
+           'pos_run_rate': ('pos_run', 'mean'),
+           'att_5_yd_rate': ('att_5_yd', 'mean'),
+           'att_2_yd_rate': ('att_2_yd', 'mean')},
+}
+
+def _role_plays(df, offense=True):
+    """
+    Stacks the plays once per stat family role (passer, receiver, rusher or defense); the rows of each family
+    mirror get_passing_stats, get_receiving_stats and get_rushing_stats
+    Returns the stacked plays, with the family and group key of every row, and the key column of every family
+    """
+    counted = passing_play_mask(df, offense=offense)
+    fumbler = df['fumbled_1_player_id']
+    if offense:
+        keys = {'qb': 'passer_player_id', 'pass_fumbles': 'passer_player_id', 'wr': 'receiver_player_id', 'rb': 'rusher_player_id'}
+        rows = {'qb': counted}
+    else:
+        keys = dict.fromkeys(['qb', 'pass_fumbles', 'def_pass_yds', 'wr', 'rb'], 'defteam')
+        # sack yards are counted for defensive total passing yards, all other stats mirror the opposing passer
+        rows = {'def_pass_yds': counted, 'qb': counted & (df['sack'] == 0)}
+    rows.update(pass_fumbles=df['play_type'] == 'pass', wr=counted, rb=pd.Series(True, index=df.index))
+
+    # flags are summed as integers, as the single-family groupbys sum their boolean columns
+    columns = {
+        'qb': {'yards': df['passing_yards'],
+               'pass_tds': ((df['touchdown'] == 1) & (df['td_team'] == df['posteam'])).astype(int)}, # filter pick 6 and fumble return
+        'pass_fumbles': {'pass_fumbles': (df['passer_player_id'] == fumbler).astype(int)},
+        'def_pass_yds': {'yards': df['yards_gained']},
+        'wr': {'yards': df['receiving_yards'],
+               'tds': df['pass_touchdown'],
+               'fumbles': df['fumble'],
+               'rz_tgts': (df['yardline_100'] <= 20).astype(int),
+               'ez_tgts': (df['air_yards'] == df['yardline_100']).astype(int)},
+        'rb': {'yards': df['rushing_yards'],
+               'tds': df['rush_touchdown'],
+               'rush_fumbles': (fumbler == df['rusher_player_id']).astype(int),
+               'pos_run': (df['yards_gained'] > 0).astype(int),
+               'att_5_yd': (df['yardline_100'] <= 5).astype(int),
+               'att_2_yd': (df['yardline_100'] <= 2).astype(int)},
+    }
+    # columns another family does not have are zero on its rows, so integer counts are not upcast by the stacking
+    padding = dict.fromkeys((col for family in rows for col in columns[family]), 0)
+    shared = ['play_id', 'game_id', 'posteam', 'interception', 'complete_pass', 'air_yards']
+    plays = pd.concat({family: df.loc[mask, shared]
+                                 .assign(key=df.loc[mask, keys[family]],
+                                         **{col: padding[col] if col not in columns[family] else columns[family][col].loc[mask]
+                                            for col in padding})
+                       for family, mask in rows.items()},
+                      names=['family'])
+    return plays, {family: keys[family] for family in rows}
+
+def get_player_stats(df=None, year=None, offense=True, weekly=False):
+    """
+    Returns passing, receiving and rushing stats side by side, computed in a single grouped pass over the play-by-play data
+    Every play is stacked once per role (passer, receiver, rusher or defense) and one groupby by family and player
+    aggregates every stat of STAT_FAMILIES; the columns match get_passing_stats, get_receiving_stats and get_rushing_stats
+    :df: pass in a dataframe; if left blank, a new play-by-play dataframe will be generated based on the year parameter
+    :year: pass in a season in order to generate the main dataframe
+    :weekly: default is set to False, which is season-long aggregation; set this to True if you want to get game-by-game stats
+    """
+    if df is None:
+        df = get_nfl_fast_r_data(year)
+
+    plays, keys = _role_plays(df, offense=offense)
+    aggs = {f'{col}_{func}': (col, func) for family in keys for col, func in STAT_FAMILIES[family].values()}
+    stats = plays.groupby(['family', 'key'] + (['game_id'] if weekly else [])).agg(**aggs)
+
+    frames = {}
+    for family, key in keys.items():
+        names = STAT_FAMILIES[family]
+        frames[family] = (stats.loc[stats.index.get_level_values('family') == family,
+                                    [f'{col}_{func}' for col, func in names.values()]]
+                               .droplevel('family')
+                               .rename_axis([key, 'game_id'] if weekly else key)
+                               .set_axis(list(names), axis='columns'))
+
+    qb = frames['qb'].sort_values('passing_yds', ascending=False)
+    qb = pd.concat([qb, frames['pass_fumbles']], axis='columns')
+    if not offense:
+        qb = qb.assign(passing_yds=frames['def_pass_yds']['passing_yds'])
+    wr = (frames['wr'].assign(target_share= lambda x: x['targets'] / x.groupby('rec_team')['targets'].transform('sum') * 100,
+                              yards_per_rec= lambda x: x['receiving_yards'] / x['rec'],
+                              ay_share= lambda x: x['rec_ay'] / x.groupby('rec_team')['rec_ay'].transform('sum') * 100,
+                              ay_pg= lambda x: x['rec_ay'] / x['rec_games'],
+                              catch_rate= lambda x: x['rec']/x['targets'] * 100)
+                      .sort_values('receiving_yards', ascending=False))
+    rb = (frames['rb'].assign(pos_run_rate= lambda x: x['pos_run_rate'] * 100,
+                              att_5_yd_rate= lambda x: x['att_5_yd_rate'] * 100,
+                              att_2_yd_rate= lambda x: x['att_2_yd_rate'] * 100,
+                              carry_share= lambda x: x['att'] / x.groupby('rush_team')['att'].transform('sum') * 100,
+                              yards_share= lambda x: x['rushing_yards'] / x.groupby('rush_team')['rushing_yards'].transform('sum') * 100,
+                              ypc= lambda x: x['rushing_yards'] / x['att'],
+                              td_rate= lambda x: x['rushing_tds'] / x['att'] * 100)
+                      .sort_values('rushing_yards', ascending=False))
+    return pd.concat([qb, wr, rb], axis='columns')
+
 def get_player_name_and_pos(year=None):
+    """Returns the gsis_id indexed name, team and position of each rostered player, read from the saved player index"""
     if year is None:
         year = get_current_season_year()
-    return (get_nfl_fast_r_roster(year).groupby(['gsis_id'])
-                                       .agg(name=('full_name', 'last'),
-                                            team=('team', 'last'),
-                                            pos=('position', 'last'))
-                                        .dropna()
-            )
-
-def combine_pass_rec_rush_stats(df=None, year=None, offense=True, weekly=False, pos=None):
+    return PlayerIndex.load_or_build(year).roster(int(year))
+
+def _join_roster(roster, stats, on):
+    """
+    Inner joins roster rows to stats rows by position instead of hashing the id strings of every row;
+    the row order matches roster.merge(stats, left_on=on, right_on=stats.index)
+    """
+    left = roster.reset_index()
+    if not left[on].is_unique:
+        return roster.merge(stats, left_on=on, right_on=stats.index)
+    roster_rows = pd.Index(left[on]).get_indexer(stats.index)
+    matched = np.flatnonzero(roster_rows != -1)
+    matched = matched[np.argsort(roster_rows[matched], kind='stable')]
+    return pd.concat([left.take(roster_rows[matched]).reset_index(drop=True),
+                      stats.take(matched).reset_index(drop=True)], axis='columns')
+
+def combine_pass_rec_rush_stats(df=None, year=None, offense=True, weekly=False, pos=None, roster=None):
+    """
+    Combines passing, receiving and rushing stats for a position
+    :pos: qb, rb or wr; if left blank, every stat column is returned
+    :roster: optional gsis_id indexed name/team/pos frame; if left blank, the roster for the year is downloaded
+    """
     if year is None:
         year = get_current_season_year()
-    df_dict = {}
+    if df is None:
+        # download the season once for every stat family
+        df = get_nfl_fast_r_data(year)
     if offense:
-        df_dict['roster'] = get_player_name_and_pos(year=year)
+        if roster is None:
+            roster = get_player_name_and_pos(year=year)
         cols = ['name', 'team', 'pos', 'games']
     else:
-        df_dict['roster'] = pd.DataFrame(df['defteam'].unique(), columns=['team']).set_index('team')
+        roster = pd.DataFrame(df['defteam'].unique(), columns=['team']).set_index('team')
         if weekly:
             cols = ['team', 'games']
         else:
             cols = ['games']
-    df_dict['qb'] = get_passing_stats(df=df, year=year, offense=offense, weekly=weekly)
-    df_dict['wr'] = get_receiving_stats(df=df, year=year, offense=offense, weekly=weekly)
-    df_dict['rb'] = get_rushing_stats(df=df, year=year, offense=offense, weekly=weekly)
+    stats = get_player_stats(df=df, offense=offense, weekly=weekly)
 
     if weekly:
-        roster = df_dict['roster']
-        df_dict.pop('roster')
-        df = pd.concat([df for k, df in df_dict.items()], axis='columns')
+        df = stats
         game_id = df.index.get_level_values(1)
         # convert game_id to column
         df = df.droplevel(1).assign(game_id=game_id)
@@ -194,10 +349,10 @@ def combine_pass_rec_rush_stats(df=None, year=None, offense=True, weekly=False,
             left_on = 'gsis_id'
         else: 
             left_on = 'team'
-        df = roster.merge(df, left_on=left_on, right_on=df.index).set_index('game_id')
+        df = _join_roster(roster, df, on=left_on).set_index('game_id')
         
     else:
-        df = pd.concat([df for k, df in df_dict.items()], axis='columns')
+        df = pd.concat([roster, stats], axis='columns')
 
     # fumbles
     fumbles = pd.DataFrame(df.filter(regex='fumble').sum(axis='columns'), columns=['fumbles'])
@@ -207,6 +362,8 @@ def combine_pass_rec_rush_stats(df=None, year=None, offense=True, weekly=False,
 
     df = pd.concat([df, fumbles, games], axis='columns')
 
+    if pos is None:
+        return df
     if pos.lower() == 'qb':
         qb_cols = ['passing_yds', 'pass_tds', 'rushing_tds', 'rushing_yards', 'interceptions','completions', 'atts', 'intended_pass_ay', 'fumbles']
         df = df.loc[:, cols + qb_cols].sort_values('passing_yds', ascending=False)
@@ -219,3 +376,42 @@ def combine_pass_rec_rush_stats(df=None, year=None, offense=True, weekly=False,
                    'catch_rate', 'fumbles']
         df = df.loc[:, cols + wr_cols].sort_values('receiving_yards', ascending=False)
     return df
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+    from os import path
+
+    # times each stat stage on synthetic play-by-play data, so the benchmark runs without downloading seasons;
+    # the synthetic seasons are the test fixtures
+    sys.path.insert(0, path.join(path.dirname(__file__), '..', 'tests'))
+    from fixtures import make_synthetic_pbp
+
+    def benchmark_stats(n_seasons=1, seed=0):
+        """
+        Times each stat stage and combine_pass_rec_rush_stats on synthetic play-by-play data
+        :n_seasons: number of synthetic seasons stacked into the frame
+        """
+        df = pd.concat([make_synthetic_pbp(seed=seed + ix, season=2023 - ix) for ix in range(n_seasons)], ignore_index=True)
+        roster = (pd.DataFrame({'gsis_id': pd.unique(df[['passer_player_id', 'receiver_player_id', 'rusher_player_id']].stack())})
+                    .assign(name=lambda x: x['gsis_id'], team='KC', pos='WR')
+                    .set_index('gsis_id'))
+        stages = {
+            'get_passing_stats': lambda: get_passing_stats(df=df),
+            'get_receiving_stats': lambda: get_receiving_stats(df=df),
+            'get_rushing_stats': lambda: get_rushing_stats(df=df),
+            'get_player_stats': lambda: get_player_stats(df=df),
+            'get_player_stats (weekly)': lambda: get_player_stats(df=df, weekly=True),
+            'combine_pass_rec_rush_stats': lambda: combine_pass_rec_rush_stats(df=df, year=2023, pos='wr', roster=roster),
+            'combine_pass_rec_rush_stats (weekly)': lambda: combine_pass_rec_rush_stats(df=df, year=2023, weekly=True, pos='wr', roster=roster),
+        }
+        timings = {}
+        for name, stage in stages.items():
+            start = time.perf_counter()
+            stage()
+            timings[name] = time.perf_counter() - start
+        return pd.Series(timings, name=f'seconds ({len(df)} plays)')
+
+    print(benchmark_stats())
+    print(benchmark_stats(n_seasons=25).loc[['get_player_stats', 'get_player_stats (weekly)']])
@@ -3,11 +3,12 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.offsetbox import AnnotationBbox, OffsetImage
+from matplotlib.offsetbox import AnnotationBbox
 from bs4 import BeautifulSoup
 import requests
 from fantasyfootball.config import fftoday_team_map, nfl_color_map, nfl_wordmark_path_map, FIGURE_DIR
 from fantasyfootball import nflfastr
+from fantasyfootball import imagecache
 from os import path
 
 def fftoday_fantasy_points_scored_scrape(pos, season=2020, side='Scored', league='Yahoo'):
@@ -129,7 +130,7 @@ def make_unit_compare_bar(df, *teams, unit='offense', width=0.75, legend='best',
     #team wordmarks
     if len(teams) == 2:
         logo_path = [nfl_wordmark_path_map[team] for team in df.columns]
-        images = [OffsetImage(plt.imread(file_path), zoom=1.1) for file_path in logo_path]
+        images = [imagecache.offset_image(file_path, zoom=1.1) for file_path in logo_path]
         coordinates = [(.25, 1.03), (.75, 1.03)]
         for co, im in zip(coordinates, images):
             ax.add_artist(AnnotationBbox(im, xy=co, frameon=False, xycoords='axes fraction'))
@@ -201,7 +202,7 @@ def make_o_vs_d_compare_bar(df, offense, defense, width=0.75, legend='best', sav
     
     #team wordmarks
     logo_path = [nfl_wordmark_path_map[team] for team in df.columns]
-    images = [OffsetImage(plt.imread(file_path), zoom=1.1) for file_path in logo_path]
+    images = [imagecache.offset_image(file_path, zoom=1.1) for file_path in logo_path]
     coordinates = [(.25, 1.03), (.75, 1.03)]
     for co, im in zip(coordinates, images):
         ax.add_artist(AnnotationBbox(im, xy=co, frameon=False, xycoords='axes fraction'))
@@ -0,0 +1,176 @@
+# playerindex.py
+
+import logging
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+from fantasyfootball import config, nflfastr
+from fantasyfootball.config import PLAYER_INDEX_DIR
+from fantasyfootball.utils.columnar import save_columns, load_columns
+
+logger = logging.getLogger(__name__)
+
+class PlayerIndex:
+    """
+    Player identities by season: gsis id, Pro Football Reference id, name, position, team and the
+    name based merge id from config.unique_id_create, with a dense integer player_key per gsis id.
+
+    The index is stored column by column under PLAYER_INDEX_DIR and loaded memory-mapped, and lookups
+    translate whole arrays of ids or names to player keys at once, so cross-source joins can be done on integers.
+    """
+    COLUMNS = ['season', 'player_key', 'gsis_id', 'pfr_id', 'player_name', 'pos', 'team', 'merge_id']
+    # id columns a player key can be looked up by
+    LOOKUP_COLUMNS = ['gsis_id', 'pfr_id', 'merge_id', 'player_name']
+
+    def __init__(self, frame: pd.DataFrame):
+        """
+        :param frame: One row per player and season with the index COLUMNS, sorted by season.
+        """
+        self.frame = frame
+        self._lookups = {}
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def seasons(self) -> list[int]:
+        return sorted(int(season) for season in pd.unique(self.frame['season']))
+
+    @classmethod
+    def from_roster(cls, roster: pd.DataFrame) -> 'PlayerIndex':
+        """
+        Builds the index from nflverse weekly roster rows; the last non-missing value of each season wins,
+        as in nflstats.get_player_name_and_pos.
+        """
+        df = (roster.groupby(['season', 'gsis_id'])
+                    .agg(pfr_id=('pfr_id', 'last'),
+                         player_name=('full_name', 'last'),
+                         pos=('position', 'last'),
+                         team=('team', 'last'))
+                    .reset_index()
+                    .pipe(config.unique_id_create)
+                    .rename(columns={'id': 'merge_id'}))
+        return cls._from_frame(df)
+
+    @classmethod
+    def _from_frame(cls, df: pd.DataFrame) -> 'PlayerIndex':
+        df = df.sort_values(['season', 'gsis_id'], kind='stable').reset_index(drop=True)
+        player_key, _ = pd.factorize(df['gsis_id'], sort=True)
+        df = df.assign(season=df['season'].astype(np.int16), player_key=player_key.astype(np.int32))
+        return cls(df.loc[:, cls.COLUMNS].astype({col: 'category' for col in cls.COLUMNS[2:]}))
+
+    @classmethod
+    def build(cls, *years) -> 'PlayerIndex':
+        """Builds the index for the given seasons from the nflverse weekly rosters."""
+        return cls.from_roster(nflfastr.get_nfl_fast_r_roster(*years))
+
+    def save(self, directory: str = PLAYER_INDEX_DIR):
+        """Writes the index column by column, replacing any index already in the directory."""
+        temp_dir = f'{directory}.tmp'
+        save_columns(self.frame, temp_dir)
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        os.replace(temp_dir, directory)
+        logger.info(f"Saved player index with {len(self)} rows for seasons {self.seasons} to {directory}")
+
+    @classmethod
+    def load(cls, directory: str = PLAYER_INDEX_DIR, mmap: bool = True) -> 'PlayerIndex':
+        """Loads a saved index, memory-mapping the code arrays."""
+        return cls(load_columns(directory, mmap=mmap))
+
+    @classmethod
+    def load_or_build(cls, *years, directory: str = PLAYER_INDEX_DIR, max_age: float = nflfastr.ONE_DAY) -> 'PlayerIndex':
+        """
+        Loads the saved index, adding seasons it does not cover yet.
+        The current season is rebuilt once the saved index is older than max_age seconds, since its rosters still change.
+        """
+        years = [int(year) for year in years if year is not None] or [int(nflfastr.get_current_season_year())]
+        index = None
+        if os.path.isdir(directory):
+            index = cls.load(directory)
+            missing = set(years) - set(index.seasons)
+            age = time.time() - os.path.getmtime(directory)
+            current = int(nflfastr.get_current_season_year())
+            if age > max_age and current in years and current in index.seasons:
+                missing.add(current)
+            if not missing:
+                return index
+            years = sorted(missing)
+        added = cls.build(*years)
+        if index is not None:
+            kept = index.frame.loc[~index.frame['season'].isin(years)]
+            frame = pd.concat([kept.astype(object), added.frame.astype(object)], ignore_index=True)
+            added = cls._from_frame(frame)
+        added.save(directory)
+        return added
+
+    def _lookup(self, column: str) -> tuple[pd.Index, np.ndarray]:
+        """Unique labels of a column and the player key of each; for repeated labels the latest season wins."""
+        if column not in self._lookups:
+            if column not in self.LOOKUP_COLUMNS:
+                raise ValueError(f"Player keys can only be looked up by {self.LOOKUP_COLUMNS}")
+            latest = (pd.DataFrame({'label': self.frame[column].astype(object), 'player_key': self.frame['player_key']})
+                        .dropna()
+                        .drop_duplicates('label', keep='last'))
+            self._lookups[column] = (pd.Index(latest['label']), latest['player_key'].to_numpy())
+        return self._lookups[column]
+
+    def keys(self, column: str, values) -> np.ndarray:
+        """
+        Translates an array of ids or names to player keys; unknown values map to -1.
+        :param column: One of LOOKUP_COLUMNS.
+        :param values: The values to translate.
+        """
+        labels, player_keys = self._lookup(column)
+        positions = labels.get_indexer(pd.Index(values, dtype=object))
+        return np.where(positions == -1, -1, player_keys[positions]).astype(np.int32)
+
+    def lookup(self, player_keys, columns: list = None, season: int = None) -> pd.DataFrame:
+        """
+        Returns player attributes for an array of player keys, aligned to the keys.
+        :param columns: Attributes to return; defaults to every column but the key.
+        :param season: Use the rows of this season; by default each player's latest season is used.
+        """
+        columns = columns or [col for col in self.COLUMNS if col != 'player_key']
+        frame = self.frame if season is None else self.frame.loc[self.frame['season'] == season]
+        return (frame.drop_duplicates('player_key', keep='last')
+                     .set_index('player_key')
+                     .reindex(np.asarray(player_keys))
+                     .loc[:, columns]
+                     .reset_index(drop=True))
+
+    def roster(self, season: int) -> pd.DataFrame:
+        """The gsis_id indexed name, team and position of every player on a season's rosters."""
+        return (self.frame.loc[self.frame['season'] == season, ['gsis_id', 'player_name', 'team', 'pos']]
+                          .astype(object)
+                          .rename(columns={'player_name': 'name'})
+                          .set_index('gsis_id')
+                          .dropna())
+
+
+if __name__ == "__main__":
+    # Lookup throughput on a synthetic multi-season index
+    n_players, n_seasons = 3_000, 25
+    rng = np.random.default_rng(0)
+    roster = pd.DataFrame({
+        'season': np.repeat(np.arange(2024 - n_seasons, 2024), n_players),
+        'gsis_id': np.tile([f'00-00{ix:05d}' for ix in range(n_players)], n_seasons),
+        'pfr_id': np.tile([f'Play{ix:04d}' for ix in range(n_players)], n_seasons),
+        'full_name': np.tile([f'First{ix} Last{ix}' for ix in range(n_players)], n_seasons),
+        'position': rng.choice(['QB', 'RB', 'WR', 'TE'], n_players * n_seasons),
+        'team': rng.choice(['KC', 'BUF', 'PHI', 'SF'], n_players * n_seasons),
+    })
+    index = PlayerIndex.from_roster(roster)
+    queries = rng.choice(roster['gsis_id'].to_numpy(), 1_000_000)
+
+    start = time.perf_counter()
+    keys = index.keys('gsis_id', queries)
+    index.lookup(keys, ['player_name', 'pos'])
+    print(f"vectorized: {time.perf_counter() - start:.3f}s for {len(queries)} ids")
+
+    start = time.perf_counter()
+    latest = index.frame.astype(object).drop_duplicates('gsis_id', keep='last')
+    pd.DataFrame({'gsis_id': queries}).merge(latest, on='gsis_id', how='left')
+    print(f"string merge: {time.perf_counter() - start:.3f}s for {len(queries)} ids")
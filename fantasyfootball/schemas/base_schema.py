@@ -0,0 +1,136 @@
+import logging
+from dataclasses import dataclass
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """
+    Declares a single column of a dataset.
+
+    :param name: The final column name after transformation.
+    :param dtype: The pandas dtype the column is stored as.
+    :param nullable: If False, rows with a missing or unparseable value are dropped at read time.
+    :param source: The raw column name produced by the datasource, if it differs from `name`.
+    :param percent: Whether the raw values are percent strings (e.g. '65.2%').
+    :param source_dtype: The dtype used at read time when the transformer still has to parse the raw text.
+    """
+    name: str
+    dtype: str
+    nullable: bool = True
+    source: str = None
+    percent: bool = False
+    source_dtype: str = None
+
+    @property
+    def categorical(self) -> bool:
+        return self.dtype == 'category'
+
+    @property
+    def numeric(self) -> bool:
+        return pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(self.dtype))
+
+    def matches(self, dtype) -> bool:
+        """Whether a column dtype already satisfies this spec."""
+        if self.categorical:
+            return isinstance(dtype, pd.CategoricalDtype)
+        return pd.api.types.pandas_dtype(self.dtype) == dtype
+
+
+class BaseSchema:
+    """
+    Base class for declarative dataset schemas.
+
+    Datasources apply the schema while parsing so frames arrive typed and compact,
+    and transformers use it to validate the final frame instead of re-inferring dtypes.
+    """
+    COLUMNS: list[ColumnSpec] = []
+
+    def __init__(self):
+        self.columns = {spec.name: spec for spec in self.COLUMNS}
+        # Raw column -> spec. Explicit source aliases win over names so a derived column
+        # never claims a raw column that is renamed elsewhere.
+        self.parse_map = {spec.source: spec for spec in self.COLUMNS if spec.source}
+        for spec in self.COLUMNS:
+            self.parse_map.setdefault(spec.name, spec)
+
+    @property
+    def column_order(self) -> list[str]:
+        return list(self.columns)
+
+    @property
+    def dtype_map(self) -> dict:
+        return {name: spec.dtype for name, spec in self.columns.items()}
+
+    def apply(self, dataframe: pd.DataFrame, columns: list[str] = None) -> pd.DataFrame:
+        """
+        Coerces raw columns to their declared dtypes and drops rows that violate non-nullable columns.
+        Columns that are not present in the DataFrame are skipped.
+
+        :param dataframe: The raw DataFrame.
+        :param columns: Restrict coercion to these raw columns (optional).
+        :return: The typed DataFrame.
+        """
+        present = [col for col in (columns or dataframe.columns) if col in self.parse_map]
+        if not present:
+            return dataframe
+
+        converted = {col: self._coerce(dataframe[col], self.parse_map[col]) for col in present}
+        required = [col for col in present if not self.parse_map[col].nullable]
+        if required:
+            invalid = pd.concat([converted[col].isna() for col in required], axis=1).any(axis=1)
+            if invalid.any():
+                logger.debug(f"Dropping {int(invalid.sum())} row(s) with missing values in {required}.")
+                converted = {col: series.loc[~invalid] for col, series in converted.items()}
+                dataframe = dataframe.loc[~invalid]
+
+        return dataframe.assign(**converted)
+
+    def _coerce(self, series: pd.Series, spec: ColumnSpec) -> pd.Series:
+        """Converts a single raw Series to the dtype declared by its spec."""
+        if spec.source_dtype:
+            return series.astype(spec.source_dtype)
+        if spec.matches(series.dtype):
+            return series
+        if spec.numeric:
+            if spec.percent and not pd.api.types.is_numeric_dtype(series):
+                series = series.astype('string').str.rstrip('%')
+            series = pd.to_numeric(series, errors='coerce')
+            try:
+                return series.astype(spec.dtype)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Column '{spec.name}' could not be stored as {spec.dtype}, using float32: {e}")
+                return series.astype('float32')
+        if spec.dtype.startswith('datetime64'):
+            return pd.to_datetime(series, errors='coerce')
+        return series.astype(spec.dtype)
+
+    def validate(self, dataframe: pd.DataFrame) -> list[str]:
+        """
+        Lists the columns whose dtype does not match the schema.
+
+        :param dataframe: The DataFrame to validate.
+        :return: The mismatched column names.
+        """
+        return [
+            name for name, spec in self.columns.items()
+            if name in dataframe.columns and not spec.matches(dataframe[name].dtype)
+        ]
+
+    def memory_report(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compares the memory usage of a DataFrame before and after applying the schema.
+
+        :param dataframe: The untyped DataFrame.
+        :return: A DataFrame with the per-column bytes before and after, and the total.
+        """
+        typed = self.apply(dataframe)
+        report = pd.DataFrame({
+            'dtype_before': dataframe.dtypes.astype(str),
+            'dtype_after': typed.dtypes.astype(str),
+            'bytes_before': dataframe.memory_usage(index=False, deep=True),
+            'bytes_after': typed.memory_usage(index=False, deep=True),
+        })
+        report.loc['total'] = ['', '', report['bytes_before'].sum(), report['bytes_after'].sum()]
+        return report
@@ -0,0 +1,70 @@
+import logging
+from fantasyfootball.schemas.base_schema import BaseSchema, ColumnSpec
+from fantasyfootball.factories.schema_factory import SchemaFactory
+
+logger = logging.getLogger(__name__)
+
+@SchemaFactory.register('fantasy_pros_rankings')
+class RankingsSchema(BaseSchema):
+    """Schema for the Fantasy Pros weekly rankings table."""
+
+    COLUMNS = [
+        ColumnSpec('rk', 'Int16'),
+        ColumnSpec('as_of_date', 'string'),
+        ColumnSpec('year', 'Int16'),
+        ColumnSpec('week', 'Int8'),
+        ColumnSpec('player_name', 'string', source='player name'),
+        ColumnSpec('pos', 'category'),
+        ColumnSpec('team', 'category'),
+        ColumnSpec('opp', 'string'),
+        ColumnSpec('matchup_rating', 'Int8', source='matchup (?)', source_dtype='string'),
+        ColumnSpec('start_sit_rating', 'string', source='start/sit'),
+        ColumnSpec('projected_fantasy_points', 'float32', source='proj. fpts'),
+    ]
+
+
+@SchemaFactory.register('fantasy_pros_projections')
+class ProjectionsSchema(BaseSchema):
+    """Schema for the Fantasy Pros projections table."""
+
+    COLUMNS = [
+        ColumnSpec('as_of_date', 'string'),
+        ColumnSpec('player_name', 'string', source='player'),
+        ColumnSpec('pos', 'category'),
+        ColumnSpec('team', 'category'),
+        ColumnSpec('year', 'Int16'),
+        ColumnSpec('week', 'Int8'),
+        ColumnSpec('receiving_rec', 'float32'),
+        ColumnSpec('receiving_yds', 'float32'),
+        ColumnSpec('receiving_tds', 'float32'),
+        ColumnSpec('rushing_att', 'float32'),
+        ColumnSpec('rushing_yds', 'float32'),
+        ColumnSpec('rushing_tds', 'float32'),
+        ColumnSpec('passing_att', 'float32'),
+        ColumnSpec('passing_cmp', 'float32'),
+        ColumnSpec('passing_yds', 'float32'),
+        ColumnSpec('passing_tds', 'float32'),
+        ColumnSpec('passing_ints', 'float32'),
+        ColumnSpec('fumbles_lost', 'float32', source='misc_fl'),
+        ColumnSpec('projected_fantasy_points', 'float32', source='misc_fpts'),
+    ]
+
+
+@SchemaFactory.register('fantasy_pros_draft')
+class DraftSchema(BaseSchema):
+    """Schema for the Fantasy Pros draft cheat sheet table."""
+
+    COLUMNS = [
+        ColumnSpec('rk', 'Int16'),
+        ColumnSpec('year', 'Int16'),
+        ColumnSpec('week', 'Int8'),
+        # Tier header rows have no player name
+        ColumnSpec('player_name', 'string', nullable=False, source='player name'),
+        ColumnSpec('pos', 'category'),
+        ColumnSpec('pos_rk', 'string', source='pos'),
+        ColumnSpec('team', 'category'),
+        ColumnSpec('bye', 'Int8'),
+        ColumnSpec('strength_of_schedule', 'Int8', source='sos', source_dtype='string'),
+        ColumnSpec('ecr_vs_adp', 'float32', source='ecr vs adp'),
+        ColumnSpec('as_of_date', 'string'),
+    ]
@@ -0,0 +1,98 @@
+import logging
+from fantasyfootball.schemas.base_schema import BaseSchema, ColumnSpec
+from fantasyfootball.factories.schema_factory import SchemaFactory
+
+logger = logging.getLogger(__name__)
+
+@SchemaFactory.register('prf_year_by_year')
+class YearByYearSchema(BaseSchema):
+    """Schema for the Pro Football Reference season fantasy table."""
+
+    COLUMNS = [
+        # Repeated header rows inside the table have 'Rk' here and are dropped at read time
+        ColumnSpec('rk', 'Int16', nullable=False),
+        ColumnSpec('player_name', 'string', source='player'),
+        ColumnSpec('pos', 'category', source='fantpos'),
+        ColumnSpec('year', 'Int16'),
+        ColumnSpec('age', 'Int8'),
+        ColumnSpec('tm', 'category'),
+        ColumnSpec('games', 'Int8', source='games_g'),
+        ColumnSpec('games_started', 'Int8', source='games_gs'),
+        ColumnSpec('passing_cmp', 'Int16'),
+        ColumnSpec('passing_att', 'Int16'),
+        ColumnSpec('passing_yds', 'Int16'),
+        ColumnSpec('passing_td', 'Int16'),
+        ColumnSpec('passing_int', 'Int16'),
+        ColumnSpec('rushing_att', 'Int16'),
+        ColumnSpec('rushing_yds', 'Int16'),
+        ColumnSpec('rushing_y/a', 'float32'),
+        ColumnSpec('rushing_td', 'Int16'),
+        ColumnSpec('receiving_tgt', 'Int16'),
+        ColumnSpec('receiving_rec', 'Int16'),
+        ColumnSpec('receiving_yds', 'Int16'),
+        ColumnSpec('receiving_y/r', 'float32'),
+        ColumnSpec('receiving_td', 'Int16'),
+        ColumnSpec('scoring_2pm', 'Int8'),
+        ColumnSpec('fumbles', 'Int8', source='fumbles_fmb'),
+        ColumnSpec('fumbles_lost', 'Int8', source='fumbles_fl'),
+        ColumnSpec('fantasy_posrank', 'Int16'),
+        ColumnSpec('fantasy_ovrank', 'Int16'),
+    ]
+
+
+@SchemaFactory.register('prf_game_by_game')
+class GameByGameSchema(BaseSchema):
+    """Schema for the Pro Football Reference player game log table."""
+
+    COLUMNS = [
+        # Season summary rows ('17 Games') have no date. Snaps stay text until the transformer has dropped
+        # the 'Inactive' games; other games without snaps ('Did Not Play') are kept
+        ColumnSpec('date', 'datetime64[ns]', nullable=False),
+        ColumnSpec('week', 'Int8'),
+        ColumnSpec('player_id', 'string'),
+        ColumnSpec('player_name', 'string'),
+        ColumnSpec('pos', 'category'),
+        ColumnSpec('year', 'Int16'),
+        ColumnSpec('age', 'float32', nullable=False),
+        ColumnSpec('tm', 'category'),
+        ColumnSpec('home/away', 'string', source='1'),
+        ColumnSpec('opp', 'category'),
+        ColumnSpec('result', 'string'),
+        ColumnSpec('off. snaps_num', 'Int16', source_dtype='string'),
+        ColumnSpec('passing_cmp', 'Int16'),
+        ColumnSpec('passing_att', 'Int16'),
+        ColumnSpec('passing_yds', 'Int16'),
+        ColumnSpec('passing_td', 'Int8'),
+        ColumnSpec('passing_int', 'Int8'),
+        ColumnSpec('rushing_att', 'Int16'),
+        ColumnSpec('rushing_yds', 'Int16'),
+        ColumnSpec('rushing_y/a', 'float32'),
+        ColumnSpec('rushing_td', 'Int8'),
+        ColumnSpec('receiving_tgt', 'Int16'),
+        ColumnSpec('receiving_rec', 'Int16'),
+        ColumnSpec('receiving_yds', 'Int16'),
+        ColumnSpec('receiving_y/r', 'float32'),
+        ColumnSpec('receiving_td', 'Int8'),
+        ColumnSpec('receiving_ctch_pct', 'float32', source='receiving_ctch%', percent=True),
+        ColumnSpec('receiving_y/tgt', 'float32'),
+        ColumnSpec('fumbles', 'Int8', source='fumbles_fmb'),
+        ColumnSpec('fumbles_lost', 'Int8', source='fumbles_fl'),
+    ]
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    import pandas as pd
+
+    # Memory usage of the bundled archives before and after applying the schemas
+    data_dir = Path(__file__).resolve().parents[2] / 'data'
+    datasets = {
+        'prf_year_by_year': data_dir / 'year-by-year',
+        'prf_game_by_game': data_dir / 'game-by-game',
+    }
+    for name, directory in datasets.items():
+        df = pd.concat((pd.read_csv(path) for path in sorted(directory.glob('*.csv'))), ignore_index=True)
+        report = SchemaFactory.create(name).memory_report(df)
+        before, after = report.loc['total', ['bytes_before', 'bytes_after']]
+        print(f"{name}: {len(df)} rows, {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB")
+        print(report.to_string(), end='\n\n')
@@ -0,0 +1,74 @@
+# scoring.py
+
+import numpy as np
+import pandas as pd
+
+# league dict keys that describe the league or its roster rather than a scored stat
+LEAGUE_SETTINGS = ['name', 'team_n', 'scoring', 'rounds', 'qb', 'rb', 'wr', 'te', 'flex', 'dst', 'k']
+# stats scored for each source, in the order the legacy config functions added them up
+FANTASY_PROS_STATS = ['receiving_rec', 'receiving_yds', 'receiving_td', 'rushing_yds', 'rushing_td',
+                      'passing_yds', 'passing_td', 'passing_int', 'fumbles']
+PRO_FOOTBALL_REFERENCE_STATS = FANTASY_PROS_STATS + ['fumbles_lost']
+
+def league_stats(leagues):
+    """Returns the stat columns declared by any of the leagues, in order of first appearance"""
+    return list(dict.fromkeys(key for league in leagues for key in league if key not in LEAGUE_SETTINGS))
+
+def scoring_weights(leagues, stats=None):
+    """
+    Returns the stat x league weight matrix
+    :leagues: list of league dicts from config.py
+    :stats: stat columns to score; defaults to every stat declared by a league, and undeclared stats weigh 0
+    """
+    stats = league_stats(leagues) if stats is None else list(stats)
+    return pd.DataFrame({league['name']: [league.get(stat, 0) for stat in stats] for league in leagues},
+                        index=stats, dtype=np.float64)
+
+def league_points(df, leagues, stats=None):
+    """
+    Returns custom fantasy points for every league in one pass, one '<name>_custom_pts' column per league
+    The stat matrix is multiplied by the league weight matrix, accumulated stat by stat in the order of `stats`
+    so the points are identical to adding the weighted stat columns up one league at a time
+    :df: dataframe with the stat columns; it is read, never copied or modified
+    :leagues: list of league dicts from config.py
+    :stats: stat columns to score; defaults to every stat declared by a league
+    """
+    weights = scoring_weights(leagues, stats)
+    points = np.zeros((len(df), weights.shape[1]))
+    for stat, weight in zip(weights.index, weights.to_numpy()):
+        points += df[stat].to_numpy(dtype=np.float64, na_value=np.nan)[:, None] * weight
+    return pd.DataFrame(points, index=df.index, columns=[f'{name}_custom_pts' for name in weights.columns])
+
+def add_league_points(df, leagues, stats=None):
+    """
+    Returns the dataframe with a '<name>_custom_pts' column per league appended; the input columns are shared, not copied
+    Points columns already on the dataframe are replaced in place of the old values
+    """
+    points = league_points(df, leagues, stats)
+    existing = [col for col in points.columns if col in df.columns]
+    if existing:
+        df = df.copy(deep=False)
+        for col in existing:
+            df[col] = points.pop(col)
+    return pd.concat([df, points], axis='columns', copy=False)
+
+
+if __name__ == "__main__":
+    import time
+    from pathlib import Path
+    from fantasyfootball import config
+
+    # Points for every configured league over the game-by-game archive: one league at a time versus one call
+    data_dir = Path(__file__).resolve().parents[1] / 'data' / 'game-by-game'
+    df = pd.concat((pd.read_csv(path) for path in sorted(data_dir.glob('*.csv'))), ignore_index=True)
+    df.columns = [col.lower() for col in df.columns]
+
+    start = time.perf_counter()
+    legacy = df
+    for league in config.scoring_List:
+        legacy = config.pro_football_reference_pts(legacy, league)
+    print(f"per league: {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    points = league_points(df, config.scoring_List, PRO_FOOTBALL_REFERENCE_STATS)
+    print(f"all leagues: {time.perf_counter() - start:.3f}s for {len(df)} rows")
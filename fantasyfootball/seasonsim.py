@@ -0,0 +1,152 @@
+# seasonsim.py
+
+import logging
+import numpy as np
+import pandas as pd
+from fantasyfootball import config
+
+logger = logging.getLogger(__name__)
+
+LINEUP_POSITIONS = ['QB', 'RB', 'WR', 'TE', 'DST', 'K']
+FLEX_POSITIONS = ['RB', 'WR', 'TE']
+# weekly standard deviation as a share of the weekly mean, for players without game-by-game history
+POS_CV = {'QB': 0.35, 'RB': 0.55, 'WR': 0.6, 'TE': 0.65, 'DST': 0.6, 'K': 0.45}
+PERCENTILES = [5, 25, 50, 75, 95]
+
+def roster_distribution(roster, league=config.sean, weekly=None, games=17, year=None):
+    """
+    Returns the weekly points distribution of every rostered player
+    The mean comes from the season projection ('<league name>_custom_pts' / games) and falls back on last season's
+    points per game; the spread is last season's weekly standard deviation, or POS_CV of the mean without history
+    :roster: players with 'id', 'player_name', 'pos' and optionally the league's projected points and 'bye'
+    :weekly: weekly summary indexed by merge id, e.g. weeklypoints.season_summary(league, year) or draft.get_weekly_data
+    :year: season of the weekly summary columns ('<year>_avg_ppg', '<year>_std_dev'); inferred when there is one
+    """
+    df = roster.reset_index(drop=True)
+    projection_col = f'{league.get("name")}_custom_pts'
+    mean = df[projection_col] / games if projection_col in df else pd.Series(np.nan, index=df.index)
+    std = pd.Series(np.nan, index=df.index)
+    if weekly is not None:
+        if year is None:
+            year = next(col.split('_')[0] for col in weekly.columns if col.endswith('_avg_ppg'))
+        history = weekly.reindex(df['id'])
+        mean = mean.fillna(pd.Series(history[f'{year}_avg_ppg'].to_numpy(), index=df.index))
+        std = pd.Series(history[f'{year}_std_dev'].to_numpy(), index=df.index)
+    std = std.fillna(mean * df['pos'].map(POS_CV))
+    bye = df['bye'] if 'bye' in df else pd.Series(np.nan, index=df.index)
+    return pd.DataFrame({'player_name': df['player_name'], 'pos': df['pos'], 'mean': mean.fillna(0),
+                         'std': std.fillna(0), 'bye': bye})
+
+def starter_mask(values, pos, league=config.sean):
+    """
+    Returns which players start under the league's lineup rules when the highest values start
+    :values: points with players on the last axis, any leading axes (e.g. simulations x weeks)
+    :pos: position of each player
+    """
+    pos = np.asarray(pos)
+    mask = np.zeros(values.shape, dtype=bool)
+    bench = np.zeros(values.shape, dtype=bool)
+    for p in LINEUP_POSITIONS:
+        cols = np.flatnonzero(pos == p)
+        slots = league.get(p.lower(), 0)
+        if not len(cols):
+            continue
+        ranks = _ranks(values[..., cols])
+        mask[..., cols] = ranks < slots
+        if p in FLEX_POSITIONS:
+            bench[..., cols] = ranks >= slots
+    flex = league.get('flex', 0)
+    if flex:
+        mask |= bench & (_ranks(np.where(bench, values, -np.inf)) < flex)
+    return mask
+
+def optimal_points(scores, pos, league=config.sean):
+    """
+    Returns the points of the best possible lineup, summed over the last (player) axis
+    Sorting each position's scores gives its starters and bench directly, which is cheaper than ranking every player
+    """
+    pos = np.asarray(pos)
+    total = np.zeros(scores.shape[:-1], dtype=scores.dtype)
+    bench = []
+    for p in LINEUP_POSITIONS:
+        cols = np.flatnonzero(pos == p)
+        slots = league.get(p.lower(), 0)
+        if not len(cols):
+            continue
+        ranked = np.sort(scores[..., cols], axis=-1)
+        total += ranked[..., max(len(cols) - slots, 0):].sum(axis=-1)
+        if p in FLEX_POSITIONS:
+            bench.append(ranked[..., :max(len(cols) - slots, 0)])
+    flex = league.get('flex', 0)
+    if flex and bench:
+        bench = np.sort(np.concatenate(bench, axis=-1), axis=-1)
+        total += bench[..., max(bench.shape[-1] - flex, 0):].sum(axis=-1)
+    return total
+
+def _ranks(values):
+    """Descending rank of every value along the last axis, ties broken by position"""
+    order = np.argsort(-values, axis=-1, kind='stable')
+    ranks = np.empty(order.shape, dtype=np.int16)
+    np.put_along_axis(ranks, order, np.arange(values.shape[-1], dtype=np.int16), axis=-1)
+    return ranks
+
+def _simulate_chunk(rng, mean, std, bye_mask, pos, league, n_sims, lineup, projected_mask):
+    """Simulates n_sims seasons and returns each season's team points"""
+    weeks, n_players = bye_mask.shape
+    scores = rng.standard_normal((n_sims, weeks, n_players), dtype=np.float32)
+    scores *= std
+    scores += mean
+    np.maximum(scores, 0, out=scores)
+    scores *= bye_mask
+    if lineup == 'projected':
+        return np.where(projected_mask, scores, 0).sum(axis=(1, 2), dtype=np.float64)
+    return optimal_points(scores, pos, league).sum(axis=1, dtype=np.float64)
+
+def simulate_season(dist, league=config.sean, n_sims=100_000, weeks=17, lineup='optimal', seed=0, chunk_size=5_000,
+                    return_totals=False):
+    """
+    Monte Carlo of a roster's season: weekly scores are drawn for every player (normal, floored at 0, 0 on bye weeks)
+    and the league's lineup is filled each week, vectorized over simulations, weeks and players
+    :dist: weekly distributions from roster_distribution
+    :league: league dict from config.py giving the lineup slots
+    :n_sims: number of seasons
+    :weeks: regular season weeks
+    :lineup: 'optimal' starts the highest scorers each week (best ball); 'projected' starts the highest projected
+             players that are not on bye
+    :chunk_size: seasons sampled at once in float32, which bounds memory use
+    :return: summary of the team's season points (mean, std, percentiles, weekly mean); with return_totals
+             the season points of every simulation too
+    """
+    if lineup not in ('optimal', 'projected'):
+        raise ValueError(f"Unknown lineup '{lineup}'. Available lineups: ['optimal', 'projected']")
+    mean = dist['mean'].to_numpy(dtype=np.float32)
+    std = dist['std'].to_numpy(dtype=np.float32)
+    pos = dist['pos'].to_numpy()
+    bye = dist['bye'].to_numpy(dtype=np.float64, na_value=np.nan) if 'bye' in dist else np.full(len(dist), np.nan)
+    bye_mask = (np.arange(1, weeks + 1)[:, None] != bye[None, :]).astype(np.float32)
+    projected_mask = starter_mask(mean * bye_mask, pos, league)
+
+    rng = np.random.default_rng(seed)
+    totals = np.concatenate([_simulate_chunk(rng, mean, std, bye_mask, pos, league,
+                                             min(chunk_size, n_sims - start), lineup, projected_mask)
+                             for start in range(0, n_sims, chunk_size)])
+    summary = pd.Series({'mean': totals.mean(), 'std': totals.std(),
+                         **{f'p{q}': value for q, value in zip(PERCENTILES, np.percentile(totals, PERCENTILES))},
+                         'weekly_mean': totals.mean() / weeks})
+    return (summary, totals) if return_totals else summary
+
+
+if __name__ == "__main__":
+    import time
+
+    # 100k seasons of a 16 player roster in a 1 QB, 2 RB, 2 WR, 1 TE, 1 FLEX, 1 DST, 1 K league
+    rng = np.random.default_rng(0)
+    pos = ['QB', 'QB', 'RB', 'RB', 'RB', 'RB', 'RB', 'WR', 'WR', 'WR', 'WR', 'WR', 'TE', 'TE', 'DST', 'K']
+    mean = rng.uniform(6, 22, len(pos))
+    dist = pd.DataFrame({'player_name': [f'Player {ix}' for ix in range(len(pos))], 'pos': pos, 'mean': mean,
+                         'std': mean * pd.Series(pos).map(POS_CV).to_numpy(), 'bye': rng.integers(5, 15, len(pos))})
+    for lineup in ('projected', 'optimal'):
+        start = time.perf_counter()
+        summary = simulate_season(dist, config.sean, n_sims=100_000, lineup=lineup)
+        print(f"{lineup}: {time.perf_counter() - start:.3f}s, mean {summary['mean']:.1f}, "
+              f"p5-p95 {summary['p5']:.1f}-{summary['p95']:.1f}")
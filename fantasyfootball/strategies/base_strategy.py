@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from functools import cached_property
 import logging
 import datetime
 import pandas as pd
@@ -10,31 +11,41 @@ import fantasyfootball.transformers  # Register transformers
 from fantasyfootball.factories.transformer_factory import TransformerFactory
 import fantasyfootball.parsers  # Register parsers
 from fantasyfootball.factories.parser_factory import ParserFactory
+import fantasyfootball.schemas  # Register schemas
+from fantasyfootball.factories.schema_factory import SchemaFactory
 
 logger = logging.getLogger(__name__)
 
 class BaseStrategy(ABC):
+    # attribute -> factory taking the combined config and the strategy, whose already built components it can reuse
     factory_mapping = {
-        'base_url': lambda cfg: cfg.get('base_url'),
-        'connector': lambda cfg: (
+        'base_url': lambda cfg, strategy: cfg.get('base_url'),
+        'connector': lambda cfg, strategy: (
             ConnectorFactory.create(cfg['connector'], base_url=cfg.get('base_url'))
             if 'connector' in cfg else None
         ),
-        'parser': lambda cfg: (
+        'parser': lambda cfg, strategy: (
             ParserFactory.create(cfg['parser'])
             if 'parser' in cfg else None
         ),
-        'datasource': lambda cfg: (
-            DatasourceFactory.create(cfg['datasource'])
+        'schema': lambda cfg, strategy: (
+            SchemaFactory.create(cfg['schema'])
+            if 'schema' in cfg else None
+        ),
+        'datasource': lambda cfg, strategy: (
+            DatasourceFactory.create(cfg['datasource'], schema=strategy.schema)
             if 'datasource' in cfg else None
         ),
-        'transformer': lambda cfg: (
-            TransformerFactory.create(cfg['transformer'])
+        'transformer': lambda cfg, strategy: (
+            TransformerFactory.create(cfg['transformer'], schema=strategy.schema,
+                                      copy_on_write=cfg.get('copy_on_write', False))
             if 'transformer' in cfg else None
         ),
-        'table_id': lambda cfg: cfg.get('table_id'),
-        'endpoint_template': lambda cfg: cfg.get('endpoint_template'),
+        'table_id': lambda cfg, strategy: cfg.get('table_id'),
+        'endpoint_template': lambda cfg, strategy: cfg.get('endpoint_template'),
     }
+    # Components that are expensive to build are created on first access instead of in _load_config
+    lazy_components = ('connector', 'parser', 'schema', 'datasource', 'transformer')
 
     def __init__(self, combined_config: dict, **kwargs):
         """
@@ -43,7 +54,6 @@ class BaseStrategy(ABC):
         :param kwargs: Additional parameters for the strategy (optional).
         """
         self.combined_config = {**combined_config, **kwargs}
-        self.sql_connector = ConnectorFactory.create('sql')
         self.output_modes = {
             "csv": self.save_to_csv,
             "db": self.publish_to_database,
@@ -61,9 +71,12 @@ class BaseStrategy(ABC):
     def _load_config(self):
         """
         Dynamically loads configuration using the factory mapping.
+        Components listed in `lazy_components` are skipped here and built on first access.
         """
         for attr_name, factory_func in self.factory_mapping.items():
-            value = factory_func(self.combined_config)
+            if attr_name in self.lazy_components:
+                continue
+            value = factory_func(self.combined_config, self)
             setattr(self, attr_name, value)
 
         # Load additional attributes from the combined config
@@ -71,6 +84,49 @@ class BaseStrategy(ABC):
         for key, value in additional_attrs.items():
             setattr(self, key, value)
 
+    def _build_component(self, name: str):
+        """
+        Build a single component from the factory mapping.
+
+        :param name: The factory mapping key of the component.
+        :return: The constructed component, or None if it is not configured.
+        """
+        logger.debug(f"Building '{name}' for {type(self).__name__}.")
+        return self.factory_mapping[name](self.combined_config, self)
+
+    @cached_property
+    def connector(self):
+        """The connector, created on first access."""
+        return self._build_component('connector')
+
+    @cached_property
+    def parser(self):
+        """The parser, created on first access."""
+        return self._build_component('parser')
+
+    @cached_property
+    def schema(self):
+        """The dataset schema, created on first access."""
+        return self._build_component('schema')
+
+    @cached_property
+    def datasource(self):
+        """The datasource, created on first access."""
+        return self._build_component('datasource')
+
+    @cached_property
+    def transformer(self):
+        """The transformer, created on first access."""
+        return self._build_component('transformer')
+
+    @cached_property
+    def sql_connector(self):
+        """
+        The SQL connector, only created when the 'db' output mode is used so that
+        'csv' and 'df' runs do not need the database environment variables.
+        """
+        return ConnectorFactory.create('sql')
+
     def publish_to_database(self, data: pd.DataFrame, append: bool = False, **kwargs):
         """
         Publish a DataFrame to the database using the SQL connector.
@@ -186,7 +242,6 @@ if __name__ == "__main__":
             return f"Running strategy with config: {self.__dict__}"
 
     strategy = SampleStrategy(config)
-    strategy._load_config()
     print(strategy.base_url)
     print(strategy.connector)
     print(strategy.parser)
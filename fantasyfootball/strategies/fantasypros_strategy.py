@@ -72,7 +72,7 @@ class FantasyProsStrategy(BaseStrategy):
                                             endpoint=endpoint, 
                                             table_id=table_id,
                                             parser=self.parser)
-        raw_data = raw_data.assign(**cols) if cols else raw_data
+        raw_data = self.datasource.assign_columns(raw_data, **cols) if cols else raw_data
         
         transformed_data = self.transformer.transform(raw_data)
         logger.info(f"Transformed data successfully")
@@ -60,6 +60,9 @@ class ProFootballReferenceGbGStrategy(BaseStrategy):
         """
         Processes data for a single year.
         
+        Raw player tables are transformed together, in batches of `transform_batch_size` players
+        (the whole year when it is not configured).
+
         :param year: Year to process.
         :param max_players: Maximum number of players to process.
         :return: A DataFrame containing the processed data for the year.
@@ -72,7 +75,8 @@ class ProFootballReferenceGbGStrategy(BaseStrategy):
         if self.max_players_per_year:
             player_hrefs = player_hrefs[:self.max_players_per_year]
 
-        year_data = []
+        batch_size = getattr(self, 'transform_batch_size', None) or len(player_hrefs) or 1
+        raw_tables, year_data = [], []
         for player_href in player_hrefs:
             try:
                 last_name_letter, player_id = self.datasource._player_id_transform(player_href)
@@ -95,16 +99,43 @@ class ProFootballReferenceGbGStrategy(BaseStrategy):
                 )
                 logger.debug(f"Constructed player endpoint: {player_endpoint}")
                 logger.debug(f"Columns added: {additional_cols}")
+                raw_tables.append(player_table)
 
-                transformed_data = self.transformer.transform(dataframe=player_table)
-                year_data.append(transformed_data)
+                if len(raw_tables) >= batch_size:
+                    year_data.append(self._transform_batch(raw_tables))
+                    raw_tables = []
                 
                 time.sleep(sleep)  # Sleep between processing each player
             except Exception as e:
                 logger.error(f"Failed to process player {player_href} for year {year}: {e}")
+
+        if raw_tables:
+            year_data.append(self._transform_batch(raw_tables))
         
         return pd.concat(year_data, ignore_index=True) if year_data else pd.DataFrame()
 
+    def _transform_batch(self, raw_tables: list[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Transforms the raw game logs of several players in one pass.
+        If the batch fails, each table is transformed on its own so one bad table only loses that player.
+
+        :param raw_tables: Raw player game log tables.
+        :return: The transformed DataFrame for the batch.
+        """
+        logger.info(f"Transforming a batch of {len(raw_tables)} player table(s).")
+        try:
+            return self.transformer.transform(dataframe=pd.concat(raw_tables, ignore_index=True))
+        except Exception as e:
+            logger.warning(f"Batch transform failed, transforming player tables individually: {e}")
+
+        transformed = []
+        for table in raw_tables:
+            try:
+                transformed.append(self.transformer.transform(dataframe=table.reset_index(drop=True)))
+            except Exception as e:
+                player_id = table['player_id'].iat[0] if 'player_id' in table and len(table) else 'unknown'
+                logger.error(f"Failed to transform player {player_id}: {e}")
+        return pd.concat(transformed, ignore_index=True) if transformed else pd.DataFrame()
 
 if __name__ == "__main__":
     pass
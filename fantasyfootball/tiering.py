@@ -0,0 +1,355 @@
+# tiering.py
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.cluster import KMeans
+from sklearn.mixture import GaussianMixture
+from fantasyfootball.config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+FEATURES = ['best', 'worst', 'avg']
+# ckmeans segments a single ordinal feature
+CKMEANS_FEATURES = ['avg']
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'DST', 'K']
+CLASSIFIERS = ['gmm', 'kmeans', 'ckmeans']
+
+def _segment_cost(S1, S2, i, j):
+    """Sum of squared deviations of the sorted values i..j (inclusive), from prefix sums; vectorized over i"""
+    count = j - i + 1
+    total = S1[j + 1] - S1[i]
+    return np.maximum(S2[j + 1] - S2[i] - total * total / count, 0)
+
+def ckmeans(values, k):
+    """
+    Optimal 1-D k-means (ckmeans): splits the sorted values into k contiguous groups with the lowest total
+    within-group sum of squares, by dynamic programming in O(k n log n)
+    The cost matrix is monotone, so each DP layer is filled by divide and conquer over the split points
+    :values: one value per player, e.g. the average expert rank
+    :k: number of groups; capped at the number of values
+    :return: group of every value in input order, 0 for the lowest values up to k - 1, deterministic for ties
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    k = max(min(int(k), n), 1)
+    order = np.argsort(x, kind='stable')
+    xs = x[order]
+    S1 = np.concatenate([[0.0], np.cumsum(xs)])
+    S2 = np.concatenate([[0.0], np.cumsum(xs * xs)])
+
+    cost = _segment_cost(S1, S2, 0, np.arange(n))
+    starts = np.zeros((k, n), dtype=np.int64)
+    for m in range(1, k):
+        previous, cost = cost, np.full(n, np.inf)
+        # row ranges lo..hi with their split candidates opt_lo..opt_hi; a group needs at least one value, so row >= m.
+        # The ranges of one recursion level are independent and solved together, log n vectorized steps per layer
+        lo, hi, opt_lo, opt_hi = (np.array([value]) for value in (m, n - 1, m, n - 1))
+        while len(lo):
+            mid = (lo + hi) // 2
+            lengths = np.minimum(mid, opt_hi) - opt_lo + 1
+            segment = np.repeat(np.arange(len(mid)), lengths)
+            offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+            candidates = opt_lo[segment] + np.arange(len(segment)) - offsets[segment]
+            totals = previous[candidates - 1] + _segment_cost(S1, S2, candidates, mid[segment])
+            # first (lowest) candidate reaching each range's minimum, as np.argmin would pick
+            minimum = np.minimum.reduceat(totals, offsets)
+            hits = np.flatnonzero(totals == minimum[segment])
+            best = candidates[hits[np.unique(segment[hits], return_index=True)[1]]]
+            cost[mid] = minimum
+            starts[m, mid] = best
+            lo, hi = np.concatenate([lo, mid + 1]), np.concatenate([mid - 1, hi])
+            opt_lo, opt_hi = np.concatenate([opt_lo, best]), np.concatenate([best, opt_hi])
+            keep = lo <= hi
+            lo, hi, opt_lo, opt_hi = lo[keep], hi[keep], opt_lo[keep], opt_hi[keep]
+
+    sorted_labels = np.empty(n, dtype=np.int64)
+    end = n - 1
+    for m in range(k - 1, -1, -1):
+        start = starts[m, end] if m else 0
+        sorted_labels[start:end + 1] = m
+        end = start - 1
+    labels = np.empty(n, dtype=np.int64)
+    labels[order] = sorted_labels
+    return labels
+
+def _fit(X, k, clf, covariance_type, random_state):
+    """Fits one model and returns its labels and fit diagnostics"""
+    n, d = X.shape
+    if clf == 'gmm':
+        model = GaussianMixture(n_components=k, covariance_type=covariance_type, random_state=random_state).fit(X)
+        return {'labels': model.predict(X), 'bic': model.bic(X), 'aic': model.aic(X), 'inertia': np.nan,
+                'converged': bool(model.converged_)}
+    if clf == 'kmeans':
+        model = KMeans(n_clusters=k, n_init=10, random_state=random_state).fit(X)
+        # BIC of the equivalent spherical Gaussian model, so k can be selected the same way for both classifiers
+        sse = max(model.inertia_, np.finfo(float).tiny)
+        bic = n * np.log(sse / n) + k * (d + 1) * np.log(n)
+        return {'labels': model.labels_, 'bic': bic, 'aic': n * np.log(sse / n) + 2 * k * (d + 1),
+                'inertia': model.inertia_, 'converged': True}
+    if clf == 'ckmeans':
+        if d != 1:
+            raise ValueError(f"ckmeans segments one feature, got {d}")
+        labels = ckmeans(X[:, 0], k)
+        means = np.bincount(labels, X[:, 0]) / np.bincount(labels)
+        sse = max(((X[:, 0] - means[labels]) ** 2).sum(), np.finfo(float).tiny)
+        return {'labels': labels, 'bic': n * np.log(sse / n) + k * (d + 1) * np.log(n),
+                'aic': n * np.log(sse / n) + 2 * k * (d + 1), 'inertia': sse, 'converged': True}
+    raise ValueError(f"Unknown classifier '{clf}'. Available classifiers: {CLASSIFIERS}")
+
+def fit_key(X, k, clf='gmm', covariance_type='diag', random_state=0):
+    """Cache key of a fit: a hash of the input data and of everything else the fit depends on"""
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    sha1 = hashlib.sha1(X.tobytes())
+    sha1.update(repr((X.shape, k, clf, covariance_type, random_state, sklearn.__version__)).encode('utf-8'))
+    return f'{clf}-{k}-{sha1.hexdigest()[:20]}'
+
+class ModelCache:
+    """
+    Fit results keyed by fit_key, in memory and pickled in a directory, so reruns in a new process skip the fits too.
+    Both hold at most `max_entries` results; the least recently used are dropped first, on disk by file mtime.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=4096):
+        """
+        :param cache_dir: Directory for pickled results; None keeps them in memory only.
+        :param max_entries: Upper bound on the results kept in memory and on disk.
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # a cache handed to a worker process is copied with its entries, the lock is not picklable
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def get(self, key):
+        """Returns the cached result of a key, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        if self.cache_dir is not None:
+            file_path = self._disk_path(key)
+            if os.path.exists(file_path):
+                with open(file_path, 'rb') as f:
+                    result = pickle.load(f)
+                os.utime(file_path)  # a read counts as a use for the disk eviction
+                self._remember(key, result)
+                return result
+        return None
+
+    def put(self, key, result):
+        self._remember(key, result)
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            file_path = self._disk_path(key)
+            temp_path = f'{file_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, file_path)
+            self._prune_disk()
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _prune_disk(self):
+        """Deletes the least recently used pickles beyond max_entries"""
+        with os.scandir(self.cache_dir) as it:
+            files = [entry for entry in it if entry.name.endswith('.pkl')]
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:  # removed by another process
+                pass
+
+    def clear(self):
+        """Drops every cached result, in memory and on disk"""
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir is not None and os.path.isdir(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith('.pkl'):
+                    os.remove(os.path.join(self.cache_dir, filename))
+
+# fitted tiers, in memory and under CACHE_DIR; call model_cache.clear() to refit
+model_cache = ModelCache(os.path.join(CACHE_DIR, 'tiering'))
+
+def fit_labels(X, k, clf='gmm', covariance_type='diag', random_state=0, cache=None):
+    """
+    Returns the cluster labels of one fit, from the cache when the same data was fitted before
+    :X: feature matrix, one row per player
+    :k: number of clusters
+    :clf: 'gmm' or 'kmeans'
+    """
+    return fit_many([(X, k)], clf, covariance_type, random_state, workers=1, cache=cache)[0]['labels']
+
+def fit_many(jobs, clf='gmm', covariance_type='diag', random_state=0, workers=None, cache=None):
+    """
+    Fits a batch of (X, k) jobs, running the cache misses in a process pool
+    :jobs: list of (feature matrix, number of clusters)
+    :workers: processes for the misses; defaults to the cpu count, and 1 fits them in this process
+    :cache: ModelCache of the fits; defaults to model_cache
+    :return: one dict per job with 'labels', 'bic', 'aic', 'inertia' and 'converged'
+    """
+    cache = model_cache if cache is None else cache
+    jobs = [(np.ascontiguousarray(X, dtype=np.float64), int(k)) for X, k in jobs]
+    keys = [fit_key(X, k, clf, covariance_type, random_state) for X, k in jobs]
+    results = [cache.get(key) for key in keys]
+    misses = [ix for ix, result in enumerate(results) if result is None]
+    if misses:
+        workers = workers or os.cpu_count() or 1
+        args = [(jobs[ix][0], jobs[ix][1], clf, covariance_type, random_state) for ix in misses]
+        if workers > 1 and len(misses) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(misses))) as executor:
+                fitted = list(executor.map(_fit, *zip(*args)))
+        else:
+            fitted = [_fit(*arg) for arg in args]
+        for ix, result in zip(misses, fitted):
+            cache.put(keys[ix], result)
+            results[ix] = result
+        logger.debug(f"Fitted {len(misses)} of {len(jobs)} models; {len(jobs) - len(misses)} came from the cache")
+    return results
+
+def rank_labels(labels):
+    """Renumbers cluster labels 1..k in order of first appearance, so the first rows get tier 1"""
+    unique_labels = list(dict.fromkeys(labels))
+    return pd.Series(labels).map(dict(zip(unique_labels, range(1, len(unique_labels) + 1)))).to_numpy()
+
+def tier_numbers(labels, clf='gmm'):
+    """
+    Tier numbers 1..k of a fit's labels, the one numbering used by the tables and the charts.
+    ckmeans labels already count up from the best ranked group; the other classifiers' are renumbered with rank_labels.
+    """
+    if clf == 'ckmeans':
+        return np.asarray(labels) + 1
+    return rank_labels(labels)
+
+def _position_features(df, positions, pos_n, features):
+    """Feature matrix of the top pos_n players of each position"""
+    if pos_n is not None and not isinstance(pos_n, dict):
+        pos_n = {p: int(pos_n) for p in positions}
+    matrices = {}
+    for p in positions:
+        pos_df = df.loc[df['pos'] == p]
+        if pos_n is not None and pos_n.get(p) is not None:
+            pos_df = pos_df.head(pos_n[p])
+        if len(pos_df):
+            matrices[p] = pos_df.loc[:, features].to_numpy(dtype=np.float64)
+    return matrices
+
+def tier_diagnostics(df, ks=range(1, 11), positions=POSITIONS, pos_n=None, clf='gmm', covariance_type='diag',
+                     features=None, workers=None, cache=None):
+    """
+    Fits every (position, k) combination at once and returns their fit diagnostics
+    :df: ECR frame with 'pos' and the feature columns, sorted by rank
+    :ks: numbers of clusters to try; values above a position's player count are skipped
+    :pos_n: players per position to cluster, as a number or a dict by position; all players by default
+    :features: columns to cluster on; FEATURES by default, CKMEANS_FEATURES for ckmeans
+    :return: one row per (pos, k) with n, bic, aic, inertia and converged
+    """
+    matrices = _position_features(df, positions, pos_n, features or _default_features(clf))
+    combos = [(p, k) for p, X in matrices.items() for k in ks if k <= len(X)]
+    results = fit_many([(matrices[p], k) for p, k in combos], clf, covariance_type, workers=workers, cache=cache)
+    return pd.DataFrame([{'pos': p, 'k': k, 'n': len(matrices[p]),
+                          **{key: value for key, value in result.items() if key != 'labels'}}
+                         for (p, k), result in zip(combos, results)])
+
+def _default_features(clf):
+    return CKMEANS_FEATURES if clf == 'ckmeans' else FEATURES
+
+def select_k(diagnostics, criterion='bic'):
+    """Returns the k with the lowest criterion ('bic' or 'aic') for every position"""
+    best = diagnostics.loc[diagnostics.groupby('pos', sort=False)[criterion].idxmin()]
+    return dict(zip(best['pos'], best['k'].astype(int)))
+
+def assign_tiers(df, tier_dict=None, ks=range(1, 11), pos_n=None, clf='gmm', covariance_type='diag',
+                 criterion='bic', features=None, workers=None, cache=None):
+    """
+    Assigns tiers by position like tiers.assign_tier_to_df, selecting k by BIC for positions missing from tier_dict
+    :tier_dict: number of tiers by position (or one number for all); None selects every position's k
+    :return: (the frame sorted by rank with 'pos_tiers', the diagnostics of every fit with the selected k flagged)
+    """
+    positions = [p for p in POSITIONS if p in set(df['pos'])]
+    features = features or _default_features(clf)
+    if tier_dict is not None and not isinstance(tier_dict, dict):
+        tier_dict = {p: int(tier_dict) for p in positions}
+    tier_dict = dict(tier_dict or {})
+    diagnostics = tier_diagnostics(df, ks, positions, pos_n, clf, covariance_type, features, workers, cache)
+    selected = select_k(diagnostics, criterion) if len(diagnostics) else {}
+    tier_dict = {p: tier_dict.get(p, selected.get(p)) for p in positions if p in tier_dict or p in selected}
+
+    matrices = _position_features(df, list(tier_dict), pos_n, features)
+    tier_dict = {p: min(k, len(matrices[p])) for p, k in tier_dict.items() if p in matrices}
+    results = fit_many([(matrices[p], k) for p, k in tier_dict.items()], clf, covariance_type, workers=workers,
+                       cache=cache)
+    df = df.assign(pos_tiers=np.nan)
+    for (p, k), result in zip(tier_dict.items(), results):
+        rows = df.index[df['pos'] == p][:len(result['labels'])]
+        df.loc[rows, 'pos_tiers'] = tier_numbers(result['labels'], clf)
+    diagnostics = diagnostics.assign(selected=[tier_dict.get(p) == k for p, k in zip(diagnostics['pos'], diagnostics['k'])])
+    return df.sort_values('rank').reset_index(drop=True), diagnostics
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    # BIC analysis of k = 1..10 for six positions: serial uncached fits versus the batched engine, cold and warm
+    rng = np.random.default_rng(0)
+    frames = []
+    for p, n in {'QB': 35, 'RB': 80, 'WR': 90, 'TE': 35, 'DST': 32, 'K': 32}.items():
+        avg = np.sort(rng.uniform(1, 250, n))
+        frames.append(pd.DataFrame({'pos': p, 'avg': avg, 'best': avg - rng.uniform(0, 20, n),
+                                    'worst': avg + rng.uniform(0, 40, n)}))
+    df = pd.concat(frames, ignore_index=True).sort_values('avg').assign(rank=lambda x: np.arange(1, len(x) + 1))
+
+    start = time.perf_counter()
+    for p in POSITIONS:
+        X = df.loc[df['pos'] == p, FEATURES]
+        [GaussianMixture(n_components=k, covariance_type='diag', random_state=0).fit(X).bic(X) for k in range(1, 11)]
+    print(f"serial: {time.perf_counter() - start:.3f}s")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ModelCache(cache_dir)
+        for label in ('batched, cold', 'batched, warm'):
+            start = time.perf_counter()
+            tiered, diagnostics = assign_tiers(df, cache=cache)
+            print(f"{label}: {time.perf_counter() - start:.3f}s")
+    print(select_k(diagnostics))
+
+    # ckmeans versus the GMM path on the average rank of every position, at the assign_tier_to_df k of 8
+    for clf in ('gmm', 'ckmeans'):
+        start = time.perf_counter()
+        for _ in range(10):
+            for p in POSITIONS:
+                X = df.loc[df['pos'] == p, FEATURES if clf == 'gmm' else CKMEANS_FEATURES]
+                _fit(X.to_numpy(), 8, clf, 'diag', 0)
+        print(f"{clf}, k=8: {(time.perf_counter() - start) * 100:.2f} ms per pass")
@@ -1,11 +1,13 @@
 # fantasyprostierskmeans.py
 
-from sklearn.cluster import KMeans
-from sklearn.mixture import GaussianMixture
 import pandas as pd
 import seaborn as sns
 from matplotlib import pyplot as plt
 from matplotlib import patches as mpatches
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D
 import numpy as np
 from mpl_toolkits import mplot3d
 from fantasyfootball import fantasypros as fp
@@ -13,8 +15,10 @@ from datetime import date
 from fantasyfootball import config
 from fantasyfootball.config import FIGURE_DIR
 from fantasyfootball import ffcalculator
+from fantasyfootball import tiering
 from os import path
-from collections import OrderedDict
+import sys
+import time
 
 #run SSE or AIC/BIC chart to pick cluster #s
 pos_tier_dict_viz = {
@@ -94,15 +98,65 @@ work_players = [
     'Jason Sanders'
     ]
 
-def make_clustering_viz(tier_dict=8, clf='gmm', league=config.sean, pos_n=35, x_size=20, y_size=15, covariance_type='diag', draft=False, save=True, players=None):
+def _label_collection(ax, x, y, labels, fontsize=None):
     """
-    Generates a chart with colored tiers; you can either use kmeans of GMM
+    Draws every label as one collection of text outlines: each label is a TextPath sized in points and offset
+    to its data coordinates, so the labels keep their size when the axis is rescaled
+    """
+    prop = FontProperties(size=fontsize or plt.rcParams['font.size'])
+    paths = [TextPath((0, 0), str(label), prop=prop) for label in labels]
+    points = Affine2D().scale(1 / 72) + ax.figure.dpi_scale_trans
+    collection = PathCollection(paths, offsets=np.column_stack([x, y]), offset_transform=ax.transData,
+                                transform=points, facecolor=plt.rcParams['text.color'], edgecolor='none', zorder=3)
+    collection.set_clip_on(False)
+    return ax.add_collection(collection, autolim=False)
+
+def draw_tier_ranges(ax, df, y_col, colors, default_color='yellow', labels=None, markers=None, highlight=None):
+    """
+    Draws the best-to-worst range of every player with a handful of batched artists: one LineCollection for
+    the ranges, one scatter for their end ticks, one scatter per marker for the average ranks and one collection
+    for the labels; only highlighted labels get their own text box
+    :df: players with 'best', 'worst', 'avg', the tier column 'pos_tiers' or 'tiers' and the y column
+    :colors: tier to color, players of other tiers get default_color
+    :labels: label of every player, defaults to 'player_name'
+    :markers: marker of every player for the average rank, defaults to a gray circle
+    :highlight: player labels to put in a yellow box
+    :return: list of the artists added
+    """
+    tier_col = 'pos_tiers' if 'pos_tiers' in df else 'tiers'
+    best, worst, center = (df[col].to_numpy(dtype=float) for col in ('best', 'worst', 'avg'))
+    y = df[y_col].to_numpy(dtype=float)
+    color = [colors.get(tier, default_color) for tier in df[tier_col]]
+    labels = np.asarray(df['player_name'] if labels is None else labels, dtype=object)
+    markers = np.asarray(['o'] * len(df) if markers is None else markers, dtype=object)
+
+    segments = np.stack([np.column_stack([best, y]), np.column_stack([worst, y])], axis=1)
+    artists = [ax.add_collection(LineCollection(segments, colors=color, alpha=0.5, zorder=1, linewidths=5.0)),
+               ax.scatter(np.concatenate([best, worst]), np.concatenate([y, y]), marker='|', c=color * 2, alpha=0.5, zorder=1)]
+    for marker in pd.unique(markers):
+        rows = markers == marker
+        artists.append(ax.scatter(center[rows], y[rows], color='gray', zorder=2, s=100, marker=marker))
+
+    boxed = np.isin(labels, list(highlight or []))
+    if (~boxed).any():
+        artists.append(_label_collection(ax, worst[~boxed] + 1, y[~boxed], labels[~boxed]))
+    for x_text, y_text, label in zip(worst[boxed] + 1, y[boxed], labels[boxed]):
+        artists.append(ax.text(x_text, y_text, label, bbox=dict(facecolor='yellow', alpha=0.2)))
+    return artists
+
+def make_clustering_viz(tier_dict=8, clf='gmm', league=config.sean, pos_n=35, x_size=20, y_size=15, covariance_type='diag', draft=False, save=True, players=None, df=None, cache=None):
+    """
+    Generates a chart with colored tiers; you can either use kmeans, ckmeans or GMM
     Optional: Pass in a custom tier dict to show varying numbers of tiers; default will be uniform across position
     Optional: Pass in a custom pos_n dict to show different numbers of players by position
+    Optional: Pass in an ECR dataframe to skip scraping it
+    Optional: Pass in a tiering.ModelCache for the fits; tiering.model_cache by default
     """
     pos_list = ['RB', 'QB', 'WR', 'TE', 'DST', 'K', 'FLEX']
     palette = ['red', 'blue', 'green', 'orange', '#900C3F', '#2980B9', '#FFC300', '#581845', '#73d01a', '#4c4c4c']
-    if draft:
+    if df is not None:
+        df = df.copy()
+    elif draft:
         df = fp.fantasy_pros_ecr_process(league)
     else:
         df = fp.create_fantasy_pros_ecr_df(league)
@@ -114,47 +168,21 @@ def make_clustering_viz(tier_dict=8, clf='gmm', league=config.sean, pos_n=35, x_
     if not isinstance(pos_n, dict): # convert a scalar into a dict across pos
         pos_n = {pos: int(pos_n) for pos in pos_list}   
     
+    features = tiering.CKMEANS_FEATURES if clf == 'ckmeans' else tiering.FEATURES
+    pos_dfs = {p: df.loc[df['pos'] == p].head(pos_n[p]).copy() for p in tier_dict}
+    # every position is fitted in one batch, from the model cache when the rankings were clustered before
+    results = tiering.fit_many([(pos_dfs[p].loc[:, features], k) for p, k in tier_dict.items()],
+                               clf=clf, covariance_type=covariance_type, cache=cache)
+
     plt.style.use('ggplot')
-    fig, ax = plt.subplots(figsize=(x_size, y_size))
-    
-    for p, k in tier_dict.items():
+    for (p, k), result in zip(tier_dict.items(), results):
+        fig, ax = plt.subplots(figsize=(x_size, y_size))
         colors = dict(zip(range(1, k+1), palette[:k]))
-        cutoff = pos_n[p]
-        pos_df = df.loc[df['pos'] == p].head(cutoff).copy()
-        X = pos_df.loc[:, ['best', 'worst', 'avg']].copy()
-
-        if clf=='kmeans':
-            kmm = KMeans(n_clusters=k).fit(X)
-            labels = kmm.predict(X)
-        else: #gaussian mixture
-            gmm = GaussianMixture(n_components=k, covariance_type=covariance_type, random_state=0).fit(X)
-            labels = gmm.predict(X)
+        pos_df = pos_dfs[p]
         # map unordered tiers to tiers starting at 1
-        unique_labels = list(OrderedDict.fromkeys(labels))
-        rank_dict = dict(zip(unique_labels, range(1,len(unique_labels)+1)))
-        pos_df['pos_tiers'] = labels
-        pos_df['pos_tiers'] = pos_df['pos_tiers'].map(rank_dict)   
-
-        for _, row in pos_df.iterrows():
-            xmin = row['best']
-            xmax = row['worst']
-            center = row['avg']
-            player = row['player_name']
-            tier = row['pos_tiers']
-            if p == 'FLEX':
-                ymin, ymax = row['rank'], row['rank']
-            else:
-                ymin, ymax = row['pos_rank'], row['pos_rank']
-            
-            ax.scatter(center, ymax, color='gray', zorder=2, s=100)
-            ax.scatter(xmin, ymax, marker= "|", color=colors.get(tier, 'yellow'), alpha=0.5, zorder=1)
-            ax.scatter(xmax, ymax, marker= "|", color=colors.get(tier, 'yellow'), alpha=0.5, zorder=1)
-            ax.plot((xmin, xmax), (ymin, ymax), color=colors.get(tier, 'yellow'), alpha=0.5, zorder=1, linewidth=5.0)
-            if player in players:
-                bbox = dict(facecolor='yellow', alpha=0.2)
-            else: 
-                bbox=None
-            ax.annotate(player, xy=(xmax+1, ymax), bbox=bbox)
+        pos_df['pos_tiers'] = tiering.tier_numbers(result['labels'], clf)
+
+        draw_tier_ranges(ax, pos_df, 'rank' if p == 'FLEX' else 'pos_rank', colors, highlight=players)
 
         patches = [mpatches.Patch(color=color, alpha=0.5, label=f'Tier {tier}') for tier, color in colors.items()]
         ax.legend(handles=patches, borderpad=1, fontsize=12)
@@ -172,34 +200,37 @@ def make_clustering_viz(tier_dict=8, clf='gmm', league=config.sean, pos_n=35, x_
         if save:
             league_text = league['name']
             fig.savefig(path.join(FIGURE_DIR,fr'{date_str}_rangeofrankings_{clf}_{league_text}_{p}.png'))
-        plt.cla() 
+            plt.close(fig)
         #return plt.show()
 
-def _k_helper_func(ax, models, n_components, clf, title=None):
+def _k_helper_func(ax, diagnostics, clf, title=None):
+    n_components = diagnostics['k'].to_numpy()
     if clf == 'gmm':
-        ax.plot(n_components, [m.bic(X) for m in models], label='BIC')
-        ax.plot(n_components, [m.aic(X) for m in models], label='AIC')
-    elif clf == 'kmeans':
-        ax.plot(n_components, [m.inertia_ for m in models], label='SSE')
+        ax.plot(n_components, diagnostics['bic'], label='BIC')
+        ax.plot(n_components, diagnostics['aic'], label='AIC')
+    elif clf in ('kmeans', 'ckmeans'):
+        ax.plot(n_components, diagnostics['inertia'], label='SSE')
     ax.set_xlabel("k")
     ax.legend(loc='best')
     ax.set_xticks(np.arange(1, len(n_components), step=1))
     if title:
         ax.set_title(title) 
 
-def show_k_number(league=config.sean, clf='gmm', pos_breakout=True, pos_n=None, k=10, covariance_type='diag'):
+def show_k_number(league=config.sean, clf='gmm', pos_breakout=True, pos_n=None, k=10, covariance_type='diag', df=None):
     """
-    clf: 'gmm' or 'kmeans'
-    'kmeans' : Plots the SSE for different k-means cluster values for k
+    clf: 'gmm', 'kmeans' or 'ckmeans'
+    'kmeans' : Plots the SSE for different k-means cluster values for k ('ckmeans' does the same on the average rank alone)
     Specify a number for n if you wish to segment position groups by a cutoff number
     Plots distorition for a given cluster # - the optimal cluster # will be the point in which the line flattens out, forming an elbow
     'gmm' : Plots the Akaike's Information Criterion (AIC) and Bayesian Information Criterion (BIC) for clusters in a range for a dataset
     The goal is to pick the number of clusters that minimize the AIC or BIC
     Optional: Pass a dict with specific quanities per posiiton
+    Optional: Pass in the ECR df; it is scraped otherwise
+    All (position, k) models are fitted in one batch by the tiering module, which caches them for reruns
     """
-    #df = fp.fantasy_pros_ecr_process(league)
+    df = fp.fantasy_pros_ecr_process(league) if df is None else df
     n_components = range(1, k+1)
-    X_cols = ['avg' ,'best', 'worst']
+    X_cols = ['avg' ,'best', 'worst'] if clf != 'ckmeans' else tiering.CKMEANS_FEATURES
     if pos_breakout:
         rows = 2
         cols = 3
@@ -218,39 +249,27 @@ def show_k_number(league=config.sean, clf='gmm', pos_breakout=True, pos_n=None,
             'DST': ax[0][2], # top right
             'K': ax[1][2] # bottom right
             }
-
+        diagnostics = tiering.tier_diagnostics(df, n_components, list(pos), pos_n, clf, covariance_type, features=X_cols)
         for p, ax in pos.items():
-            if isinstance(pos_n, int):
-                pos_num = {k: pos_n for k,v in pos.items()}
-            elif pos_n is None:
-                pos_num = df.loc[df['pos']==p].shape[0]
-            elif isinstance(pos_n, dict):
-                pos_num = pos_n[p]
-            print(p)
-            print(pos_num)
-            pos_df = df.loc[df['pos'] == p].head(pos_num).copy()
-            X = pos_df[X_cols].copy()
-            if clf == 'gmm':
-                models = [GaussianMixture(n_components=n, covariance_type=covariance_type, random_state=0).fit(X) for n in n_components]
-            elif clf == 'kmeans':
-                models = [KMeans(n_clusters=n).fit(X) for n in n_components]
-            _k_helper_func(ax, clf=clf, models=models, n_components=n_components, title=p)
+            _k_helper_func(ax, diagnostics.loc[diagnostics['pos'] == p], clf=clf, title=p)
     else:
-        X = df[X_cols].head(200).copy()
-        if clf == 'gmm':
-            models = [GaussianMixture(n_components=n, covariance_type=covariance_type, random_state=0).fit(X) for n in n_components]
-        elif clf == 'kmeans':
-            models = [KMeans(n_clusters=n).fit(X) for n in n_components]
-        _k_helper_func(ax, clf=clf, models=models, n_components=n_components)
+        X = df.head(200).assign(pos='ALL')
+        diagnostics = tiering.tier_diagnostics(X, n_components, ['ALL'], None, clf, covariance_type, features=X_cols)
+        _k_helper_func(ax, diagnostics, clf=clf)
     return plt.show()
 
-def assign_tier_to_df(df, tier_dict=8, kmeans=False, pos_n=None, covariance_type='diag'):
+def assign_tier_to_df(df, tier_dict=8, kmeans=False, pos_n=None, covariance_type='diag', method=None):
     """
     Assigns a tier by position to a dataframe (either kmeans or GMM method)
     Optional: Pass in a custom tier dict to show varying numbers of tiers; default will be uniform across position
     Optional: Pass in a custom pos_n dict to show different numbers of players by position
+    Optional: Pass method='ckmeans' for the exact 1-D segmentation of the average rank: deterministic, and tier 1
+    always holds the best ranked players; 'gmm' and 'kmeans' are the same as the kmeans flag
     """
+    method = method or ('kmeans' if kmeans else 'gmm')
+    features = tiering.CKMEANS_FEATURES if method == 'ckmeans' else tiering.FEATURES
     df_list = []
+    jobs = []
     df = df.copy()
     if not isinstance(tier_dict, dict):
         tier_dict = {pos: int(tier_dict) for  pos in ['QB', 'RB', 'WR', 'TE', 'DST', 'K']}
@@ -258,30 +277,24 @@ def assign_tier_to_df(df, tier_dict=8, kmeans=False, pos_n=None, covariance_type
         if pos_n is None:
             pos_df = df.loc[df['pos'] == p].copy()
             extra_df = pd.DataFrame()
-            x = pos_df.loc[:, ['best', 'worst', 'avg']].copy().reset_index(drop=True)
         else:
             if not isinstance(pos_n, dict):
                 pos_n = {k: int(pos_n) for k,v in tier_dict.items()}
             pos_df = df.loc[df['pos'] == p].head(pos_n[p]).copy().reset_index(drop=True)
             extra_df = df.loc[df['pos'] == p][pos_n[p]:].copy().reset_index(drop=True)
-            x = pos_df.loc[:, ['best', 'worst', 'avg']].head(pos_n[p]).copy().reset_index(drop=True)
-        if kmeans:
-            kmm = KMeans(n_clusters=k).fit(x)
-            labels = kmm.predict(x) 
+        df_list.append((pos_df, extra_df))
+        if len(pos_df):
+            jobs.append((pos_df, k))
         else:
-            gmm = GaussianMixture(n_components=k, covariance_type=covariance_type, random_state=0).fit(x)
-            labels = gmm.predict(x)
-        unique_labels = []
-        for i in labels:
-            if i not in unique_labels:
-                unique_labels.append(i)
-        rank_dict = dict(zip(unique_labels, range(1,len(unique_labels)+1)))
-        pos_df['pos_tiers'] = labels
-        pos_df['pos_tiers'] = pos_df['pos_tiers'].map(rank_dict)
+            pos_df['pos_tiers'] = np.nan
+    # all positions are fitted in one batch, reusing cached fits
+    results = tiering.fit_many([(pos_df.loc[:, features], k) for pos_df, k in jobs], clf=method,
+                               covariance_type=covariance_type)
+    for (pos_df, k), result in zip(jobs, results):
+        pos_df['pos_tiers'] = tiering.tier_numbers(result['labels'], method)
+    for pos_df, extra_df in df_list:
         extra_df['pos_tiers'] = np.nan
-        df_list.append(pos_df)
-        df_list.append(extra_df)
-    df = pd.concat(df_list, ignore_index=True)
+    df = pd.concat([frame for frames in df_list for frame in frames], ignore_index=True)
     df = (df.sort_values('rank')
             .reset_index(drop=True)
          )
@@ -300,13 +313,14 @@ def best_worst_avg_3d_viz(league=config.sean, pos_n=35):
         ax.scatter3D(x, y, z)
         plt.show()
 
-def draftable_position_quantity(league=config.sean):
-    """Analyzes how many of each position are being drafted in mock drafts for the current year"""
+def draftable_position_quantity(league=config.sean, adp=None):
+    """Analyzes how many of each position are being drafted in mock drafts for the current year
+    Optional: Pass in an ADP dataframe sorted by ADP to skip scraping it again"""
     team_n = league.get('team_n')
     draftable_players = team_n * league.get('rounds')
     pos_values = {'DST': 0, 'K': 0}
     pos_values = {k: team_n for k, v in pos_values.items()} 
-    df = ffcalculator.adp_process(league)
+    df = ffcalculator.adp_process(league) if adp is None else adp
     df = df.head(draftable_players)
     pos_list = ['RB', 'WR', 'QB', 'TE']
     for pos in pos_list:
@@ -316,7 +330,62 @@ def draftable_position_quantity(league=config.sean):
 
 if __name__ == "__main__":
     #run elbow chart or AIC/BIC chart to estimate optimal number of k for each pos
-    
+    #python -m fantasyfootball.tiers --benchmark times the chart rendering on synthetic rankings instead
+    if '--benchmark' in sys.argv:
+        import matplotlib
+        matplotlib.use('Agg')
+        # the synthetic rankings are the test fixtures
+        sys.path.insert(0, path.join(path.dirname(__file__), '..', 'tests'))
+        from fixtures import make_ecr
+
+        def benchmark_tier_charts(leagues=(config.sean, config.work, config.justin), tier_dict=8, pos_n=35, seed=0):
+            """
+            Renders every position chart of make_clustering_viz for each league, drawing the players one artist at a
+            time as the charts used to and with draw_tier_ranges; run it with a headless backend such as Agg
+            :return: seconds and artists per chart of both ways
+            """
+            pos_list = ['RB', 'QB', 'WR', 'TE', 'DST', 'K']
+            palette = ['red', 'blue', 'green', 'orange', '#900C3F', '#2980B9', '#FFC300', '#581845', '#73d01a', '#4c4c4c']
+            colors = dict(zip(range(1, tier_dict + 1), palette[:tier_dict]))
+
+            def per_player(ax, pos_df):
+                for _, row in pos_df.iterrows():
+                    color = colors.get(row['pos_tiers'], 'yellow')
+                    ax.scatter(row['avg'], row['pos_rank'], color='gray', zorder=2, s=100)
+                    ax.scatter(row['best'], row['pos_rank'], marker='|', color=color, alpha=0.5, zorder=1)
+                    ax.scatter(row['worst'], row['pos_rank'], marker='|', color=color, alpha=0.5, zorder=1)
+                    ax.plot((row['best'], row['worst']), (row['pos_rank'], row['pos_rank']), color=color, alpha=0.5, zorder=1, linewidth=5.0)
+                    ax.annotate(row['player_name'], xy=(row['worst'] + 1, row['pos_rank']))
+
+            def batched(ax, pos_df):
+                draw_tier_ranges(ax, pos_df, 'pos_rank', colors)
+
+            charts = []
+            for ix, league in enumerate(leagues):
+                df = make_ecr(seed + ix)
+                df['pos_rank'] = df['pos_rank'].replace('[^0-9]', '', regex=True).astype('int')
+                for p in pos_list:
+                    pos_df = df.loc[df['pos'] == p].head(pos_n).copy()
+                    pos_df['pos_tiers'] = tiering.ckmeans(pos_df['avg'], tier_dict) + 1
+                    charts.append(pos_df)
+
+            timings = {}
+            for name, draw in (('per player', per_player), ('batched', batched)):
+                start = time.perf_counter()
+                artists = 0
+                for pos_df in charts:
+                    fig, ax = plt.subplots(figsize=(20, 15))
+                    draw(ax, pos_df)
+                    ax.invert_yaxis()
+                    fig.canvas.draw()
+                    artists += len(ax.get_children())
+                    plt.close(fig)
+                timings[name] = {'seconds': time.perf_counter() - start, 'artists per chart': artists / len(charts)}
+            return pd.DataFrame(timings).T.rename_axis(f'{len(charts)} charts')
+
+        print(benchmark_tier_charts())
+        sys.exit()
+
     #draftable_pos_dict = draftable_position_quantity(league)
 
     make_clustering_viz(tier_dict=pos_tier_dict_viz, league=config.work, pos_n=draftable_quantity_dict, covariance_type='diag', players=work_players)
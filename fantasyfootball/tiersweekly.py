@@ -4,9 +4,9 @@ from fantasyfootball import tiers
 from fantasyfootball import fantasypros as fp
 from fantasyfootball import config
 from fantasyfootball import ffcalculator
+from fantasyfootball import tiering
+from fantasyfootball.tiers import draw_tier_ranges
 from fantasyfootball.config import FIGURE_DIR
-from sklearn.cluster import KMeans
-from sklearn.mixture import GaussianMixture
 from matplotlib import pyplot as plt
 from matplotlib import patches as mpatches
 from matplotlib.lines import Line2D
@@ -14,7 +14,6 @@ import numpy as np
 import matplotlib.style as style
 from datetime import date
 from os import path
-from collections import OrderedDict
 
 flex_list = [
         'Clyde Edwards-Helaire',
@@ -105,11 +104,13 @@ different_spelling = [
     'Allen Robinson',
     'Mark Ingram',
 ]
-def make_clustering_viz_flex(tiers=15, kmeans=False, league=config.sean, player_cutoff=150, player_per_chart=50, x_size=20, y_size=15, covariance_type='diag', save=True, export=False, player_list=None):
+def make_clustering_viz_flex(tiers=15, kmeans=False, league=config.sean, player_cutoff=150, player_per_chart=50, x_size=20, y_size=15, covariance_type='diag', save=True, export=False, player_list=None, method=None, df=None):
     """
     Generates a chart with colored tiers; you can either use kmeans of GMM
+    Optional: Pass method='ckmeans' for the exact, deterministic 1-D segmentation of the average rank
     Optional: Pass in a custom tier dict to show varying numbers of tiers; default will be uniform across position
     Optional: Pass in a custom pos_n dict to show different numbers of players by position
+    Optional: Pass in an ECR dataframe to skip scraping it
     """
     pos = 'FLEX'
     palette = ['red', 'blue', 'green', 'orange', '#900C3F', 'maroon', 'cornflowerblue', 'greenyellow', 'coral', 'orchid', 'firebrick', 'lightsteelblue', 'palegreen', 'darkorange', 'crimson', 'darkred', 'aqua', 'forestgreen', 'navajowhite', 'mediumpurple']
@@ -118,7 +119,7 @@ def make_clustering_viz_flex(tiers=15, kmeans=False, league=config.sean, player_
         'WR': 's',
         'TE': '^'
         }
-    df = fp.create_fantasy_pros_ecr_df(league)
+    df = fp.create_fantasy_pros_ecr_df(league) if df is None else df.copy()
     #derive pos for flex players
     pos_df = df.loc[df['pos'] != pos]
     pos_map = dict(zip(pos_df['player_name'].to_list(), pos_df['pos'].to_list()))
@@ -131,18 +132,11 @@ def make_clustering_viz_flex(tiers=15, kmeans=False, league=config.sean, player_
     df['rank'] = df['rank'].astype('int')
     today = date.today()
     date_str = today.strftime('%m.%d.%Y')
-    x = df.loc[:, ['best', 'worst', 'avg']].copy()
-    if kmeans:
-        kmm = KMeans(n_clusters=tiers).fit(x)
-        labels = kmm.predict(x)
-    else: #gausianmixture
-        gmm = GaussianMixture(n_components=tiers, covariance_type=covariance_type, random_state=0).fit(x)
-        labels = gmm.predict(x)
-    unique_labels = list(OrderedDict.fromkeys(labels))
-    rank_dict = dict(zip(unique_labels, range(1,len(unique_labels)+1)))
-    df['tiers'] = labels
-    df['tiers'] = df['tiers'].map(rank_dict)                             
-    
+    method = method or ('kmeans' if kmeans else 'gmm')
+    features = tiering.CKMEANS_FEATURES if method == 'ckmeans' else tiering.FEATURES
+    labels = tiering.fit_labels(df.loc[:, features], tiers, clf=method, covariance_type=covariance_type)
+    df['tiers'] = tiering.tier_numbers(labels, method)
+
     style.use('ggplot')
     colors = dict(zip(range(1, tiers+1), palette[:tiers]))
     tier_lookup = dict(zip(palette[:tiers], range(1, tiers+1)))
@@ -161,47 +155,43 @@ def make_clustering_viz_flex(tiers=15, kmeans=False, league=config.sean, player_
         patches = [mpatches.Patch(color=color, alpha=0.5, label=f'Tier {tier_lookup[color]}') for color in color_chunk]
         pos_patches = [Line2D([0], [0], color='gray', label=pos, marker=shape, lw=0, markersize=12) for pos, shape in pos_shape.items()]
         
-        for _, row in chunk_df.iterrows():
-            xmin = row['best']
-            xmax = row['worst']
-            ymin, ymax = row['rank'], row['rank']
-            center = row['avg']
-            player = row['player_name'] + ', ' +row['tm'] + ' (' + row['pos_map'] + ')'
-            tier = row['tiers']
-            
-            plt.scatter(center, ymax, color='gray', zorder=2, s=100, marker=pos_shape[row['pos_map']])
-            plt.scatter(xmin, ymax, marker= "|", color=colors.get(tier, 'moccasin'), alpha=0.5, zorder=1)
-            plt.scatter(xmax, ymax, marker= "|", color=colors.get(tier, 'moccasin'), alpha=0.5, zorder=1)
-            plt.plot((xmin, xmax), (ymin, ymax), color=colors.get(tier, 'moccasin'), alpha=0.5, zorder=1, linewidth=5.0)
-            plt.annotate(player, xy=(xmax+1, ymax))
+        player_labels = chunk_df['player_name'] + ', ' + chunk_df['tm'] + ' (' + chunk_df['pos_map'] + ')'
+        draw_tier_ranges(ax, chunk_df, 'rank', colors, default_color='moccasin', labels=player_labels,
+                         markers=chunk_df['pos_map'].map(pos_shape))
 
         #first legend
-        first_legend = plt.legend(handles=pos_patches, loc='lower left', borderpad=1, fontsize=12)
-        ax = plt.gca().add_artist(first_legend)
+        first_legend = ax.legend(handles=pos_patches, loc='lower left', borderpad=1, fontsize=12)
+        ax.add_artist(first_legend)
         #second legend
-        plt.legend(handles=patches, borderpad=1, fontsize=12)
+        ax.legend(handles=patches, borderpad=1, fontsize=12)
         if player_list is not None:
             league_name = league['name']
-            plt.title(f'{date_str} Fantasy Football Weekly - {pos} - {league_name} - {ix+1}')
+            ax.set_title(f'{date_str} Fantasy Football Weekly - {pos} - {league_name} - {ix+1}')
         else:
-            plt.title(f'{date_str} Fantasy Football Weekly - {pos} {ix+1}')
-        plt.xlabel('Average Expert Overall Rank')
-        plt.ylabel('Expert Consensus Position Rank')
+            ax.set_title(f'{date_str} Fantasy Football Weekly - {pos} {ix+1}')
+        ax.set_xlabel('Average Expert Overall Rank')
+        ax.set_ylabel('Expert Consensus Position Rank')
 
         fig.set_size_inches(x_size, y_size)
-        plt.gca().invert_yaxis()
+        ax.invert_yaxis()
         #plt.tight_layout()
         if save:
-            if kmeans:
+            if method == 'ckmeans':
+                if player_list is not None:
+                    fig.savefig(path.join(FIGURE_DIR,fr'{date_str}_rangeofrankings_ckmeans__FLEX_{league_name}_{ix+1}.png'))
+                else:
+                    fig.savefig(path.join(FIGURE_DIR,fr'{date_str}_rangeofrankings_ckmeans__{pos}_{ix+1}.png'))
+            elif method == 'kmeans':
                 if player_list is not None:
-                    plt.savefig(path.join(FIGURE_DIR,fr'{date_str}_rangeofrankings_kmeans__FLEX_{league_name}_{ix+1}.png'))
+                    fig.savefig(path.join(FIGURE_DIR,fr'{date_str}_rangeofrankings_kmeans__FLEX_{league_name}_{ix+1}.png'))
                 else: 
-                    plt.savefig(path.join(FIGURE_DIR,fr'{date_str}_rangeofrankings_kmeans__{pos}_{ix+1}.png'))
+                    fig.savefig(path.join(FIGURE_DIR,fr'{date_str}_rangeofrankings_kmeans__{pos}_{ix+1}.png'))
             else:
                 if player_list is not None:
-                    plt.savefig(path.join(FIGURE_DIR,fr'{date_str}_rangeofrankings_gmm__FLEX_list{league_name}_{ix+1}.png'))
+                    fig.savefig(path.join(FIGURE_DIR,fr'{date_str}_rangeofrankings_gmm__FLEX_list{league_name}_{ix+1}.png'))
                 else:
-                    plt.savefig(path.join(FIGURE_DIR,fr'{date_str}_rangeofrankings_gmm_{pos}_{ix+1}.png'))
+                    fig.savefig(path.join(FIGURE_DIR,fr'{date_str}_rangeofrankings_gmm_{pos}_{ix+1}.png'))
+            plt.close(fig)
         if export:
             df.to_csv(path.join(FIGURE_DIR,fr'{date_str}_ecr_tiers.csv'), index=False)              
     #return plt.show()
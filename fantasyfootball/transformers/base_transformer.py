@@ -1,20 +1,63 @@
 import logging
 from abc import ABC, abstractmethod
+from functools import wraps
 import pandas as pd
+from fantasyfootball.schemas.base_schema import BaseSchema
+from fantasyfootball.transformers.transform_plan import TransformPlan
 
 logger = logging.getLogger(__name__)
 
 class BaseTransformer(ABC):
     """
     Abstract base class for data cleaning and preparation.
+
+    Column renames and drops, the final reindex and row drops are queued on a TransformPlan and
+    executed together the next time `dataframe` is read, so a chain of those steps runs as one pass.
     """
 
-    def __init__(self, dataframe: pd.DataFrame):
+    def __init__(self, dataframe: pd.DataFrame, schema: BaseSchema = None, copy_on_write: bool = False):
         """
         Initialize the transformer with a DataFrame.
         :param dataframe: The DataFrame to be transformed.
+        :param schema: The dataset schema used to validate the final DataFrame (optional).
+        :param copy_on_write: Run `transform` with pandas Copy-on-Write enabled.
         """
+        self._plan = TransformPlan()
         self.dataframe = dataframe
+        self.schema = schema
+        self.copy_on_write = copy_on_write
+
+    def __init_subclass__(cls, **kwargs):
+        """Wraps each subclass `transform` so it honours the copy_on_write option."""
+        super().__init_subclass__(**kwargs)
+        if 'transform' in cls.__dict__:
+            transform = cls.__dict__['transform']
+
+            @wraps(transform)
+            def wrapper(self, *args, **kwargs):
+                if not getattr(self, 'copy_on_write', False):
+                    return transform(self, *args, **kwargs)
+                with pd.option_context('mode.copy_on_write', True):
+                    return transform(self, *args, **kwargs)
+
+            cls.transform = wrapper
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """The current DataFrame, with any queued steps applied."""
+        if self._plan:
+            self._dataframe = self._plan.execute(self._dataframe)
+        return self._dataframe
+
+    @dataframe.setter
+    def dataframe(self, dataframe: pd.DataFrame):
+        self._plan = TransformPlan()
+        self._dataframe = dataframe
+
+    @property
+    def columns(self) -> list[str]:
+        """The column names of the DataFrame after the queued steps, without executing them."""
+        return self._plan.columns(self._dataframe)
 
     @abstractmethod
     def transform(self) -> pd.DataFrame:
@@ -27,27 +70,28 @@ class BaseTransformer(ABC):
     def _rename_columns(self, rename_map: dict):
         """Renames columns based on a provided mapping."""
         logger.debug("Renaming columns using provided map.")
-        self.dataframe = self.dataframe.rename(columns=rename_map)
+        self._plan.rename(rename_map)
         return self
 
     def _drop_columns(self, columns: list = None):
         """Drops columns"""
         logger.debug("Cleaning columns: dropping unwanted columns.")
         if columns:
-            self.dataframe = self.dataframe.drop(columns=columns)
+            missing = set(columns) - set(self.columns)
+            if missing:
+                raise KeyError(f"{sorted(missing)} not found in axis")
+            self._plan.drop_columns(columns)
 
         return self
 
     def _reindex_and_fill(self, column_order: list, fill_value=0, dtype_map: dict = None):
-        """Reorders columns, fills missing values, and casts data types."""
+        """
+        Reorders columns, fills missing values, and casts data types.
+        Each step only runs when needed, so a frame that already matches the schema is not copied.
+        Text columns typed by the schema (string or category) keep their missing values.
+        """
         logger.debug("Reindexing columns and filling missing values.")
-        self.dataframe = (self.dataframe
-                          .reindex(columns=column_order, fill_value=fill_value)
-                          .infer_objects(copy=False)
-                          .fillna(fill_value)
-        )
-        if dtype_map:
-            self.dataframe = self.dataframe.astype(dtype_map)
+        self._plan.reindex(column_order, fill_value=fill_value, dtype_map=dtype_map, schema=self.schema)
         return self
     
     def _drop_rows(self, condition: pd.Series):
@@ -58,6 +102,6 @@ class BaseTransformer(ABC):
         if not isinstance(condition, pd.Series):
             raise ValueError("Condition must be a pandas Series.")
         logger.debug(f"Dropping rows that meet {condition}")
-        self.dataframe = self.dataframe.loc[~condition]
+        # Comparisons on string columns return missing values for missing entries
+        self._plan.drop_rows(condition)
         return self
-    
\ No newline at end of file
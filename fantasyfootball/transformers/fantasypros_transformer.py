@@ -1,6 +1,7 @@
 import pandas as pd
 import logging
 from fantasyfootball.transformers.base_transformer import BaseTransformer
+from fantasyfootball.schemas.base_schema import BaseSchema
 from fantasyfootball.factories.transformer_factory import TransformerFactory
 
 logger = logging.getLogger(__name__)
@@ -20,12 +21,14 @@ class RankingsTransfomer(BaseTransformer):
 
     DROP_COLS = ['wsis']
 
-    def __init__(self, dataframe: pd.DataFrame = None):
+    def __init__(self, dataframe: pd.DataFrame = None, schema: BaseSchema = None, copy_on_write: bool = False):
         """
         Initializes the transformer with optional DataFrame.
         :param dataframe: The DataFrame to transform (optional).
+        :param schema: The dataset schema (optional).
+        :param copy_on_write: Run the transformation with pandas Copy-on-Write enabled.
         """
-        super().__init__(dataframe)
+        super().__init__(dataframe, schema=schema, copy_on_write=copy_on_write)
 
     def transform(self, dataframe: pd.DataFrame = None) -> pd.DataFrame:
         """Performs the entire transformation process."""
@@ -89,12 +92,14 @@ class ProjectionsTransfomer(BaseTransformer):
                           'passing_att', 'passing_cmp', 'passing_yds', 'passing_tds', 'passing_ints',
                           'fumbles_lost', 'projected_fantasy_points']
 
-    def __init__(self, dataframe: pd.DataFrame = None):
+    def __init__(self, dataframe: pd.DataFrame = None, schema: BaseSchema = None, copy_on_write: bool = False):
         """
         Initializes the transformer with optional DataFrame.
         :param dataframe: The DataFrame to transform (optional).
+        :param schema: The dataset schema (optional).
+        :param copy_on_write: Run the transformation with pandas Copy-on-Write enabled.
         """
-        super().__init__(dataframe)
+        super().__init__(dataframe, schema=schema, copy_on_write=copy_on_write)
 
     def transform(self, dataframe: pd.DataFrame = None) -> pd.DataFrame:
         """Performs the entire transformation process."""
@@ -141,12 +146,14 @@ class DraftTransfomer(BaseTransformer):
     FINAL_COLUMN_ORDER = ['rk', 'year', 'week', 'player_name', 'pos', 'pos_rk', 'team', 
                             'bye', 'strength_of_schedule', 'ecr_vs_adp', 'as_of_date']
 
-    def __init__(self, dataframe: pd.DataFrame = None):
+    def __init__(self, dataframe: pd.DataFrame = None, schema: BaseSchema = None, copy_on_write: bool = False):
         """
         Initializes the transformer with optional DataFrame.
         :param dataframe: The DataFrame to transform (optional).
+        :param schema: The dataset schema (optional).
+        :param copy_on_write: Run the transformation with pandas Copy-on-Write enabled.
         """
-        super().__init__(dataframe)
+        super().__init__(dataframe, schema=schema, copy_on_write=copy_on_write)
 
     def transform(self, dataframe: pd.DataFrame = None) -> pd.DataFrame:
         """Performs the entire transformation process."""
@@ -1,44 +1,41 @@
+import functools
 import pandas as pd
 import logging
 from fantasyfootball.transformers.base_transformer import BaseTransformer
+from fantasyfootball.schemas.base_schema import BaseSchema
 from fantasyfootball.factories.transformer_factory import TransformerFactory
 
 logger = logging.getLogger(__name__)
 
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:
+    STRING_DTYPE = 'string'
+
 @TransformerFactory.register('nflfastr')
 class NflfastrTransfomer(BaseTransformer):
     """Encapsulates transformation logic for ranking data."""
-    COLUMN_DTYPES = {
-        'desc': str,
-        'yrdln': str,
-        'time': str,
-        'time_of_day': str,
-        'end_clock_time': lambda x: pd.to_datetime(x, errors='coerce'),
-        'drive_real_start_time': lambda x: pd.to_datetime(x, errors='coerce'),
-        'drive_time_of_possession': str,
-        'drive_game_clock_start': str,
-        'drive_game_clock_end': str,
-        'drive_start_yard_line': str,
-        'drive_end_yard_line': str,
-        'side_of_field': str,
-        'yrdln': str,
-        'pass_length': str,
-        'run_gap': str,
-        'weather': str,
-        'surface': str,
-        'passer': str,
-        'rusher': str,
-        'receiver': str,
-        'fantasy': str
-
-    }
-
-    def __init__(self, dataframe: pd.DataFrame = None):
+    DATETIME_FORMAT = 'ISO8601'
+    DATETIME_COLUMNS = ['end_clock_time', 'drive_real_start_time']
+    STRING_COLUMNS = [
+        'desc', 'yrdln', 'time', 'time_of_day', 'drive_time_of_possession', 'drive_game_clock_start',
+        'drive_game_clock_end', 'drive_start_yard_line', 'drive_end_yard_line', 'weather',
+        'passer', 'rusher', 'receiver', 'fantasy'
+    ]
+    CATEGORICAL_COLUMNS = ['side_of_field', 'pass_length', 'run_gap', 'surface']
+    # Columns matched by suffix: ids and names are high-cardinality text, the rest are small label sets
+    STRING_SUFFIXES = ('id', 'name')
+    CATEGORICAL_SUFFIXES = ('team', 'type', 'location', 'result', 'transition')
+
+    def __init__(self, dataframe: pd.DataFrame = None, schema: BaseSchema = None, copy_on_write: bool = False):
         """
         Initializes the transformer with optional DataFrame.
         :param dataframe: The DataFrame to transform (optional).
+        :param schema: The dataset schema (optional).
+        :param copy_on_write: Run the transformation with pandas Copy-on-Write enabled.
         """
-        super().__init__(dataframe)
+        super().__init__(dataframe, schema=schema, copy_on_write=copy_on_write)
 
     def transform(self, dataframe: pd.DataFrame = None) -> pd.DataFrame:
         """Performs the entire transformation process."""
@@ -54,20 +51,72 @@ class NflfastrTransfomer(BaseTransformer):
                 .dataframe
         )
 
+    @classmethod
+    def get_dtype_map(cls, columns) -> dict:
+        """
+        Builds the dtype map for a set of columns. The map is cached per column layout,
+        so chunks of the same dataset only resolve it once.
+
+        :param columns: The columns of the DataFrame being converted.
+        :return: A dict of column name to target dtype, excluding datetime columns.
+        """
+        return dict(cls._resolve_dtype_map(tuple(columns)))
+
+    @classmethod
+    @functools.lru_cache(maxsize=32)
+    def _resolve_dtype_map(cls, columns: tuple) -> dict:
+        dtype_map = {}
+        for column in columns:
+            if column in cls.DATETIME_COLUMNS:
+                continue
+            if column in cls.STRING_COLUMNS or column.endswith(cls.STRING_SUFFIXES):
+                dtype_map[column] = STRING_DTYPE
+            elif column in cls.CATEGORICAL_COLUMNS or column.endswith(cls.CATEGORICAL_SUFFIXES):
+                dtype_map[column] = 'category'
+        return dtype_map
+
     def _convert_dtypes(self):
-        logger.debug("Converting player IDs to objects.")
-        target_suffixes = ('id', 'name', 'team', 'type', 'location', 'result', 'transition')
+        logger.debug("Converting text columns and timestamps.")
+        dtype_map = self.get_dtype_map(self.dataframe.columns)
+        self.dataframe = self.dataframe.astype(dtype_map)
 
-        for column, dtype in self.COLUMN_DTYPES.items():
+        for column in self.DATETIME_COLUMNS:
             if column in self.dataframe.columns:
-                if callable(dtype):  # If dtype is a function (e.g., lambda)
-                    self.dataframe[column] = self.dataframe[column].apply(dtype)
-                else:  # For standard dtypes like str, int, float, etc.
-                    self.dataframe[column] = self.dataframe[column].astype(dtype)
+                self.dataframe[column] = pd.to_datetime(
+                    self.dataframe[column], format=self.DATETIME_FORMAT, errors='coerce', utc=True
+                )
+
+        return self
+
+
+if __name__ == "__main__":
+    import time
+    import numpy as np
 
-        # Convert other columns ending with specific suffixes
-        for column in self.dataframe.columns:
-            if column.endswith(target_suffixes):
-                self.dataframe[column] = self.dataframe[column].astype(str)
+    # Benchmark on a synthetic chunk the size of a full regular season of play-by-play
+    n_plays = 50_000
+    rng = np.random.default_rng(0)
+    teams = np.array(['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB'])
+    timestamps = pd.Timestamp('2023-09-07T20:20:00Z') + pd.to_timedelta(rng.integers(0, 10**7, n_plays), unit='s')
+    season = pd.DataFrame({
+        'play_id': rng.integers(1, 5000, n_plays).astype(float),
+        'game_id': np.char.add('2023_01_', rng.choice(teams, n_plays)),
+        'posteam': rng.choice(teams, n_plays),
+        'defteam': rng.choice(teams, n_plays),
+        'play_type': rng.choice(['pass', 'run', 'punt', 'kickoff'], n_plays),
+        'pass_location': rng.choice(['left', 'middle', 'right', None], n_plays),
+        'passer_player_id': np.char.add('00-00', rng.integers(10000, 99999, n_plays).astype(str)),
+        'passer_player_name': np.char.add('J.', rng.choice(['Allen', 'Burrow', 'Mahomes'], n_plays)),
+        'desc': np.char.add('play description ', rng.integers(0, n_plays, n_plays).astype(str)),
+        'yrdln': rng.choice(['KC 25', 'BUF 40', 'MID 50'], n_plays),
+        'side_of_field': rng.choice(teams, n_plays),
+        'end_clock_time': timestamps.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+        'drive_real_start_time': timestamps.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+        'yards_gained': rng.normal(5, 8, n_plays),
+    })
 
-        return self
\ No newline at end of file
+    for label, frame in [('cold', season), ('warm', season)]:
+        start = time.perf_counter()
+        result = NflfastrTransfomer().transform(frame.copy())
+        print(f"{label}: {time.perf_counter() - start:.3f}s "
+              f"({result.memory_usage(deep=True).sum() / 1e6:.1f} MB)")
@@ -1,6 +1,7 @@
 import pandas as pd
 import logging
 from fantasyfootball.transformers.base_transformer import BaseTransformer
+from fantasyfootball.schemas.base_schema import BaseSchema
 from fantasyfootball.factories.transformer_factory import TransformerFactory
 
 logger = logging.getLogger(__name__)
@@ -19,23 +20,23 @@ class DataFrameTransformMixin:
         """
         logger.debug(f"Dropping invalid rows based on column '{col}' with condition '{condition_type}'.")
         
-        if col not in self.dataframe.columns:
+        if col not in self.columns:
             logger.warning(f"Column '{col}' not found in DataFrame. No rows were dropped.")
             return self
         
         condition_functions = {
-        'exact': lambda col: self.dataframe[col] == value,
-        'contains': lambda col: self.dataframe[col].astype(str).str.contains(value, na=False),
-        'na': lambda col: self.dataframe[col].isna()
+        'exact': lambda series: series == value,
+        'contains': lambda series: series.astype(str).str.contains(value, na=False),
+        'na': lambda series: series.isna()
         }
 
         condition_func = condition_functions.get(condition_type)
         if not condition_func:
             raise ValueError(f"Unsupported condition_type: {condition_type}. Supported types are: {list(condition_functions.keys())}")
         
-        condition = condition_func(col)
-        self.dataframe = self.dataframe.loc[~condition]
-        logger.debug(f"Rows dropped where '{col}' {condition_type} '{value}'. Remaining rows: {len(self.dataframe)}")
+        # Queued with the other row drops and evaluated in the same pass
+        self._plan.drop_rows_where(col, condition_func)
+        logger.debug(f"Queued dropping rows where '{col}' {condition_type} '{value}'.")
         return self
 
 @TransformerFactory.register('prf_year_by_year')
@@ -65,12 +66,14 @@ class YearByYearTransformer(BaseTransformer, DataFrameTransformMixin):
 
     DROP_COLS = ['fantasy_fantpt', 'fantasy_ppr', 'fantasy_dkpt', 'fantasy_fdpt', 'fantasy_vbd']
 
-    def __init__(self, dataframe: pd.DataFrame = None):
+    def __init__(self, dataframe: pd.DataFrame = None, schema: BaseSchema = None, copy_on_write: bool = False):
         """
         Initializes the transformer with optional DataFrame.
         :param dataframe: The DataFrame to transform (optional).
+        :param schema: The dataset schema (optional).
+        :param copy_on_write: Run the transformation with pandas Copy-on-Write enabled.
         """
-        super().__init__(dataframe)
+        super().__init__(dataframe, schema=schema, copy_on_write=copy_on_write)
 
     def transform(self, dataframe: pd.DataFrame = None) -> pd.DataFrame:
         """Performs the entire transformation process."""
@@ -107,8 +110,8 @@ class GameByGameTransformer(BaseTransformer, DataFrameTransformMixin):
 
     COLUMN_RENAME_MAP = {
         '1': 'home/away',
-        'Fumbles_Fmb': 'fumbles',
-        'Fumbles_FL': 'fumbles_lost',
+        'fumbles_fmb': 'fumbles',
+        'fumbles_fl': 'fumbles_lost',
         'receiving_ctch%': 'receiving_ctch_pct'
     }
 
@@ -121,12 +124,14 @@ class GameByGameTransformer(BaseTransformer, DataFrameTransformMixin):
         'fumbles', 'fumbles_lost'
     ]
 
-    def __init__(self, dataframe: pd.DataFrame = None):
+    def __init__(self, dataframe: pd.DataFrame = None, schema: BaseSchema = None, copy_on_write: bool = False):
         """
         Initializes the transformer with optional DataFrame.
         :param dataframe: The DataFrame to transform (optional).
+        :param schema: The dataset schema (optional).
+        :param copy_on_write: Run the transformation with pandas Copy-on-Write enabled.
         """
-        super().__init__(dataframe)
+        super().__init__(dataframe, schema=schema, copy_on_write=copy_on_write)
 
     def transform(self, dataframe: pd.DataFrame = None) -> pd.DataFrame:
         """
@@ -143,17 +148,30 @@ class GameByGameTransformer(BaseTransformer, DataFrameTransformMixin):
         return (
             self._rename_columns(self.COLUMN_RENAME_MAP)
                 ._handle_home_away()
+                ._drop_invalid_rows(col='off. snaps_num', value='Inactive', condition_type='exact')
+                ._parse_snaps()
                 ._reindex_and_fill(self.FINAL_COLUMN_ORDER)
                 ._drop_invalid_rows(col='date', value='Games', condition_type='contains')
                 ._drop_invalid_rows(col='age', condition_type='na')
-                ._drop_invalid_rows(col='off. snaps_num', value='Inactive', condition_type='exact')
                 ._convert_pct_to_float(cols=['receiving_ctch_pct'])
                 .dataframe
         )
 
     def _handle_home_away(self):
         logger.debug("Handling home/away column.")
-        self.dataframe['home/away'] = self.dataframe['home/away'].replace({'@': 'Away'}).fillna('Home')
+        if 'home/away' not in self.columns:
+            raise KeyError('home/away')
+        # Queued on the plan, so the whole chain still runs as one pass
+        self._plan.map_column('home/away', lambda series: series.replace({'@': 'Away'}).fillna('Home'))
+        return self
+
+    def _parse_snaps(self):
+        """Games the player did not play ('Did Not Play', 'Injured Reserve') are kept; their snaps are filled like the other stats"""
+        logger.debug("Parsing offensive snaps.")
+        col = 'off. snaps_num'
+        if col in self.columns:
+            self._plan.map_column(col, lambda series: series if pd.api.types.is_numeric_dtype(series)
+                                                      else pd.to_numeric(series, errors='coerce'))
         return self
     
     def _convert_pct_to_float(self, cols: list[str] | str):
@@ -162,11 +180,16 @@ class GameByGameTransformer(BaseTransformer, DataFrameTransformMixin):
             cols = [cols]
         
         col_map = {
-            col: lambda x: x[col].str.rstrip('%').astype(float) 
+            # Cast through str so numbers filled in by the reindex (e.g. players without the column
+            # in a multi-player frame) are kept rather than turned into NaN
+            col: lambda x, col=col: x[col].astype(str).str.rstrip('%').astype(float) 
             for col in cols 
             if col in self.dataframe.columns and self.dataframe[col].dtype == 'object'
         }
-        missing_cols = set(cols) - set(col_map.keys())
+        # Columns typed as numbers by the schema are already converted
+        numeric_cols = {col for col in cols if col in self.dataframe.columns
+                        and pd.api.types.is_numeric_dtype(self.dataframe[col])}
+        missing_cols = set(cols) - set(col_map.keys()) - numeric_cols
         if missing_cols:
             logger.warning(f"The following columns were not converted (missing or non-string): {missing_cols}")
 
@@ -0,0 +1,197 @@
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+def is_fillable(dtype) -> bool:
+    """Text columns typed as string or category keep their missing values."""
+    return not isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype))
+
+
+class TransformPlan:
+    """
+    Records column and row operations of a transformer chain and executes them together.
+
+    Renames, column drops and the final reindex are resolved to a single column selection,
+    every row condition is evaluated against the input frame and combined into one mask, and
+    column maps are computed on the input column and added to the frame after the row take,
+    so a whole chain costs one row take and one column reindex instead of a copy per step.
+    """
+
+    def __init__(self):
+        self.steps = []
+
+    def __bool__(self) -> bool:
+        return bool(self.steps)
+
+    def rename(self, rename_map: dict):
+        self.steps.append(('rename', rename_map))
+
+    def drop_columns(self, columns: list):
+        self.steps.append(('drop_columns', set(columns)))
+
+    def reindex(self, column_order: list, fill_value=0, dtype_map: dict = None, schema=None):
+        self.steps.append(('reindex', (list(column_order), fill_value, dtype_map, schema)))
+
+    def drop_rows(self, condition: pd.Series):
+        """Queues a boolean mask that was evaluated against the current frame."""
+        self.steps.append(('mask', condition))
+
+    def drop_rows_where(self, col: str, predicate):
+        """Queues a condition on a single column, evaluated when the plan runs."""
+        self.steps.append(('predicate', (col, predicate)))
+
+    def map_column(self, col: str, func):
+        """Queues a function that replaces the values of a single column, evaluated when the plan runs."""
+        self.steps.append(('map', (col, func)))
+
+    def columns(self, dataframe: pd.DataFrame) -> list[str]:
+        """The column names the frame would have after the queued steps."""
+        return [name for name, _ in self._resolve_columns(dataframe, evaluate=False)[0]]
+
+    def _resolve_columns(self, dataframe: pd.DataFrame, evaluate: bool = True):
+        """
+        Walks the steps and maps every output column to its input column (None when filled by a reindex).
+        Row conditions and column maps are evaluated on the input column, with the reindex fill applied if it
+        ran first; the mapped values are returned under placeholder names that stand in for their input column.
+        """
+        names = [(col, col) for col in dataframe.columns]
+        masks = []
+        reindex = None
+        mapped = {}
+        for kind, arg in self.steps:
+            if kind == 'rename':
+                names = [(arg.get(name, name), source) for name, source in names]
+            elif kind == 'drop_columns':
+                names = [(name, source) for name, source in names if name not in arg]
+            elif kind == 'reindex':
+                lookup = dict(names)
+                names = [(col, lookup.get(col)) for col in arg[0]]
+                reindex = arg
+            elif not evaluate:
+                continue
+            elif kind == 'mask':
+                masks.append(self._to_mask(arg.reindex(dataframe.index)))
+            elif kind == 'predicate':
+                col, predicate = arg
+                series = self._source_series(dataframe, mapped, dict(names)[col], reindex)
+                masks.append(self._to_mask(predicate(series)))
+            elif kind == 'map':
+                col, func = arg
+                placeholder = f'__mapped_{len(mapped)}'
+                mapped[placeholder] = func(self._source_series(dataframe, mapped, dict(names)[col], reindex))
+                names = [(name, placeholder if name == col else source) for name, source in names]
+        return names, masks, reindex, mapped
+
+    @staticmethod
+    def _source_series(dataframe: pd.DataFrame, mapped: dict, source, reindex) -> pd.Series:
+        """The values of an input, mapped or filled column as the steps so far left them."""
+        if source is None:
+            return pd.Series(reindex[1], index=dataframe.index)
+        series = mapped[source] if source in mapped else dataframe[source]
+        if reindex is not None and is_fillable(series.dtype) and series.hasnans:
+            series = series.fillna(reindex[1])
+        return series
+
+    @staticmethod
+    def _to_mask(condition: pd.Series) -> np.ndarray:
+        """Converts a condition to a plain boolean array, treating missing values as False."""
+        if condition.dtype == bool:
+            return condition.to_numpy()
+        return condition.fillna(False).to_numpy(dtype=bool)
+
+    def execute(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Runs the queued steps against a DataFrame.
+
+        :param dataframe: The frame the steps were recorded against.
+        :return: The transformed frame.
+        """
+        if not self.steps:
+            return dataframe
+        names, masks, reindex, mapped = self._resolve_columns(dataframe)
+        self.steps = []
+
+        # Whether the frame is a new object the plan may fill in place
+        owned = False
+        rows = None
+        if masks:
+            drop = np.logical_or.reduce(masks)
+            if drop.any():
+                rows = np.flatnonzero(~drop)
+                dataframe = dataframe.take(rows)
+                owned = True
+
+        if mapped:
+            if not owned:
+                # a shallow copy takes the new columns without touching the input frame
+                dataframe = dataframe.copy(deep=False)
+            for placeholder, series in mapped.items():
+                dataframe[placeholder] = series.array if rows is None else series.array.take(rows)
+
+        final_names = [name for name, _ in names]
+        sources = [source for _, source in names]
+        if reindex is None:
+            if sources != list(dataframe.columns):
+                dataframe = dataframe.take(dataframe.columns.get_indexer(sources), axis=1)
+            return dataframe.set_axis(final_names, axis=1, copy=False)
+
+        _, fill_value, dtype_map, schema = reindex
+        # Placeholders keep missing columns distinct until they are named
+        placeholders = [source if source is not None else f'__missing_{ix}' for ix, source in enumerate(sources)]
+        if placeholders != list(dataframe.columns):
+            dataframe = dataframe.reindex(columns=placeholders, fill_value=fill_value)
+            owned = True
+        dataframe = dataframe.set_axis(final_names, axis=1, copy=False)
+
+        if any(dtype == object for dtype in dataframe.dtypes):
+            dataframe = dataframe.infer_objects(copy=False)
+
+        has_na = dataframe.isna().to_numpy().any(axis=0)
+        fill_map = {
+            col: fill_value for col, dtype, missing in zip(dataframe.columns, dataframe.dtypes, has_na)
+            if missing and is_fillable(dtype)
+        }
+        if fill_map and owned:
+            dataframe.fillna(fill_map, inplace=True)
+        elif fill_map:
+            dataframe = dataframe.fillna(fill_map)
+
+        if schema is not None:
+            dtype_map = {**{col: schema.dtype_map[col] for col in schema.validate(dataframe)}, **(dtype_map or {})}
+        if dtype_map:
+            dataframe = dataframe.astype(dtype_map, copy=False)
+        return dataframe
+
+
+if __name__ == "__main__":
+    import time
+    from pathlib import Path
+    from fantasyfootball.transformers.profootballreference_transformer import GameByGameTransformer
+
+    # Micro-benchmark: the game-by-game transformer over every player season in the bundled archive,
+    # with the final columns mapped back to the raw names the scraper produces
+    data_dir = Path(__file__).resolve().parents[2] / 'data' / 'game-by-game'
+    archive = pd.concat((pd.read_csv(path) for path in sorted(data_dir.glob('*.csv'))), ignore_index=True)
+    raw = (archive
+           .assign(**{'home/away': archive['home/away'].map({'Away': '@'})})
+           .rename(columns={'home/away': '1', 'fumbles': 'fumbles_fmb', 'fumbles_lost': 'fumbles_fl'}))
+    tables = [table.reset_index(drop=True) for _, table in raw.groupby(['player_id', 'year'], sort=False)]
+
+    for copy_on_write in (False, True):
+        transformer = GameByGameTransformer(copy_on_write=copy_on_write)
+        start = time.perf_counter()
+        for table in tables:
+            transformer.transform(dataframe=table)
+        elapsed = time.perf_counter() - start
+        print(f"copy_on_write={copy_on_write}: {len(tables)} player tables in {elapsed:.2f}s "
+              f"({elapsed / len(tables) * 1000:.2f} ms/table)")
+
+    # One multi-player frame per season, as the game-by-game strategy now transforms them
+    start = time.perf_counter()
+    for _, season in raw.groupby('year', sort=False):
+        GameByGameTransformer().transform(dataframe=season.reset_index(drop=True))
+    elapsed = time.perf_counter() - start
+    print(f"batched by season: {len(tables)} player tables in {elapsed:.2f}s "
+          f"({elapsed / len(tables) * 1000:.2f} ms/table)")
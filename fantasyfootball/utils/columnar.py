@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+META_FILE = 'columns.json'
+
+
+def _codes_dtype(n_labels: int):
+    """The integer type pandas keeps the codes of a categorical with n_labels categories in."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_labels < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def save_columns(df: pd.DataFrame, directory: str):
+    """
+    Writes a DataFrame as one .npy file per column, so it can be loaded back memory-mapped.
+    Text and categorical columns are dictionary encoded: integer codes, in the width pandas uses for categorical
+    codes, plus a JSON list of labels.
+
+    :param df: The DataFrame to store; its index is not stored.
+    :param directory: Target directory, created when missing.
+    """
+    os.makedirs(directory, exist_ok=True)
+    meta = []
+    for ix, (column, series) in enumerate(df.items()):
+        file_name = f'{ix:03d}'
+        if isinstance(series.dtype, pd.CategoricalDtype) or not (
+                pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype)):
+            codes, labels = pd.factorize(series, sort=True)
+            np.save(os.path.join(directory, f'{file_name}.npy'), codes.astype(_codes_dtype(len(labels))))
+            with open(os.path.join(directory, f'{file_name}.labels.json'), 'w', encoding='utf-8') as f:
+                json.dump([str(label) for label in labels], f)
+            meta.append({'name': column, 'file': file_name, 'kind': 'labels'})
+        else:
+            if series.hasnans and not pd.api.types.is_float_dtype(series.dtype):
+                # nullable integers are stored as float so missing values survive the round trip
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                values = series.to_numpy()
+            np.save(os.path.join(directory, f'{file_name}.npy'), values)
+            meta.append({'name': column, 'file': file_name, 'kind': 'values'})
+    with open(os.path.join(directory, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    logger.debug(f"Saved {len(df)} rows x {len(meta)} columns to {directory}")
+
+
+def load_columns(directory: str, columns: list = None, mmap: bool = True) -> pd.DataFrame:
+    """
+    Loads a DataFrame written by `save_columns`.
+
+    :param directory: The directory written by `save_columns`.
+    :param columns: Only load these columns (optional).
+    :param mmap: Memory-map the numeric arrays instead of reading them into memory.
+    :return: The DataFrame, with dictionary encoded columns as categoricals whose codes are memory-mapped too.
+    """
+    with open(os.path.join(directory, META_FILE), encoding='utf-8') as f:
+        meta = json.load(f)
+    if columns is not None:
+        missing = set(columns) - {spec['name'] for spec in meta}
+        if missing:
+            raise KeyError(f"{sorted(missing)} not found in {directory}")
+        meta = [spec for spec in meta if spec['name'] in columns]
+    data = {}
+    for spec in meta:
+        values = np.load(os.path.join(directory, f"{spec['file']}.npy"), mmap_mode='r' if mmap else None)
+        if spec['kind'] == 'labels':
+            with open(os.path.join(directory, f"{spec['file']}.labels.json"), encoding='utf-8') as f:
+                labels = json.load(f)
+            # the codes were validated when they were written; checking them again would read the whole file
+            values = pd.Categorical.from_codes(values, dtype=pd.CategoricalDtype(labels), validate=False)
+        data[spec['name']] = values
+    return pd.DataFrame(data, copy=False)
@@ -0,0 +1,222 @@
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(value):
+    """Converts numpy scalars and nested sequences so equal arguments produce the same cache key."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(item) for item in value)
+    return value
+
+
+def _frame_bytes(frame) -> int:
+    """Approximate in-memory size of a cached value."""
+    if hasattr(frame, 'memory_usage'):
+        try:
+            usage = frame.memory_usage(deep=True)
+        except ValueError:
+            # pandas cannot measure read-only object arrays, e.g. columns taken from a cached frame
+            objects = frame.select_dtypes('object').to_numpy().ravel()
+            return int(frame.memory_usage(deep=False).sum()) + sum(sys.getsizeof(item) for item in objects)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    return 0
+
+
+def _freeze(frame):
+    """Marks the arrays behind a frame read-only, so writing into a shared cached frame raises instead of editing it."""
+    manager = getattr(frame, '_mgr', None)
+    for block in getattr(manager, 'blocks', ()):
+        values = getattr(block.values, '_ndarray', block.values)  # datetime and categorical arrays wrap an ndarray
+        if isinstance(values, np.ndarray):
+            values.setflags(write=False)
+    return frame
+
+
+class FrameCache:
+    """
+    Memoizes functions that return DataFrames, in memory and optionally on disk.
+
+    In-memory entries are evicted least recently used first once their combined size exceeds `max_bytes`.
+    Hits return a shallow copy of the cached frame, so callers share the underlying data instead of copying it.
+    The shared arrays are read-only: adding or replacing columns works as usual, but editing cells in place
+    (e.g. `.loc[mask, col] = value`) raises ValueError; take a `.copy()` first to do that.
+    """
+
+    def __init__(self, max_bytes: int = 2 * 1024 ** 3, cache_dir: str = None):
+        """
+        :param max_bytes: Upper bound on the memory held by cached frames.
+        :param cache_dir: Directory for pickled entries; None keeps the cache in memory only.
+        """
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the in-memory entries."""
+        return self._bytes
+
+    @staticmethod
+    def make_key(name: str, args: tuple, kwargs: dict) -> str:
+        """Builds a stable key from a function name and its arguments."""
+        arguments = repr((_normalize(args), sorted((key, _normalize(value)) for key, value in kwargs.items())))
+        return f"{name}-{hashlib.sha1(arguments.encode('utf-8')).hexdigest()[:16]}"
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def get(self, key: str, ttl: float = None):
+        """
+        Returns the cached value for a key, or None when it is missing or older than `ttl` seconds.
+        Disk entries are promoted to memory on read.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored, _ = entry
+                if ttl is None or time.time() - stored <= ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value.copy(deep=False)
+                self._evict(key)
+
+        if self.cache_dir is not None:
+            file_path = self._disk_path(key)
+            if os.path.exists(file_path):
+                stored = os.path.getmtime(file_path)
+                if ttl is None or time.time() - stored <= ttl:
+                    try:
+                        with open(file_path, 'rb') as f:
+                            value = pickle.load(f)
+                    except (OSError, pickle.UnpicklingError, EOFError) as e:
+                        logger.warning(f"Ignoring unreadable cache file {file_path}: {e}")
+                    else:
+                        logger.debug(f"Loaded {key} from {file_path}")
+                        self._remember(key, value, stored)
+                        with self._lock:
+                            self.hits += 1
+                        return _freeze(value).copy(deep=False)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value):
+        """Stores a value in memory and, when a cache directory is set, on disk."""
+        stored = time.time()
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            file_path = self._disk_path(key)
+            temp_path = f'{file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, file_path)
+        self._remember(key, value, stored)
+
+    def _remember(self, key: str, value, stored: float):
+        nbytes = _frame_bytes(value)
+        with self._lock:
+            self._evict(key)
+            if nbytes > self.max_bytes:
+                logger.debug(f"{key} ({nbytes} bytes) is larger than the memory cache and is kept on disk only")
+                return
+            self._entries[key] = (_freeze(value), stored, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                logger.debug(f"Evicting {oldest} from the memory cache")
+                self._evict(oldest)
+
+    def _evict(self, key: str):
+        """Drops a key from memory; callers hold the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def invalidate(self, prefix: str = None, disk: bool = True):
+        """
+        Removes cached entries.
+        :param prefix: Only remove keys starting with this prefix, e.g. a function name; None removes everything.
+        :param disk: Also delete the matching files in the cache directory.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if prefix is None or key.startswith(prefix)]:
+                self._evict(key)
+        if disk and self.cache_dir is not None and os.path.isdir(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith('.pkl') and (prefix is None or filename.startswith(prefix)):
+                    os.remove(os.path.join(self.cache_dir, filename))
+
+    def memoize(self, ttl: float = None, name: str = None):
+        """
+        Decorator that caches a function's return value by its arguments.
+        The wrapped function gains `invalidate(*args, **kwargs)`, which drops the entry for those arguments
+        (or every entry of the function when called without arguments).
+
+        :param ttl: Seconds before an entry is refetched; None keeps entries until they are invalidated.
+        :param name: Prefix of the cache keys; defaults to the function's module and name.
+        """
+        def decorator(func):
+            prefix = name or f'{func.__module__.rsplit(".", 1)[-1]}.{func.__name__}'
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                key = self.make_key(prefix, args, kwargs)
+                value = self.get(key, ttl=ttl)
+                if value is None:
+                    value = func(*args, **kwargs)
+                    self.put(key, value)
+                    value = value.copy(deep=False)
+                return value
+
+            def invalidate(*args, **kwargs):
+                if args or kwargs:
+                    self.invalidate(self.make_key(prefix, args, kwargs))
+                else:
+                    self.invalidate(f'{prefix}-')
+
+            wrapper.invalidate = invalidate
+            wrapper.cache = self
+            return wrapper
+        return decorator
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pandas as pd
+
+    # Repeated calls of a slow loader: the first call pays for the load, later calls share the cached frame
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = FrameCache(cache_dir=cache_dir)
+
+        @cache.memoize()
+        def load(year):
+            time.sleep(1)
+            return pd.DataFrame(np.random.default_rng(year).normal(size=(50_000, 300)))
+
+        for label in ('miss', 'memory hit'):
+            start = time.perf_counter()
+            load(2023)
+            print(f"{label}: {time.perf_counter() - start:.4f}s")
+
+        cache.invalidate(disk=False)
+        start = time.perf_counter()
+        load(2023)
+        print(f"disk hit: {time.perf_counter() - start:.4f}s")
@@ -0,0 +1,105 @@
+# vor.py
+
+import numpy as np
+import pandas as pd
+
+POS_LIST = ['qb', 'wr', 'te', 'rb']
+# replacement methods accepted by draft.map_replacement_value
+METHODS = ['avg starter', 'top n', 'replacement player', 'last starter']
+# picks counted by the 'top n' method per league size
+PICK_DICT = {10: 100, 12: 120, 14: 140}
+# players at the cut-off averaged by every method but 'avg starter'
+TAIL_N = 3
+
+def _windows(codes, n_pos, league, pos_list):
+    """
+    Returns the [lo, hi) window of each method on the within-position adp rank, one array entry per position
+    Every method's players form a prefix of each position's adp order, so a window is all a method needs
+    """
+    counts = lambda rows: np.bincount(rows, minlength=n_pos + 1)[:n_pos]
+    starters = np.minimum([league[pos] * league['team_n'] for pos in pos_list], counts(codes))
+    drafted = counts(codes[:league['rounds'] * league['team_n']])
+    top_n = counts(codes[:PICK_DICT.get(league['team_n'], 100)])
+    tail = lambda hi: (np.maximum(hi - TAIL_N, 0), hi)
+    return {
+        'avg starter': (np.zeros(n_pos, dtype=np.int64), starters),
+        'top n': tail(top_n),
+        'replacement player': tail(drafted),
+        'last starter': tail(starters),
+    }
+
+def replacement_values(df, league, pos_list=POS_LIST, pts_col=None):
+    """
+    Calculates the replacement value of every position with every method in one pass
+    The frame is sorted by adp once and grouped by position with one stable sort; each method is a window on the
+    players of every position and its means are read off one cumulative sum, so no method re-sorts or loops over positions
+    :df: players with 'adp', 'pos' and the league's custom points column
+    :league: league dict from config.py
+    :pos_list: lowercase positions to value
+    :pts_col: points column; defaults to '<league name>_custom_pts'
+    :return: dataframe indexed by uppercase position with one column per method in METHODS
+    """
+    pts_col = pts_col or f'{league["name"]}_custom_pts'
+    positions = [pos.upper() for pos in pos_list]
+    ranked = df.loc[:, ['adp', 'pos', pts_col]].sort_values('adp')
+    codes = pd.Categorical(ranked['pos'], categories=positions).codes.astype(np.int64)
+    pts = ranked[pts_col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # players of a position are contiguous, still in adp order, after a stable sort on the position code
+    codes = np.where(codes >= 0, codes, len(positions))
+    order = np.argsort(codes, kind='stable')
+    starts = np.searchsorted(codes[order], np.arange(len(positions)))
+    values = pts[order]
+    point_sums = np.concatenate([[0.0], np.cumsum(np.nan_to_num(values, nan=0.0))])
+    point_counts = np.concatenate([[0], np.cumsum(~np.isnan(values))])
+
+    result = {}
+    for method, (lo, hi) in _windows(codes, len(positions), league, pos_list).items():
+        total = point_sums[starts + hi] - point_sums[starts + lo]
+        count = point_counts[starts + hi] - point_counts[starts + lo]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[method] = np.where(count > 0, total / count, np.nan)
+    return pd.DataFrame(result, index=pd.Index(positions, name='pos'), columns=METHODS)
+
+def value_over_replacement(df, league, pos_list=POS_LIST, methods=METHODS, pts_col=None):
+    """
+    Returns the frame with one 'vor_<method>' column per replacement method side by side, e.g. 'vor_avg_starter'
+    Positions outside pos_list get a missing value, as with draft.map_replacement_value
+    """
+    pts_col = pts_col or f'{league["name"]}_custom_pts'
+    baselines = replacement_values(df, league, pos_list, pts_col)
+    return df.assign(**{f'vor_{method.replace(" ", "_")}': df[pts_col] - df['pos'].map(baselines[method])
+                        for method in methods})
+
+
+if __name__ == "__main__":
+    import time
+    from fantasyfootball import config
+
+    # All four methods at once versus one sorted copy and position loop per method, on a synthetic draft pool
+    rng = np.random.default_rng(0)
+    n_players = 600
+    df = pd.DataFrame({
+        'adp': rng.permutation(n_players) + 1.0,
+        'pos': rng.choice(['QB', 'RB', 'WR', 'TE', 'DST', 'K'], n_players),
+        'sean_custom_pts': rng.gamma(4, 40, n_players),
+    })
+    pts_col = 'sean_custom_pts'
+    cutoffs = {'avg starter': None, 'top n': 120, 'replacement player': 13 * 12, 'last starter': None}
+
+    start = time.perf_counter()
+    for _ in range(100):
+        # the legacy approach: a sorted copy and a loop over positions per method
+        for method, cutoff in cutoffs.items():
+            ranked = df.copy().sort_values('adp')
+            pool = ranked if cutoff is None else ranked.head(cutoff)
+            for pos in POS_LIST:
+                tdf = pool.loc[pool['pos'] == pos.upper(), pts_col]
+                tdf = tdf.head(config.sean[pos] * 12) if cutoff is None else tdf
+                float(np.mean(tdf if method == 'avg starter' else tdf.tail(TAIL_N)))
+    print(f"per method: {(time.perf_counter() - start) * 10:.2f} ms")
+
+    start = time.perf_counter()
+    for _ in range(100):
+        replacement_values(df, config.sean)
+    print(f"all methods: {(time.perf_counter() - start) * 10:.2f} ms")
@@ -0,0 +1,150 @@
+# weeklypoints.py
+
+import hashlib
+import json
+import logging
+import os
+import pandas as pd
+from fantasyfootball import archive, config, scoring
+from fantasyfootball.config import DATA_DIR, WEEKLY_POINTS_DIR
+from fantasyfootball.utils.columnar import save_columns, load_columns
+
+logger = logging.getLogger(__name__)
+
+GAME_BY_GAME_DIR = os.path.join(DATA_DIR, 'game-by-game')
+SOURCE_FILE = 'sources.json'
+FORM_WINDOWS = (3,)
+ID_COLUMNS = ['player_id', 'year', 'week', 'id', 'player_name', 'pos', 'tm']
+
+def read_game_by_game(data_dir=GAME_BY_GAME_DIR):
+    """
+    Reads every season of the game-by-game archive into one typed dataframe with lowercase column names,
+    through archive.load_archive and its cache
+    """
+    data_dir = os.path.normpath(data_dir)
+    df = archive.load_archive(os.path.basename(data_dir), os.path.dirname(data_dir), archive.ARCHIVE_CACHE_DIR)
+    df.columns = [col.lower() for col in df.columns]
+    # the text columns are concatenated into merge ids, which categoricals do not support
+    return df.astype({col: object for col, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)})
+
+def _source_files(data_dir):
+    data_dir = os.path.normpath(data_dir)
+    return archive.archive_files(os.path.basename(data_dir), os.path.dirname(data_dir))
+
+def build_weekly_points(df, leagues=config.scoring_List, windows=FORM_WINDOWS):
+    """
+    Computes weekly custom points for every league, plus the season average, season standard deviation and rolling
+    form of each player; rows are sorted by (player_id, year, week)
+    :df: game-by-game rows, e.g. from read_game_by_game
+    :leagues: league dicts from config.py
+    :windows: rolling form windows in games
+    """
+    df = (df.sort_values(['player_id', 'year', 'week'], kind='stable')
+            .reset_index(drop=True)
+            .pipe(config.unique_id_create))
+    points = scoring.league_points(df, leagues, scoring.PRO_FOOTBALL_REFERENCE_STATS)
+    season = points.groupby([df['player_id'], df['year']])
+    metrics = [points,
+               season.transform('mean').add_suffix('_season_avg'),
+               season.transform('std').add_suffix('_season_std')]
+    for window in windows:
+        form = season.rolling(window, min_periods=1).mean().reset_index(level=[0, 1], drop=True)
+        metrics.append(form.add_suffix(f'_form_{window}'))
+    return pd.concat([df.loc[:, ID_COLUMNS]] + metrics, axis='columns')
+
+def scoring_fingerprint(leagues=config.scoring_List, windows=FORM_WINDOWS):
+    """Hash of every scored league's weights and of the form windows; the table is rebuilt when it changes"""
+    weights = scoring.scoring_weights(leagues, scoring.PRO_FOOTBALL_REFERENCE_STATS)
+    return {'leagues': {name: hashlib.sha1(json.dumps(weights[name].to_dict(), sort_keys=True).encode('utf-8')).hexdigest()
+                        for name in weights.columns},
+            'windows': list(windows)}
+
+def _sources(data_dir, leagues, windows):
+    return {'files': {os.path.basename(file_path): os.path.getmtime(file_path) for file_path in _source_files(data_dir)},
+            'scoring': scoring_fingerprint(leagues, windows)}
+
+def source_fingerprint(data_dir=None, leagues=config.scoring_List, windows=FORM_WINDOWS):
+    """
+    Short hash of the game-by-game files' modification times and of the scoring, for the caches of tables derived
+    from the weekly points; it changes whenever is_stale would report the table as stale
+    """
+    sources = _sources(GAME_BY_GAME_DIR if data_dir is None else data_dir, leagues, windows)
+    return hashlib.sha1(json.dumps(sources, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def save_weekly_points(data_dir=GAME_BY_GAME_DIR, directory=WEEKLY_POINTS_DIR, leagues=config.scoring_List,
+                       windows=FORM_WINDOWS):
+    """Precomputes the weekly points table for the whole archive and stores it column by column"""
+    table = build_weekly_points(read_game_by_game(data_dir), leagues=leagues, windows=windows)
+    save_columns(table, directory)
+    with open(os.path.join(directory, SOURCE_FILE), 'w', encoding='utf-8') as f:
+        json.dump(_sources(data_dir, leagues, windows), f, indent=2)
+    logger.info(f"Saved {len(table)} weekly rows for {[league['name'] for league in leagues]} to {directory}")
+    return table
+
+def is_stale(data_dir=GAME_BY_GAME_DIR, directory=WEEKLY_POINTS_DIR, leagues=config.scoring_List, windows=FORM_WINDOWS):
+    """
+    True when the table is missing, a game-by-game file was added or changed since it was built,
+    or it was scored with other leagues, league weights or form windows
+    """
+    try:
+        with open(os.path.join(directory, SOURCE_FILE), encoding='utf-8') as f:
+            sources = json.load(f)
+    except OSError:
+        return True
+    return _sources(data_dir, leagues, windows) != sources
+
+def load_weekly_points(columns=None, directory=WEEKLY_POINTS_DIR, data_dir=GAME_BY_GAME_DIR, leagues=config.scoring_List,
+                       windows=FORM_WINDOWS):
+    """
+    Loads the precomputed table memory-mapped, rebuilding it first when the archive or the scoring changed
+    :columns: only load these columns (optional)
+    """
+    if is_stale(data_dir, directory, leagues, windows):
+        save_weekly_points(data_dir, directory, leagues, windows)
+    return load_columns(directory, columns=columns)
+
+def season_summary(league, year, directory=WEEKLY_POINTS_DIR, data_dir=GAME_BY_GAME_DIR):
+    """
+    Returns the average points per game and standard deviation of a season by merge id, as draft.aggregate_weekly_stats does
+    Returns None when the table does not score the league, does not have the year or the archive is not available
+    """
+    points_col = f'{league.get("name")}_custom_pts'
+    try:
+        df = load_weekly_points(['year', 'id', points_col], directory, data_dir)
+    except (KeyError, FileNotFoundError) as e:
+        logger.debug(f"Weekly points table not used: {e}")
+        return None
+    df = df.loc[df['year'] == year].astype({'id': object})
+    if df.empty:
+        logger.debug(f"Weekly points table not used: no {year} rows")
+        return None
+    return (df.groupby('id')
+              .agg(avg_ppg=(points_col, 'mean'),
+                   std_dev=(points_col, 'std'))
+              .rename(columns={'avg_ppg' : f'{year}_avg_ppg', 'std_dev' : f'{year}_std_dev'}))
+
+
+if __name__ == "__main__":
+    import time
+    import tempfile
+    from pathlib import Path
+
+    # Season summaries from the precomputed table versus recomputing them from the season's csv
+    data_dir = str(Path(__file__).resolve().parents[1] / 'data' / 'game-by-game')
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        table = save_weekly_points(data_dir, directory)
+        print(f"build: {time.perf_counter() - start:.3f}s for {len(table)} rows")
+
+        start = time.perf_counter()
+        season_summary(config.sean, 2023, directory, data_dir)
+        print(f"season summary from table: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    df = pd.read_csv(os.path.join(data_dir, '2023_weekly.csv'))
+    df.columns = [col.lower() for col in df.columns]
+    (df.pipe(config.unique_id_create)
+       .pipe(config.pro_football_reference_pts, config.sean)
+       .groupby('id')
+       .agg(avg_ppg=('sean_custom_pts', 'mean'), std_dev=('sean_custom_pts', 'std')))
+    print(f"season summary from csv: {(time.perf_counter() - start) * 1000:.1f} ms")
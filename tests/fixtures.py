@@ -0,0 +1,141 @@
+"""Synthetic frames shared by the tests and by the benchmarks in the modules' __main__ blocks"""
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from fantasyfootball import scoring
+
+GAME_BY_GAME_DIR = Path(__file__).resolve().parents[1] / 'data' / 'game-by-game'
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'DST', 'K']
+
+def player_names(n_players):
+    return [f'Player {ix}' for ix in range(n_players)]
+
+def make_ecr(seed=0, pos_n=None):
+    """ECR-like rankings ('player_name', 'pos', 'rank', 'pos_rank', 'best', 'worst', 'avg') to chart without scraping"""
+    rng = np.random.default_rng(seed)
+    pos_n = pos_n or {'QB': 35, 'RB': 70, 'WR': 80, 'TE': 35, 'DST': 32, 'K': 32}
+    pos = rng.permutation(np.repeat(list(pos_n), list(pos_n.values())))
+    avg = np.sort(rng.gamma(2, 50, len(pos))) + 1
+    df = pd.DataFrame({'player_name': player_names(len(pos)), 'pos': pos, 'rank': np.arange(1, len(pos) + 1),
+                       'avg': avg, 'best': np.maximum(avg - rng.gamma(2, 4, len(pos)), 1), 'worst': avg + rng.gamma(2, 8, len(pos))})
+    df['pos_rank'] = df['pos'] + (df.groupby('pos').cumcount() + 1).astype(str)
+    return df
+
+def make_grouped_ecr(seed=0, pos_n=None, centers=(20, 80, 160)):
+    """ECR-like rows ('pos', 'rank', 'avg', 'best', 'worst') whose averages form well separated groups in every position"""
+    rng = np.random.default_rng(seed)
+    pos_n = pos_n or {'QB': 18, 'RB': 30, 'WR': 30, 'TE': 15}
+    frames = []
+    for p, n in pos_n.items():
+        avg = np.sort(np.concatenate([rng.normal(center, 2, n // len(centers)) for center in centers]))
+        frames.append(pd.DataFrame({'pos': p, 'avg': avg, 'best': avg - rng.uniform(2, 8, len(avg)),
+                                    'worst': avg + rng.uniform(2, 12, len(avg))}))
+    return pd.concat(frames, ignore_index=True).sort_values('avg').assign(rank=lambda x: np.arange(1, len(x) + 1))
+
+def make_draft_sources(n_players=240, seed=0):
+    """Projections, ADP, weekly averages and ECR rows for the same players, as the draft.py scrapers return them"""
+    rng = np.random.default_rng(seed)
+    pos = np.resize(POSITIONS, n_players)
+    names = player_names(n_players)
+    ids = [f'pla_{ix}_{p}'.lower() for ix, p in enumerate(pos)]
+    teams = rng.choice(['KC', 'BUF', 'PHI', 'SF'], n_players)
+    adp = rng.permutation(n_players) + 1.0
+    projections = pd.DataFrame({'id': ids, 'player_name': names, 'pos': pos, 'tm': teams, 'bye': 7.0,
+                                'sean_custom_pts': rng.gamma(4, 40, n_players)})
+    adp_df = (pd.DataFrame({'id': ids, 'player_name': names, 'pos': pos, 'team': teams, 'adp': adp, 'overall': adp})
+                .sort_values('adp')
+                .reset_index(drop=True))
+    weekly = pd.DataFrame({'2023_avg_ppg': rng.gamma(4, 3, n_players), '2023_std_dev': rng.gamma(2, 3, n_players)},
+                          index=pd.Index(ids, name='id'))
+    best = rng.integers(1, 200, n_players)
+    ecr = pd.DataFrame({'rank': np.arange(1, n_players + 1), 'player_name': names, 'pos': pos, 'tm': teams, 'bye': 7.0,
+                        'pos_rank': [f'{p}{ix}' for ix, p in enumerate(pos)], 'best': best, 'worst': best + 20,
+                        'avg': best + 10.0, 'std dev': 2.0})
+    return projections, adp_df, weekly, ecr
+
+def make_draft_pool(n_players=60, seed=0):
+    """A draftsim pool ('player_name', 'pos', 'mean', 'std', 'low', 'high'), best player first"""
+    rng = np.random.default_rng(seed)
+    mean = np.sort(rng.uniform(1, n_players, n_players))
+    return pd.DataFrame({'player_name': player_names(n_players), 'pos': rng.choice(POSITIONS[:4], n_players),
+                         'mean': mean, 'std': 1 + mean * 0.1, 'low': np.nan, 'high': np.nan})
+
+def make_stats(n=500, seed=0):
+    """Integer and fractional Pro Football Reference stats, with missing values scattered through every column"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({stat: rng.integers(0, 120 if stat.endswith('yds') else 4, n)
+                       for stat in scoring.PRO_FOOTBALL_REFERENCE_STATS})
+    df['receiving_yds'] = rng.normal(40, 30, n)
+    df['passing_yds'] = rng.normal(150, 90, n)
+    df = df.astype({'rushing_td': 'Int16', 'fumbles_lost': 'Int8'})
+    for stat in scoring.PRO_FOOTBALL_REFERENCE_STATS:
+        df.loc[rng.random(n) < 0.05, stat] = np.nan
+    return df
+
+def make_player_tables(n_players=12):
+    """Game logs of a few players as the Pro Football Reference datasource returns them, one raw table per player"""
+    archive = pd.read_csv(GAME_BY_GAME_DIR / '2023_weekly.csv')
+    raw = (archive
+           .assign(**{'home/away': archive['home/away'].map({'Away': '@'})})
+           .rename(columns={'home/away': '1', 'fumbles': 'fumbles_fmb', 'fumbles_lost': 'fumbles_fl'}))
+    tables = [table.reset_index(drop=True) for _, table in raw.groupby('player_id', sort=False)][:n_players]
+    # receivers have a catch percentage column, other players' tables do not
+    tables[0] = tables[0].assign(**{'receiving_ctch%': '75.0%'})
+    tables[1] = tables[1].assign(**{'receiving_ctch%': ['50.0%'] * (len(tables[1]) - 1) + [None]})
+    return tables
+
+def make_synthetic_pbp(n_games=272, plays_per_game=180, n_players=600, seed=0, season=2023):
+    """
+    Builds a synthetic season of play-by-play data with the columns used by the stat functions
+    :n_games: number of games; the default matches a 17 week regular season
+    :season: season used in the game ids, so stacked seasons do not share games
+    """
+    rng = np.random.default_rng(seed)
+    n = n_games * plays_per_game
+    teams = np.array(['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
+                      'LA', 'LAC', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS'])
+    players = np.array([f'00-00{ix:05d}' for ix in range(n_players)])
+    posteam = rng.choice(teams, n)
+    play_type = rng.choice(['pass', 'run', 'no_play'], n, p=[0.55, 0.4, 0.05])
+    is_pass = play_type == 'pass'
+    is_run = play_type == 'run'
+    complete = is_pass & (rng.random(n) < 0.62)
+    interception = is_pass & ~complete & (rng.random(n) < 0.06)
+    sack = is_pass & ~complete & ~interception & (rng.random(n) < 0.1)
+    incomplete = is_pass & ~complete & ~interception & ~sack
+    touchdown = (complete | is_run) & (rng.random(n) < 0.04)
+    fumble = (complete | is_run) & (rng.random(n) < 0.01)
+    yards = np.where(is_pass | is_run, rng.normal(5, 8, n).round(), 0)
+    air_yards = np.where(is_pass, rng.normal(8, 9, n).round(), np.nan)
+    passer = np.where(is_pass, rng.choice(players[:64], n), None)
+    receiver = np.where(complete | incomplete | interception, rng.choice(players[64:], n), None)
+    rusher = np.where(is_run, rng.choice(players[64:], n), None)
+    fumbler = np.where(fumble, np.where(is_run, rusher, receiver), None)
+    return pd.DataFrame({
+        'play_id': np.arange(n),
+        'season': season,
+        'game_id': np.char.add(f'{season}_', np.repeat(np.arange(n_games), plays_per_game).astype(str)),
+        'posteam': posteam,
+        'defteam': rng.choice(teams, n),
+        'play_type': play_type,
+        'down': np.where(rng.random(n) < 0.97, rng.integers(1, 5, n), np.nan),
+        'yardline_100': rng.integers(1, 100, n),
+        'yards_gained': yards,
+        'air_yards': air_yards,
+        'passer_player_id': passer,
+        'receiver_player_id': receiver,
+        'rusher_player_id': rusher,
+        'fumbled_1_player_id': fumbler,
+        'complete_pass': complete.astype(float),
+        'incomplete_pass': incomplete.astype(float),
+        'interception': interception.astype(float),
+        'sack': sack.astype(float),
+        'touchdown': touchdown.astype(float),
+        'td_team': np.where(touchdown, np.where(rng.random(n) < 0.95, posteam, None), None),
+        'pass_touchdown': (touchdown & complete).astype(float),
+        'rush_touchdown': (touchdown & is_run).astype(float),
+        'fumble': fumble.astype(float),
+        'passing_yards': np.where(complete, yards, np.nan),
+        'receiving_yards': np.where(complete, yards, np.nan),
+        'rushing_yards': np.where(is_run, yards, np.nan),
+    })
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from pandas.testing import assert_frame_equal
+from fantasyfootball import archive
+
+DATA_DIR = Path(__file__).resolve().parents[1] / 'data' / 'year-by-year'
+
+class TestLoadArchive(unittest.TestCase):
+    def setUp(self):
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.data_dir = os.path.join(tempdir.name, 'data')
+        self.cache_dir = os.path.join(tempdir.name, 'cache')
+        os.makedirs(os.path.join(self.data_dir, 'year-by-year'))
+        for file_path in sorted(DATA_DIR.glob('*.csv'))[:3]:
+            shutil.copy(file_path, os.path.join(self.data_dir, 'year-by-year'))
+
+    def load(self, **kwargs):
+        return archive.load_archive('year-by-year', self.data_dir, self.cache_dir, **kwargs)
+
+    def test_cached_load_matches_parsed_load(self):
+        parsed = self.load(use_cache=False)
+        self.assertEqual('Int16', str(parsed['year'].dtype))
+        assert_frame_equal(parsed, self.load())
+        with mock.patch.object(archive, 'read_archive_files') as read:
+            assert_frame_equal(parsed, self.load())
+        read.assert_not_called()
+
+    def test_touched_file_keeps_the_cache(self):
+        self.load()
+        file_path = archive.archive_files('year-by-year', self.data_dir)[0]
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with mock.patch.object(archive, 'read_archive_files') as read:
+            self.load()
+        read.assert_not_called()
+        # the refreshed mtime is written once, later warm loads leave the manifest alone
+        with mock.patch.object(archive, '_write_manifest') as write, mock.patch.object(archive, '_file_hash') as file_hash:
+            self.load()
+        write.assert_not_called()
+        file_hash.assert_not_called()
+
+    def test_changed_or_added_file_rebuilds(self):
+        first = self.load()
+        file_path = archive.archive_files('year-by-year', self.data_dir)[0]
+        with open(file_path) as f:
+            lines = f.readlines()
+        with open(file_path, 'w') as f:
+            f.writelines(lines[:-1])
+        self.assertEqual(len(first) - 1, len(self.load()))
+
+        shutil.copy(sorted(DATA_DIR.glob('*.csv'))[3], os.path.join(self.data_dir, 'year-by-year'))
+        self.assertEqual(4, self.load()['year'].nunique())
+
+    def test_missing_archive_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            archive.load_archive('game-by-game', self.data_dir, self.cache_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from PIL import Image
+from fantasyfootball import assets
+from fantasyfootball import config
+
+class ETagHandler(SimpleHTTPRequestHandler):
+    """Serves files with a content hash ETag and answers If-None-Match; Last-Modified is left out"""
+    requests_seen = []
+
+    def do_GET(self):
+        file_path = self.translate_path(self.path)
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        self.requests_seen.append(self.path)
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def save_logo(file_path, color, size=(300, 200)):
+    logo = np.zeros(size[::-1] + (4,), dtype=np.uint8)
+    logo[40:160, 50:250] = color + [255]
+    Image.fromarray(logo).save(file_path)
+
+class TestAssets(unittest.TestCase):
+    def serve(self, handler):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(handler, directory=self.served))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f'http://127.0.0.1:{server.server_address[1]}'
+
+    def setUp(self):
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.served = os.path.join(tempdir.name, 'served')
+        self.logo_dir = os.path.join(tempdir.name, 'logos')
+        os.makedirs(os.path.join(self.served, 'wordmarks'))
+        os.makedirs(self.logo_dir)
+        for ix, team in enumerate(['ARI', 'ATL', 'NYJ']):
+            save_logo(os.path.join(self.served, f'{team.lower()}.png'), [ix * 100, 50, 50])
+            save_logo(os.path.join(self.served, 'wordmarks', f'{team}.png'), [50, ix * 100, 50], size=(400, 100))
+
+    def write_teams(self, base_url):
+        with open(os.path.join(self.served, 'teams.csv'), 'w') as f:
+            f.write('team_abbr,team_logo_espn,team_wordmark\n')
+            for team in ['ARI', 'ATL', 'NYJ']:
+                f.write(f'{team},{base_url}/{team.lower()}.png,{base_url}/wordmarks/{team}.png\n')
+        return f'{base_url}/teams.csv'
+
+    def sync(self, teams_url, **kwargs):
+        return assets.sync_assets(kinds=['espn', 'wordmarks'], logo_dir=self.logo_dir, teams_url=teams_url,
+                                  sizes=(50, 100), workers=4, **kwargs).set_index(['kind', 'team'])
+
+    def test_sync_with_last_modified(self):
+        teams_url = self.write_teams(self.serve(QuietHandler))
+        report = self.sync(teams_url)
+        self.assertEqual(['downloaded'] * 6, report['status'].tolist())
+        with Image.open(os.path.join(self.logo_dir, 'espn', 'ARI_100.png')) as image:
+            self.assertEqual((100, 67), image.size)
+        with Image.open(os.path.join(self.logo_dir, 'wordmarks', 'NYJ_50.png')) as image:
+            self.assertEqual((50, 13), image.size)
+
+        # the server answers 304 to the Last-Modified validator
+        self.assertEqual(['not modified'] * 6, self.sync(teams_url)['status'].tolist())
+
+        # a changed logo is downloaded again and its variants rebuilt
+        save_logo(os.path.join(self.served, 'atl.png'), [10, 200, 10])
+        os.utime(os.path.join(self.served, 'atl.png'), (2e9, 2e9))
+        # a logo touched on the server but with the same content keeps the local copy
+        os.utime(os.path.join(self.served, 'ari.png'), (2e9, 2e9))
+        os.remove(os.path.join(self.logo_dir, 'wordmarks', 'NYJ_50.png'))
+        report = self.sync(teams_url)
+        self.assertEqual('downloaded', report.loc[('espn', 'ATL'), 'status'])
+        self.assertEqual('unchanged', report.loc[('espn', 'ARI'), 'status'])
+        self.assertEqual('not modified', report.loc[('wordmarks', 'NYJ'), 'status'])
+        self.assertTrue(os.path.exists(os.path.join(self.logo_dir, 'wordmarks', 'NYJ_50.png')))
+        with Image.open(os.path.join(self.logo_dir, 'espn', 'ATL_50.png')) as image:
+            np.testing.assert_allclose([10, 200, 10, 255], np.asarray(image)[16, 25], atol=2)
+
+    def test_sync_with_etags_and_manifest(self):
+        ETagHandler.requests_seen = []
+        teams_url = self.write_teams(self.serve(ETagHandler))
+        self.sync(teams_url, teams=['NYJ'])
+        report = self.sync(teams_url)
+        self.assertEqual('not modified', report.loc[('espn', 'NYJ'), 'status'])
+        self.assertEqual('downloaded', report.loc[('espn', 'ARI'), 'status'])
+
+        manifest_path = os.path.join(self.logo_dir, 'manifest.json')
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        self.assertTrue(manifest['assets']['espn/NYJ']['etag'].startswith('"'))
+        self.assertEqual(os.path.join(self.logo_dir, 'espn', 'NYJ.png'), config.asset_path_map('espn', manifest_path)['NYJ'])
+        self.assertEqual(os.path.join(self.logo_dir, 'wordmarks', 'ARI_50.png'),
+                         config.asset_path_map('wordmarks', manifest_path, size=50)['ARI'])
+        self.assertEqual({}, config.asset_path_map('espn', os.path.join(self.logo_dir, 'missing.json')))
+
+    def test_palette_variants_are_resampled(self):
+        file_path = os.path.join(self.logo_dir, 'ARI.png')
+        save_logo(file_path, [200, 30, 60])
+        with Image.open(file_path) as image:
+            image.convert('P', palette=Image.ADAPTIVE).save(file_path)
+        self.assertEqual({'50': 'ARI_50.png'}, assets.make_variants(file_path, sizes=(50,)))
+        with Image.open(os.path.join(self.logo_dir, 'ARI_50.png')) as image:
+            self.assertEqual('RGBA', image.mode)
+            # Lanczos blends the logo's edges, nearest neighbour would only keep the palette's two colors
+            self.assertGreater(len(image.getcolors()), 2)
+
+    def test_failed_download_is_reported(self):
+        base_url = self.serve(QuietHandler)
+        teams_url = self.write_teams(base_url)
+        os.remove(os.path.join(self.served, 'atl.png'))
+        report = self.sync(teams_url)
+        self.assertEqual('error', report.loc[('espn', 'ATL'), 'status'])
+        self.assertEqual(5, (report['status'] == 'downloaded').sum())
+        with open(os.path.join(self.logo_dir, 'manifest.json')) as f:
+            self.assertNotIn('espn/ATL', json.load(f)['assets'])
+
+if __name__ == '__main__':
+    unittest.main()
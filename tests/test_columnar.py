@@ -0,0 +1,36 @@
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from fantasyfootball.utils.columnar import load_columns, save_columns
+
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.directory = tempdir.name
+        self.df = pd.DataFrame({'player_name': ['Davante Adams', 'Tyreek Hill', None, 'Davante Adams'],
+                                'pos': pd.Categorical(['WR', 'WR', 'TE', 'WR']),
+                                'year': [2022, 2022, 2023, 2023],
+                                'pts': [21.5, 18.25, np.nan, 9.0]})
+
+    def test_round_trip(self):
+        save_columns(self.df, self.directory)
+        loaded = load_columns(self.directory, mmap=False)
+        expected = self.df.astype({'player_name': 'category', 'pos': 'category'})
+        assert_frame_equal(expected, loaded, check_categorical=False)
+        self.assertEqual(['player_name', 'pts'], list(load_columns(self.directory, ['player_name', 'pts']).columns))
+        with self.assertRaises(KeyError):
+            load_columns(self.directory, ['team'])
+
+    def test_categorical_codes_stay_memory_mapped(self):
+        save_columns(self.df, self.directory)
+        loaded = load_columns(self.directory)
+        for column in ('player_name', 'pos', 'year'):
+            values = loaded[column].array
+            base = getattr(values, 'codes', getattr(values, '_ndarray', None))
+            self.assertIsInstance(base.base, np.memmap, column)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import glob
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from fantasyfootball import config
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+def legacy_unique_id_create(my_df, team=False):
+    """The regex based implementation the merge ids must stay identical to"""
+    char_list = ["'", ' III', ' II', ' IV', ' V', 'Jr',  '\\.', '-']
+    symbol_dict = dict(zip(char_list, len(char_list)*['']))
+    names = my_df['player_name'].replace(symbol_dict, regex=True).str.lower().str.split()
+    my_id = names.str[0].str[0:3] + '_' + names.str[1] + '_' + my_df['pos']
+    if team:
+        my_id = my_id + '_' + my_df['tm']
+    return my_df.assign(id=my_id.str.lower())
+
+class TestUniqueIdCreate(unittest.TestCase):
+    def test_matches_legacy_ids_on_draft_history(self):
+        for file_path in sorted(glob.glob(os.path.join(DATA_DIR, 'vor', '*.csv'))):
+            df = pd.read_csv(file_path)
+            for team in (False, True):
+                assert_frame_equal(legacy_unique_id_create(df, team=team), config.unique_id_create(df, team=team))
+
+    def test_matches_legacy_ids_on_edge_cases(self):
+        df = pd.DataFrame({
+            'player_name': ["D'Andre Swift", 'Odell Beckham Jr.', 'Robert Griffin III', 'J.r Smith', 'Amon-Ra St. Brown',
+                            'Vince Young', 'Single', None, '  '],
+            'pos': ['RB', 'WR', 'QB', 'WR', 'WR', 'QB', 'WR', 'RB', np.nan],
+            'tm': 'KC',
+        })
+        for team in (False, True):
+            assert_frame_equal(legacy_unique_id_create(df, team=team), config.unique_id_create(df, team=team))
+
+    def test_name_cache_is_bounded(self):
+        config._id_name_prefix.cache_clear()
+        self.addCleanup(config._id_name_prefix.cache_clear)
+        names = [f'Player Number{ix}' for ix in range(config.ID_NAME_CACHE_SIZE + 100)]
+        df = config.unique_id_create(pd.DataFrame({'player_name': names, 'pos': 'WR'}))
+        self.assertEqual('pla_number0_wr', df['id'].iat[0])
+        self.assertEqual(config.ID_NAME_CACHE_SIZE, config._id_name_prefix.cache_info().currsize)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from fantasyfootball import config, draft, tiering
+from fantasyfootball.utils.frame_cache import FrameCache
+from fixtures import make_draft_sources
+
+class TestDraftPipeline(unittest.TestCase):
+    def setUp(self):
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.cache = FrameCache(cache_dir=tempdir.name)
+        projections, adp, weekly, ecr = make_draft_sources()
+        self.scrapers = {
+            'get_fantasy_pros_projections': mock.Mock(return_value=projections),
+            'get_adp_data': mock.Mock(return_value=adp),
+            'get_weekly_data': mock.Mock(return_value=weekly),
+        }
+        self.ecr = mock.Mock(return_value=ecr)
+        for name, scraper in self.scrapers.items():
+            patcher = mock.patch.object(draft, name, scraper)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(draft.fp, 'fantasy_pros_ecr_process', self.ecr)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(tiering, 'model_cache', tiering.ModelCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def pipeline(self, **kwargs):
+        return draft.DraftPipeline(league=config.sean, year=2023, day='2024.08.01', cache=self.cache, **kwargs)
+
+    def scrape_calls(self):
+        return [scraper.call_count for scraper in self.scrapers.values()] + [self.ecr.call_count]
+
+    def test_board_columns(self):
+        board = self.pipeline().run()
+        self.assertEqual(['rank', 'pos_tiers', 'player_name', 'tm', 'pos_rank', 'pos', 'bye', 'best', 'worst', 'avg',
+                          'std dev', 'adp', 'adp_vor_delta', 'py_avg_ppg', 'py_std_dev', 'custom_points', 'vor'],
+                         list(board.columns))
+        self.assertEqual(240, len(board))
+
+    def test_downstream_change_does_not_rescrape(self):
+        pipeline = self.pipeline()
+        pipeline.run()
+        self.assertEqual([1, 1, 1, 1], self.scrape_calls())
+
+        pipeline.tier_dict = {**draft.pos_tier_dict_viz, 'WR': 4}
+        with mock.patch.object(draft, 'merge_ecr_data', wraps=draft.merge_ecr_data) as merge:
+            pipeline.run()
+        merge.assert_not_called()
+        pipeline.method = 'last starter'
+        pipeline.run()
+        self.assertEqual([1, 1, 1, 1], self.scrape_calls())
+
+    def test_outputs_persist_on_disk(self):
+        first = self.pipeline().run()
+        self.cache.invalidate(disk=False)
+        with mock.patch.object(draft, 'add_tiers_to_ecr') as tiers:
+            pd.testing.assert_frame_equal(first, self.pipeline().run())
+        tiers.assert_not_called()
+
+    def test_new_day_rescrapes(self):
+        self.pipeline().run()
+        self.pipeline(tier_dict=draft.pos_tier_dict_viz).run('merged')
+        draft.DraftPipeline(league=config.sean, year=2023, day='2024.08.02', cache=self.cache).run('merged')
+        self.assertEqual([2, 2, 1, 1], self.scrape_calls())
+
+    def test_weekly_sources_change_recomputes_weekly(self):
+        with mock.patch.object(draft.weeklypoints, 'source_fingerprint', return_value='a'):
+            self.pipeline().run('merged')
+            self.pipeline().run('merged')
+        with mock.patch.object(draft.weeklypoints, 'source_fingerprint', return_value='b'):
+            self.pipeline().run('merged')
+        self.assertEqual([1, 1, 2, 0], self.scrape_calls())
+
+    def test_expired_outputs_are_recomputed(self):
+        self.pipeline().run('merged')
+        self.pipeline(ttl=0).run('merged')
+        self.assertEqual([2, 2, 2, 0], self.scrape_calls())
+
+    def test_unknown_stage(self):
+        with self.assertRaises(ValueError):
+            self.pipeline().run('draft')
+
+if __name__ == '__main__':
+    unittest.main()
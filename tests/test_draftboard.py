@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import numpy as np
+import pandas as pd
+from fantasyfootball import config
+from fantasyfootball.draftboard import DraftBoard, LIVE_METHODS, serve
+
+BOARD_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'vor', '2024.09.03_sean_draft.csv')
+
+class TestDraftBoard(unittest.TestCase):
+    def setUp(self):
+        self.board_df = pd.read_csv(BOARD_PATH)
+
+    def test_incremental_updates_match_a_full_recompute(self):
+        rng = np.random.default_rng(0)
+        for method in LIVE_METHODS:
+            board = DraftBoard(self.board_df, config.sean, method)
+            for row in rng.choice(len(self.board_df), 150, replace=False):
+                board.pick(int(row))
+            board.undo()
+            incremental = dict(board.replacement)
+            board.recompute()
+            self.assertEqual(incremental, board.replacement)
+
+    def test_best_available_matches_brute_force(self):
+        board = DraftBoard(self.board_df, config.sean)
+        for name in self.board_df.sort_values('adp')['player_name'].head(30):
+            board.pick(name)
+        best = board.best_available(20)
+        remaining = self.board_df.loc[board.available]
+        vor = remaining['custom_points'] - remaining['pos'].map(board.replacement)
+        expected = vor.sort_values(ascending=False, kind='stable').head(20)
+        np.testing.assert_allclose(expected.to_numpy(), best['live_vor'].to_numpy())
+        self.assertTrue(best['player_name'].isin(remaining['player_name']).all())
+
+    def test_repeated_and_unknown_picks_raise(self):
+        board = DraftBoard(self.board_df, config.sean)
+        name = self.board_df.at[0, 'player_name']
+        board.pick(name.upper())
+        with self.assertRaises(ValueError):
+            board.pick(name)
+        with self.assertRaises(KeyError):
+            board.pick('Not A Player')
+        self.assertEqual(len(self.board_df) - 1, len(board))
+        with self.assertRaisesRegex(KeyError, 'Unknown position'):
+            board.best_available(5, 'XX')
+
+    def test_http_picks(self):
+        board = DraftBoard(self.board_df, config.sean)
+        server = serve(board, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+
+        name = self.board_df.at[0, 'player_name']
+        request = Request(f'{url}/pick', data=json.dumps({'player': name, 'team': 'me'}).encode(), method='POST')
+        with urlopen(request) as response:
+            self.assertEqual(name, json.load(response)['player_name'])
+        with urlopen(f'{url}/best?n=3') as response:
+            best = json.load(response)
+        self.assertEqual(3, len(best))
+        self.assertNotIn(name, [player['player_name'] for player in best])
+        with urlopen(f'{url}/best?pos=qb&n=2') as response:
+            self.assertEqual(['QB', 'QB'], [player['pos'] for player in json.load(response)])
+        for query in ('pos=XX', 'n=abc'):
+            with self.assertRaises(HTTPError) as error:
+                urlopen(f'{url}/best?{query}')
+            self.assertEqual(400, error.exception.code)
+            error.exception.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from fantasyfootball import draftsim
+from fixtures import make_draft_pool
+
+class TestDraftSim(unittest.TestCase):
+    def test_snake_picks(self):
+        self.assertEqual([3, 22, 27, 46], draftsim.snake_picks(3, team_n=12, rounds=4).tolist())
+        self.assertEqual([12, 13, 36], draftsim.snake_picks(12, team_n=12, rounds=3).tolist())
+
+    def test_availability_falls_with_later_picks(self):
+        sims = draftsim.simulate_draft(make_draft_pool(), [1, 10, 30], n_sims=2_000)
+        self.assertTrue((sims['pick_1'] == 1).all())
+        self.assertTrue((sims['pick_10'] >= sims['pick_30']).all())
+        self.assertGreater(sims.at[0, 'drafted'], 0.99)
+        self.assertLess(sims['pick_30'].iloc[:5].max(), 0.01)
+
+    def test_fixed_ranks_are_deterministic(self):
+        pool = pd.DataFrame({'player_name': ['A', 'B', 'C', 'D', 'E', 'F'], 'pos': ['RB', 'WR', 'RB', 'QB', 'TE', 'WR'],
+                             'mean': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0], 'std': 0.0,
+                             'low': [0.999, 1.999, 2.999, 3.999, 4.999, 5.999],
+                             'high': [1.001, 2.001, 3.001, 4.001, 5.001, 6.001]})
+        sims = draftsim.simulate_draft(pool, [3], n_sims=100)
+        self.assertEqual([0.0, 0.0, 1.0, 1.0, 1.0, 1.0], sims['pick_3'].tolist())
+
+    def test_results_do_not_depend_on_workers(self):
+        pool = make_draft_pool()
+        single = draftsim.simulate_draft(pool, [5, 20], n_sims=1_000, chunk_size=250)
+        pooled = draftsim.simulate_draft(pool, [5, 20], n_sims=1_000, chunk_size=250, workers=2)
+        assert_frame_equal(single, pooled)
+
+    def test_blend_pools_keeps_players_from_either_pool(self):
+        adp = pd.DataFrame({'player_name': ['A', 'B'], 'pos': ['RB', 'WR'], 'overall': [1.0, 3.0], 'std. dev': [1.0, 1.0]})
+        ecr = pd.DataFrame({'player_name': ['A', 'C'], 'pos': ['RB', 'QB'], 'avg': [3.0, 2.0], 'std dev': [1.0, 2.0],
+                            'best': [1, 1], 'worst': [5, 4]})
+        pool = draftsim.blend_pools(draftsim.pool_from_adp(adp), draftsim.pool_from_ecr(ecr))
+        self.assertEqual(['A', 'C', 'B'], pool['player_name'].tolist())
+        self.assertEqual([2.0, 2.0, 3.0], pool['mean'].tolist())
+        self.assertEqual([1.0, 2.0, 1.0], pool['std'].tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from fantasyfootball import config
+from fantasyfootball import figurejobs
+from fantasyfootball import tiering, tiers
+from fixtures import make_ecr
+
+def broken_chart(save=True):
+    raise ValueError("no data")
+
+class TestFigureJobs(unittest.TestCase):
+    def setUp(self):
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.figure_dir = tempdir.name
+
+    def test_jobs_write_their_figures(self):
+        ecr = {'sean': make_ecr(), 'work': make_ecr(seed=1)}
+        jobs = figurejobs.tier_jobs([config.sean, config.work], tier_dict={'QB': 4, 'TE': 3}, pos_n=20, ecr=ecr,
+                                    clf='ckmeans', cache=tiering.ModelCache())
+        jobs.append(figurejobs.FigureJob('broken', broken_chart))
+        report = figurejobs.run_figure_jobs(jobs, self.figure_dir, workers=2)
+
+        self.assertEqual([job.name for job in jobs], report['name'].tolist())
+        self.assertTrue(report['name'].str.endswith(('sean_QB', 'sean_TE', 'work_QB', 'work_TE', 'broken')).all())
+        done = report.iloc[:4]
+        self.assertTrue(done['error'].isna().all())
+        self.assertTrue((done['seconds'] > 0).all())
+        for files in done['files']:
+            self.assertEqual(1, len(files))
+            self.assertTrue(os.path.getsize(files[0]) > 0)
+        self.assertEqual(4, len(os.listdir(self.figure_dir)))
+        self.assertEqual('ValueError: no data', report.iloc[4]['error'])
+
+    def test_render_job_numbers_several_figures(self):
+        job = figurejobs.FigureJob('tiers', tiers.make_clustering_viz,
+                                   kwargs={'tier_dict': {'RB': 4, 'WR': 4}, 'pos_n': 20, 'df': make_ecr(),
+                                           'cache': tiering.ModelCache()})
+        figurejobs._init_worker()
+        report = figurejobs.render_job(job, self.figure_dir)
+        self.assertEqual(['tiers_1.png', 'tiers_2.png'], sorted(os.path.basename(f) for f in report['files']))
+        from matplotlib import pyplot as plt
+        self.assertEqual([], plt.get_fignums())
+
+if __name__ == '__main__':
+    unittest.main()
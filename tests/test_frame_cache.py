@@ -0,0 +1,77 @@
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from fantasyfootball.utils.frame_cache import FrameCache
+
+class TestFrameCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def make_loader(self, cache):
+        @cache.memoize()
+        def load(year, rows=10):
+            self.calls.append((year, rows))
+            return pd.DataFrame({'year': [year] * rows, 'value': np.arange(rows, dtype=float)})
+        return load
+
+    def test_repeated_calls_hit_the_cache(self):
+        load = self.make_loader(FrameCache())
+        first = load(2023)
+        assert_frame_equal(first, load(2023))
+        assert_frame_equal(first, load(np.int64(2023)))
+        self.assertEqual([(2023, 10)], self.calls)
+
+    def test_hits_share_data_without_sharing_columns(self):
+        load = self.make_loader(FrameCache())
+        first = load(2023)
+        first['extra'] = 1
+        self.assertNotIn('extra', load(2023).columns)
+
+    def test_hits_are_read_only(self):
+        load = self.make_loader(FrameCache(cache_dir=self.tempdir.name))
+        for hit in (load(2023), load(2023)):
+            with self.assertRaises(ValueError):
+                hit.loc[0, 'value'] = 99.0
+            with self.assertRaises(ValueError):
+                hit.loc[hit['value'] > 5, 'year'] = 0
+            hit['value'] = hit['value'] * 2
+        assert_frame_equal(pd.DataFrame({'year': [2023] * 10, 'value': np.arange(10, dtype=float)}), load(2023))
+        # a disk hit is frozen the same way
+        load = self.make_loader(FrameCache(cache_dir=self.tempdir.name))
+        hit = load(2023)
+        with self.assertRaises(ValueError):
+            hit.iloc[0, 1] = 99.0
+
+    def test_lru_eviction_by_size(self):
+        cache = FrameCache(max_bytes=500)
+        load = self.make_loader(cache)
+        load(2021, rows=20)
+        load(2022, rows=20)
+        self.assertLessEqual(cache.nbytes, 500)
+        load(2021, rows=20)
+        self.assertEqual(3, len(self.calls))
+
+    def test_disk_cache_survives_a_new_instance(self):
+        self.make_loader(FrameCache(cache_dir=self.tempdir.name))(2023)
+        load = self.make_loader(FrameCache(cache_dir=self.tempdir.name))
+        load(2023)
+        self.assertEqual(1, len(self.calls))
+
+    def test_invalidate(self):
+        load = self.make_loader(FrameCache(cache_dir=self.tempdir.name))
+        load(2022)
+        load(2023)
+        load.invalidate(2023)
+        load(2022)
+        load(2023)
+        self.assertEqual([(2022, 10), (2023, 10), (2023, 10)], self.calls)
+        load.invalidate()
+        load(2022)
+        self.assertEqual(4, len(self.calls))
+
+if __name__ == '__main__':
+    unittest.main()
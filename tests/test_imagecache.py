@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from matplotlib import image as mpimg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from fantasyfootball import imagecache
+
+class TestImageCache(unittest.TestCase):
+    def setUp(self):
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.addCleanup(imagecache.clear)
+        imagecache.clear()
+        self.logo = os.path.join(tempdir.name, 'NYJ.png')
+        logo = np.zeros((40, 60, 4))
+        logo[10:30, 15:45] = [0.1, 0.5, 0.2, 1.0]
+        mpimg.imsave(self.logo, logo)
+
+    def test_decodes_once(self):
+        first = imagecache.read_image(self.logo)
+        self.assertIs(first, imagecache.read_image(self.logo))
+        self.assertEqual((40, 60, 4), first.shape)
+        self.assertFalse(first.flags.writeable)
+        self.assertEqual({'hits': 1, 'misses': 1, 'images': 1}, {k: v for k, v in imagecache.cache_info().items() if k != 'bytes'})
+
+    def test_downscaled_copy(self):
+        small = imagecache.read_image(self.logo, zoom=0.5)
+        self.assertEqual((20, 30, 4), small.shape)
+        self.assertEqual(np.uint8, small.dtype)
+        # transparent edges keep the logo color instead of darkening it
+        np.testing.assert_allclose([26, 128, 51], small[10, 15, :3], atol=2)
+        self.assertIs(small, imagecache.read_image(self.logo, zoom=0.5))
+
+    def test_replaced_file_is_read_again(self):
+        first = imagecache.read_image(self.logo)
+        mpimg.imsave(self.logo, np.ones((8, 8, 4)))
+        os.utime(self.logo, ns=(os.stat(self.logo).st_atime_ns, os.stat(self.logo).st_mtime_ns + 10**9))
+        self.assertEqual((8, 8, 4), imagecache.read_image(self.logo).shape)
+        self.assertEqual((40, 60, 4), first.shape)
+
+    def test_offset_image(self):
+        # at 72 dpi one image pixel is one point, so zoom is the scale of the copy
+        image = imagecache.offset_image(self.logo, zoom=0.5, dpi=72)
+        self.assertEqual(1.0, image.get_zoom())
+        self.assertEqual((20, 30, 4), image.get_data().shape)
+        image = imagecache.offset_image(self.logo, zoom=1.1)
+        self.assertEqual(1.1, image.get_zoom())
+        self.assertEqual((40, 60, 4), image.get_data().shape)
+        self.assertEqual(0.5, imagecache.offset_image(self.logo, zoom=0.5, downscale=False).get_zoom())
+
+    def test_offset_image_is_drawn_pixel_for_pixel(self):
+        fig = Figure(dpi=150)
+        renderer = FigureCanvasAgg(fig).get_renderer()
+        full = imagecache.offset_image(self.logo, zoom=0.25, downscale=False)
+        small = imagecache.offset_image(self.logo, zoom=0.25, dpi=150)
+        self.assertEqual((21, 31, 4), small.get_data().shape)
+        for image in (full, small):
+            image.set_figure(fig)
+        width, height = small.get_bbox(renderer).size
+        np.testing.assert_allclose(full.get_bbox(renderer).size, (width, height), atol=1)
+        np.testing.assert_allclose((height, width), small.get_data().shape[:2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+import pandas as pd
+from fantasyfootball.transformers.nflfastr_transformer import NflfastrTransfomer
+
+TEXT_SUFFIXES = ('id', 'name', 'team', 'type', 'location', 'result', 'transition')
+TEXT_COLUMNS = ['desc', 'yrdln', 'side_of_field']
+DATETIME_COLUMNS = ['end_clock_time', 'drive_real_start_time']
+
+def eager_convert(df):
+    """The column by column conversion the transformer used before the dtype map"""
+    df = df.copy()
+    for column in DATETIME_COLUMNS:
+        df[column] = df[column].apply(lambda x: pd.to_datetime(x, errors='coerce'))
+    for column in df.columns:
+        if column in TEXT_COLUMNS or column.endswith(TEXT_SUFFIXES):
+            df[column] = df[column].astype(str)
+    return df
+
+def make_plays():
+    return pd.DataFrame({
+        'play_id': [1.0, 40.0, 61.0, 85.0],
+        'game_id': ['2023_01_DET_KC'] * 4,
+        'posteam': ['KC', 'DET', 'KC', np.nan],
+        'play_type': ['pass', 'run', 'pass', 'no_play'],
+        'pass_location': ['left', None, 'right', None],
+        'passer_player_id': ['00-0033873', np.nan, '00-0033873', np.nan],
+        'passer_player_name': ['P.Mahomes', np.nan, 'P.Mahomes', np.nan],
+        'desc': ['pass short left', 'run up the middle', 'pass deep right', 'penalty'],
+        'yrdln': ['KC 25', 'DET 40', 'MID 50', 'KC 35'],
+        'side_of_field': ['KC', 'DET', np.nan, 'KC'],
+        'end_clock_time': ['2023-09-08T00:20:41.000Z', '2023-09-08T00:21:30.000Z', 'not a time', np.nan],
+        'drive_real_start_time': ['2023-09-08T00:20:00.000Z'] * 3 + [np.nan],
+        'yards_gained': [7.0, 3.0, np.nan, 0.0],
+    })
+
+class TestNflfastrTransformer(unittest.TestCase):
+    def setUp(self):
+        self.plays = make_plays()
+        self.eager = eager_convert(self.plays)
+        self.result = NflfastrTransfomer().transform(self.plays.copy())
+
+    def test_text_matches_the_eager_conversion(self):
+        for column in self.eager.columns:
+            if self.eager[column].dtype != object:
+                continue
+            with self.subTest(column=column):
+                missing = self.plays[column].isna().to_numpy()
+                np.testing.assert_array_equal(missing, self.result[column].isna().to_numpy())
+                # missing text stays missing instead of becoming the string 'nan' or 'None'
+                self.assertTrue(self.eager.loc[missing, column].isin(['nan', 'None']).all())
+                self.assertEqual(self.eager.loc[~missing, column].tolist(),
+                                 self.result.loc[~missing, column].astype(str).tolist())
+
+    def test_dtypes(self):
+        self.assertIsInstance(self.result['posteam'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(self.result['side_of_field'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(self.result['desc'].dtype, pd.StringDtype)
+        self.assertIsInstance(self.result['passer_player_id'].dtype, pd.StringDtype)
+        self.assertEqual(np.float64, self.result['yards_gained'].dtype)
+        self.assertEqual('UTC', str(self.result['end_clock_time'].dt.tz))
+
+    def test_timestamps_match_the_eager_conversion(self):
+        for column in DATETIME_COLUMNS:
+            with self.subTest(column=column):
+                expected = pd.to_datetime(self.eager[column], utc=True)
+                pd.testing.assert_series_equal(expected, self.result[column], check_dtype=False)
+        self.assertTrue(pd.isna(self.result.at[2, 'end_clock_time']))
+
+    def test_dtype_map_cache_is_bounded(self):
+        maxsize = NflfastrTransfomer._resolve_dtype_map.cache_info().maxsize
+        self.assertIsNotNone(maxsize)
+        for n in range(maxsize + 10):
+            NflfastrTransfomer.get_dtype_map(self.plays.columns[:1].tolist() + [f'extra_{n}_id'])
+        self.assertLessEqual(NflfastrTransfomer._resolve_dtype_map.cache_info().currsize, maxsize)
+        # callers get their own copy of a cached map
+        dtype_map = NflfastrTransfomer.get_dtype_map(self.plays.columns)
+        dtype_map['desc'] = 'object'
+        self.assertNotEqual('object', NflfastrTransfomer.get_dtype_map(self.plays.columns)['desc'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from fantasyfootball.nflstats import get_passing_stats, get_receiving_stats, get_rushing_stats, get_player_stats
+from fixtures import make_synthetic_pbp
+
+class TestPlayerStats(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = pd.concat([make_synthetic_pbp(n_games=32, seed=ix, season=2022 + ix) for ix in range(2)], ignore_index=True)
+
+    def assert_matches_single_family_stats(self, offense, weekly):
+        expected = pd.concat([get_passing_stats(df=self.df, offense=offense, weekly=weekly),
+                              get_receiving_stats(df=self.df, offense=offense, weekly=weekly),
+                              get_rushing_stats(df=self.df, offense=offense, weekly=weekly)], axis='columns')
+        assert_frame_equal(expected, get_player_stats(df=self.df, offense=offense, weekly=weekly))
+
+    def test_offense_season(self):
+        self.assert_matches_single_family_stats(offense=True, weekly=False)
+
+    def test_offense_weekly(self):
+        self.assert_matches_single_family_stats(offense=True, weekly=True)
+
+    def test_defense_season(self):
+        self.assert_matches_single_family_stats(offense=False, weekly=False)
+
+    def test_defense_weekly(self):
+        self.assert_matches_single_family_stats(offense=False, weekly=True)
+
+if __name__ == '__main__':
+    unittest.main()
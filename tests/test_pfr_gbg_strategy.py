@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from fantasyfootball.factories.schema_factory import SchemaFactory
+from fantasyfootball.strategies.pfr_gbg_strategy import ProFootballReferenceGbGStrategy
+from fixtures import make_player_tables
+
+class TestTransformBatch(unittest.TestCase):
+    CONFIG = {'transformer': 'prf_game_by_game'}
+
+    def setUp(self):
+        self.strategy = ProFootballReferenceGbGStrategy(self.CONFIG)
+        self.tables = make_player_tables()
+        if self.strategy.schema is not None:
+            # the datasource types every table with the schema while parsing it
+            self.tables = [self.strategy.schema.apply(table) for table in self.tables]
+
+    def one_at_a_time(self, tables):
+        """The per-player transform the strategy ran before batching"""
+        transformer = self.strategy.transformer
+        return pd.concat([transformer.transform(dataframe=table) for table in tables], ignore_index=True)
+
+    def assert_same_rows(self, expected, result):
+        # concatenating per-player frames turns categoricals with different categories into object
+        assert_frame_equal(expected.astype(object), result.astype(object))
+
+    def test_batch_matches_one_table_at_a_time(self):
+        expected = self.one_at_a_time(self.tables)
+        result = self.strategy._transform_batch(self.tables)
+        self.assert_same_rows(expected, result)
+        self.assertEqual(sum(len(table) for table in self.tables), len(result))
+        self.assertEqual([75.0, 0.0], result.groupby('player_id', sort=False)['receiving_ctch_pct'].first()
+                                            .iloc[[0, 2]].tolist())
+        if self.strategy.schema is not None:
+            self.assertIsInstance(result['tm'].dtype, pd.CategoricalDtype)
+
+    def test_failed_batch_falls_back_to_each_table(self):
+        # a catch percentage that is not a number cannot be typed
+        bad = self.tables[3].assign(**{'receiving_ctch%': 'abc%'})
+        tables = self.tables[:3] + [bad] + self.tables[4:]
+        with self.assertLogs('fantasyfootball.strategies.pfr_gbg_strategy', level='WARNING') as logs:
+            result = self.strategy._transform_batch(tables)
+        self.assertTrue(any('Batch transform failed' in line for line in logs.output))
+        self.assertTrue(any(bad['player_id'].iat[0] in line for line in logs.output))
+        self.assert_same_rows(self.one_at_a_time(self.tables[:3] + self.tables[4:]), result)
+
+    def test_every_table_failing_gives_an_empty_frame(self):
+        with self.assertLogs('fantasyfootball.strategies.pfr_gbg_strategy', level='ERROR'):
+            result = self.strategy._transform_batch([table.assign(**{'receiving_ctch%': 'abc%'})
+                                                     for table in self.tables[:2]])
+        self.assertTrue(result.empty)
+
+class TestTransformBatchWithSchema(TestTransformBatch):
+    CONFIG = {'transformer': 'prf_game_by_game', 'schema': 'prf_game_by_game'}
+
+    def test_components_share_one_schema(self):
+        strategy = ProFootballReferenceGbGStrategy({**self.CONFIG, 'datasource': 'profootballreference'})
+        with mock.patch.object(SchemaFactory, 'create', wraps=SchemaFactory.create) as create:
+            self.assertIs(strategy.schema, strategy.transformer.schema)
+            self.assertIs(strategy.schema, strategy.datasource.schema)
+        create.assert_called_once_with('prf_game_by_game')
+
+if __name__ == '__main__':
+    unittest.main()
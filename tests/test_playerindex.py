@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from fantasyfootball.playerindex import PlayerIndex
+
+class TestPlayerIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        n_rows = 2_000
+        cls.roster = pd.DataFrame({
+            'season': rng.choice([2022, 2023], n_rows),
+            'gsis_id': rng.choice([f'00-00{ix:05d}' for ix in range(200)] + [None], n_rows),
+            'pfr_id': rng.choice([f'Play{ix:02d}' for ix in range(200)] + [None], n_rows),
+            'full_name': rng.choice(['Patrick Mahomes', 'Josh Allen', "Ja'Marr Chase", None], n_rows),
+            'position': rng.choice(['QB', 'WR', None], n_rows),
+            'team': rng.choice(['KC', 'BUF', 'CIN'], n_rows),
+        })
+        cls.index = PlayerIndex.from_roster(cls.roster)
+
+    def test_roster_matches_last_roster_entry(self):
+        expected = (self.roster.loc[self.roster['season'] == 2023]
+                               .groupby(['gsis_id'])
+                               .agg(name=('full_name', 'last'), team=('team', 'last'), pos=('position', 'last'))
+                               .dropna())
+        assert_frame_equal(expected, self.index.roster(2023))
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.index.save(os.path.join(directory, 'player-index'))
+            loaded = PlayerIndex.load(os.path.join(directory, 'player-index'))
+            for column in PlayerIndex.COLUMNS:
+                self.assertTrue(self.index.frame[column].equals(loaded.frame[column]), column)
+            self.assertEqual([2022, 2023], loaded.seasons)
+
+    def test_keys_and_lookup(self):
+        keys = self.index.keys('gsis_id', ['00-0000005', 'unknown', None])
+        self.assertEqual([5, -1, -1], keys.tolist())
+        players = self.index.lookup(keys, ['gsis_id'])
+        self.assertEqual('00-0000005', players.loc[0, 'gsis_id'])
+        self.assertTrue(players.loc[1:, 'gsis_id'].isna().all())
+
+if __name__ == '__main__':
+    unittest.main()
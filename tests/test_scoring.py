@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
+from fantasyfootball import config, scoring
+from fixtures import GAME_BY_GAME_DIR, make_stats
+
+def legacy_fantasy_pros_pts(df, league):
+    """The per-column formula config.fantasy_pros_pts used before scoring.py"""
+    return (df['receiving_rec'] * league['receiving_rec']
+            + df['receiving_yds'] * league['receiving_yds']
+            + df['receiving_td'] * league['receiving_td']
+            + df['rushing_yds'] * league['rushing_yds']
+            + df['rushing_td'] * league['rushing_td']
+            + df['passing_yds'] * league['passing_yds']
+            + df['passing_td'] * league['passing_td']
+            + df['passing_int'] * league['passing_int']
+            + df['fumbles'] * league['fumbles'])
+
+def legacy_pro_football_reference_pts(df, league):
+    """The per-column formula config.pro_football_reference_pts used before scoring.py"""
+    return legacy_fantasy_pros_pts(df, league) + df['fumbles_lost'] * league['fumbles_lost']
+
+class TestLeaguePoints(unittest.TestCase):
+    def setUp(self):
+        self.stats = make_stats()
+        weekly = pd.read_csv(GAME_BY_GAME_DIR / '2023_weekly.csv')
+        weekly.columns = [col.lower() for col in weekly.columns]
+        self.frames = {'synthetic': self.stats, 'game-by-game': weekly}
+
+    def test_matches_the_per_column_formulas(self):
+        formulas = {'fantasy_pros': (scoring.FANTASY_PROS_STATS, legacy_fantasy_pros_pts, config.fantasy_pros_pts),
+                    'pro_football_reference': (scoring.PRO_FOOTBALL_REFERENCE_STATS, legacy_pro_football_reference_pts,
+                                               config.pro_football_reference_pts)}
+        for frame_name, df in self.frames.items():
+            for source, (stats, legacy, config_pts) in formulas.items():
+                points = scoring.league_points(df, config.scoring_List, stats)
+                for league in config.scoring_List:
+                    with self.subTest(frame=frame_name, source=source, league=league['name']):
+                        col = f'{league["name"]}_custom_pts'
+                        expected = legacy(df, league).astype(np.float64).rename(col)
+                        assert_series_equal(expected, points[col], check_exact=True)
+                        assert_series_equal(expected, config_pts(df, league)[col], check_exact=True)
+
+    def test_missing_stats_give_missing_points(self):
+        points = scoring.league_points(self.stats, config.scoring_List, scoring.PRO_FOOTBALL_REFERENCE_STATS)
+        missing = self.stats[scoring.PRO_FOOTBALL_REFERENCE_STATS].isna().any(axis=1)
+        self.assertTrue(missing.any())
+        for col in points.columns:
+            np.testing.assert_array_equal(missing.to_numpy(), points[col].isna().to_numpy())
+
+    def test_add_league_points(self):
+        before = self.stats.copy()
+        df = scoring.add_league_points(self.stats, config.scoring_List[:2])
+        assert_frame_equal(before, self.stats)
+        self.assertEqual(list(before.columns) + ['sean_custom_pts', 'justin_custom_pts'], list(df.columns))
+        # points already on the frame are replaced where they are
+        df = scoring.add_league_points(df.assign(sean_custom_pts=0.0), config.scoring_List,
+                                       scoring.PRO_FOOTBALL_REFERENCE_STATS)
+        self.assertEqual(list(before.columns) + ['sean_custom_pts', 'justin_custom_pts', 'work_custom_pts'],
+                         list(df.columns))
+        assert_series_equal(legacy_pro_football_reference_pts(before, config.sean).astype(np.float64),
+                            df['sean_custom_pts'], check_names=False, check_exact=True)
+
+    def test_undeclared_stats_weigh_nothing(self):
+        weights = scoring.scoring_weights([{'name': 'tiny', 'passing_td': 4}, config.sean], ['passing_td', 'rushing_td'])
+        self.assertEqual([4.0, 0.0], weights['tiny'].tolist())
+        self.assertEqual([6.0, 6.0], weights['sean'].tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+import pandas as pd
+from fantasyfootball import config, seasonsim
+
+POS = ['QB', 'QB', 'RB', 'RB', 'RB', 'WR', 'WR', 'WR', 'WR', 'TE', 'TE', 'DST', 'K']
+
+class TestSeasonSim(unittest.TestCase):
+    def test_optimal_points_match_the_starter_mask(self):
+        scores = np.random.default_rng(0).gamma(2, 5, (200, 17, len(POS))).astype(np.float32)
+        for league in (config.sean, config.work):
+            expected = np.where(seasonsim.starter_mask(scores, POS, league), scores, 0).sum(axis=-1)
+            np.testing.assert_allclose(expected, seasonsim.optimal_points(scores, POS, league), rtol=1e-5)
+
+    def test_starter_mask_fills_every_slot(self):
+        mask = seasonsim.starter_mask(np.arange(len(POS), dtype=float), POS, config.work)
+        starters = pd.Series(POS)[mask].value_counts().to_dict()
+        # 1 RB, 2 WR and 1 TE, plus the two best of the bench (TE 10 and WR 7) in the flex slots
+        self.assertEqual({'QB': 1, 'RB': 1, 'WR': 3, 'TE': 2, 'DST': 1, 'K': 1}, starters)
+
+    def test_fixed_scores_with_bye_weeks(self):
+        dist = pd.DataFrame({'player_name': POS, 'pos': POS, 'mean': np.arange(1, len(POS) + 1, dtype=float),
+                             'std': 0.0, 'bye': np.nan})
+        summary = seasonsim.simulate_season(dist, config.sean, n_sims=10, weeks=4, lineup='projected')
+        starters = seasonsim.starter_mask(dist['mean'].to_numpy(), POS, config.sean)
+        expected = 4 * dist['mean'][starters].sum()
+        self.assertAlmostEqual(expected, summary['mean'], places=3)
+        self.assertAlmostEqual(0.0, summary['std'], places=3)
+
+        # the backup QB starts in the starter's bye week
+        bye = dist.assign(bye=np.where(np.arange(len(POS)) == 1, 3, np.nan))
+        summary = seasonsim.simulate_season(bye, config.sean, n_sims=10, weeks=4, lineup='projected')
+        self.assertAlmostEqual(expected - dist.at[1, 'mean'] + dist.at[0, 'mean'], summary['mean'], places=3)
+
+    def test_optimal_beats_projected(self):
+        dist = pd.DataFrame({'player_name': POS, 'pos': POS, 'mean': 10.0, 'std': 4.0, 'bye': np.nan})
+        projected = seasonsim.simulate_season(dist, config.sean, n_sims=2_000, lineup='projected')
+        optimal = seasonsim.simulate_season(dist, config.sean, n_sims=2_000, lineup='optimal')
+        self.assertGreater(optimal['mean'], projected['mean'])
+
+    def test_roster_distribution_falls_back_on_history(self):
+        roster = pd.DataFrame({'id': ['a', 'b', 'c'], 'player_name': ['A', 'B', 'C'], 'pos': ['RB', 'WR', 'TE'],
+                               'sean_custom_pts': [170.0, np.nan, np.nan]})
+        weekly = pd.DataFrame({'2023_avg_ppg': [12.0, 8.0], '2023_std_dev': [5.0, 4.0]}, index=pd.Index(['a', 'b'], name='id'))
+        dist = seasonsim.roster_distribution(roster, config.sean, weekly)
+        self.assertEqual([10.0, 8.0, 0.0], dist['mean'].tolist())
+        self.assertEqual([5.0, 4.0, 0.0], dist['std'].tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from pandas.testing import assert_frame_equal
+from fantasyfootball import tiering
+from fixtures import make_grouped_ecr
+
+def brute_force_sse(values, k):
+    """Lowest total within-group sum of squares over contiguous splits of the sorted values, by the O(k n^2) DP"""
+    x = np.sort(values)
+    n = len(x)
+    sse = lambda i, j: ((x[i:j + 1] - x[i:j + 1].mean()) ** 2).sum()
+    cost = [sse(0, j) for j in range(n)]
+    for m in range(1, k):
+        cost = [min(cost[i - 1] + sse(i, j) for i in range(m, j + 1)) if j >= m else np.inf for j in range(n)]
+    return cost[-1]
+
+class TestTiering(unittest.TestCase):
+    def setUp(self):
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.cache_dir = tempdir.name
+        self.cache = tiering.ModelCache(self.cache_dir)
+        self.df = make_grouped_ecr()
+
+    def test_diagnostics_cover_every_position_and_k(self):
+        diagnostics = tiering.tier_diagnostics(self.df, range(1, 6), pos_n={'QB': 12, 'RB': 30, 'WR': 30, 'TE': 3},
+                                               cache=self.cache)
+        self.assertEqual({'QB': 5, 'RB': 5, 'WR': 5, 'TE': 3}, diagnostics.groupby('pos')['k'].count().to_dict())
+        self.assertEqual(12, diagnostics.loc[diagnostics['pos'] == 'QB', 'n'].iloc[0])
+
+    def test_bic_selects_the_separated_groups(self):
+        diagnostics = tiering.tier_diagnostics(self.df, range(1, 7), clf='kmeans', cache=self.cache)
+        self.assertEqual({'QB': 3, 'RB': 3, 'WR': 3, 'TE': 3}, tiering.select_k(diagnostics))
+
+    def test_select_k_minimizes_the_criterion(self):
+        diagnostics = tiering.tier_diagnostics(self.df, range(1, 7), cache=self.cache)
+        for p, k in tiering.select_k(diagnostics, 'aic').items():
+            rows = diagnostics.loc[diagnostics['pos'] == p]
+            self.assertEqual(rows['aic'].min(), rows.loc[rows['k'] == k, 'aic'].iloc[0])
+
+    def test_reruns_come_from_the_cache(self):
+        first = tiering.tier_diagnostics(self.df, range(1, 5), cache=self.cache)
+        with mock.patch.object(tiering, '_fit') as fit:
+            assert_frame_equal(first, tiering.tier_diagnostics(self.df, range(1, 5), cache=tiering.ModelCache(self.cache_dir)))
+        fit.assert_not_called()
+
+    def test_cache_keeps_the_most_recently_used_entries(self):
+        cache = tiering.ModelCache(self.cache_dir, max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(2, len(cache))
+        self.assertEqual(2, len([f for f in os.listdir(self.cache_dir) if f.endswith('.pkl')]))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.get('c'))
+
+    def test_process_pool_matches_serial_fits(self):
+        serial = tiering.tier_diagnostics(self.df, range(1, 4), workers=1, cache=tiering.ModelCache())
+        pooled = tiering.tier_diagnostics(self.df, range(1, 4), workers=2, cache=tiering.ModelCache())
+        assert_frame_equal(serial, pooled)
+
+    def test_assign_tiers(self):
+        tiered, diagnostics = tiering.assign_tiers(self.df, tier_dict={'QB': 2}, ks=range(1, 6), pos_n=24, clf='kmeans',
+                                                     cache=self.cache)
+        self.assertEqual(2, tiered.loc[tiered['pos'] == 'QB', 'pos_tiers'].max())
+        self.assertEqual(3, tiered.loc[tiered['pos'] == 'RB', 'pos_tiers'].max())
+        self.assertEqual(1, tiered.loc[tiered['pos'] == 'WR', 'pos_tiers'].iloc[0])
+        self.assertEqual(6, tiered.loc[tiered['pos'] == 'WR', 'pos_tiers'].isna().sum())
+        self.assertEqual(4, diagnostics['selected'].sum())
+
+    def test_assign_tier_to_df_fits_every_position_in_one_batch(self):
+        from fantasyfootball import tiers
+        self.enterContext(mock.patch.object(tiering, 'model_cache', self.cache))
+        with mock.patch.object(tiering, 'fit_many', wraps=tiering.fit_many) as fit_many:
+            tiered = tiers.assign_tier_to_df(self.df, tier_dict={'QB': 3, 'RB': 4, 'WR': 3, 'TE': 2}, pos_n=24)
+        fit_many.assert_called_once()
+        self.assertEqual(4, len(fit_many.call_args.args[0]))
+        for p, k in {'QB': 3, 'RB': 4, 'WR': 3, 'TE': 2}.items():
+            pos_df = tiered.loc[tiered['pos'] == p]
+            labels = tiering.fit_labels(pos_df[tiering.FEATURES].head(24), k, cache=self.cache)
+            np.testing.assert_array_equal(tiering.rank_labels(labels), pos_df['pos_tiers'].head(24), p)
+            self.assertTrue(pos_df['pos_tiers'].iloc[24:].isna().all())
+
+class TestCkmeans(unittest.TestCase):
+    def test_matches_the_brute_force_optimum(self):
+        rng = np.random.default_rng(1)
+        for n, k in [(12, 3), (25, 5), (40, 8), (9, 9)]:
+            values = rng.gamma(2, 30, n)
+            labels = tiering.ckmeans(values, k)
+            sse = sum(((values[labels == g] - values[labels == g].mean()) ** 2).sum() for g in range(k))
+            self.assertAlmostEqual(brute_force_sse(values, k), sse, places=6)
+
+    def test_groups_are_contiguous_and_ordered(self):
+        values = np.random.default_rng(2).permutation(np.linspace(1, 200, 60)) ** 1.3
+        labels = tiering.ckmeans(values, 6)
+        self.assertTrue((np.diff(labels[np.argsort(values, kind='stable')]) >= 0).all())
+        self.assertEqual(list(range(6)), sorted(set(labels)))
+
+    def test_deterministic_with_ties(self):
+        values = np.array([5, 1, 1, 1, 9, 9, 5, 20, 1, 9], dtype=float)
+        labels = tiering.ckmeans(values, 4)
+        np.testing.assert_array_equal(labels, tiering.ckmeans(values, 4))
+        self.assertEqual([0, 0, 0, 0], list(labels[values == 1]))
+        self.assertEqual(4, len(set(labels)))
+
+    def test_k_larger_than_the_data(self):
+        np.testing.assert_array_equal([1, 0, 2], tiering.ckmeans([3.0, 1.0, 7.0], 10))
+
+    def test_fit_requires_one_feature(self):
+        self.assertEqual(4, tiering._fit(make_grouped_ecr()[['avg']].to_numpy(), 4, 'ckmeans', 'diag', 0)['labels'].max() + 1)
+        with self.assertRaises(ValueError):
+            tiering._fit(make_grouped_ecr()[['avg', 'best']].to_numpy(), 4, 'ckmeans', 'diag', 0)
+
+    def test_assign_tier_to_df_preserves_rank_order(self):
+        from fantasyfootball import tiers
+        df = make_grouped_ecr(3)
+        self.enterContext(mock.patch.object(tiering, 'model_cache', tiering.ModelCache()))
+        tiered = tiers.assign_tier_to_df(df, tier_dict=4, pos_n=30, method='ckmeans')
+        for p, pos_df in tiered.groupby('pos'):
+            pos_tiers = pos_df.sort_values('avg')['pos_tiers'].dropna()
+            self.assertEqual(1, pos_tiers.iloc[0])
+            self.assertTrue((pos_tiers.diff().dropna() >= 0).all(), p)
+        assert_frame_equal(tiered, tiers.assign_tier_to_df(df, tier_dict=4, pos_n=30, method='ckmeans'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt
+from matplotlib.collections import LineCollection, PathCollection
+import numpy as np
+from fantasyfootball import tiering, tiers
+from fixtures import make_ecr
+
+class TestDrawTierRanges(unittest.TestCase):
+    def setUp(self):
+        df = make_ecr(seed=1)
+        self.df = df.loc[df['pos'] == 'RB'].head(30).assign(pos_tiers=lambda x: np.repeat([1, 2, 3], 10),
+                                                            y=np.arange(1, 31))
+        self.fig, self.ax = plt.subplots()
+        self.addCleanup(plt.close, self.fig)
+
+    def test_batched_artists(self):
+        first = self.df['player_name'].iloc[0]
+        artists = tiers.draw_tier_ranges(self.ax, self.df, 'y', {1: 'red', 2: 'blue'}, highlight=[first])
+        ranges = next(artist for artist in artists if isinstance(artist, LineCollection))
+        self.assertEqual(30, len(ranges.get_segments()))
+        np.testing.assert_allclose(self.df[['best', 'y']].to_numpy(), [segment[0] for segment in ranges.get_segments()])
+        # the third tier has no color and falls back on the default
+        self.assertEqual(3, len(np.unique(ranges.get_colors(), axis=0)))
+        # the scatters share one marker path; the labels are a collection with a text path per player
+        labels = next(artist for artist in artists if isinstance(artist, PathCollection) and len(artist.get_paths()) > 1)
+        self.assertEqual(29, len(labels.get_paths()))
+        np.testing.assert_allclose(self.df['worst'].iloc[1:] + 1, labels.get_offsets()[:, 0])
+        self.assertEqual([first], [text.get_text() for text in self.ax.texts])
+        self.assertLess(len(self.ax.get_children()), 20)
+        self.fig.canvas.draw()
+
+    def test_markers_split_the_average_ranks(self):
+        markers = np.where(np.arange(30) % 2, 'o', 's')
+        tiers.draw_tier_ranges(self.ax, self.df, 'y', {1: 'red'}, labels=self.df['player_name'] + ' (RB)', markers=markers)
+        self.assertEqual(4, len(self.ax.collections) - 1)
+
+    def test_make_clustering_viz_from_a_frame(self):
+        df = make_ecr()
+        cache = tiering.ModelCache()
+        with mock.patch.object(tiering, 'model_cache', cache):
+            for clf in ('gmm', 'ckmeans'):
+                tiers.make_clustering_viz(tier_dict={'QB': 4, 'TE': 3}, pos_n=20, clf=clf, save=False, df=df)
+        # both positions of both classifiers were fitted through the model cache
+        self.assertEqual(4, len(cache._entries))
+        # the frame passed in is left as it was
+        self.assertTrue(df['pos_rank'].str.match('[A-Z]+[0-9]+').all())
+        self.assertNotIn('pos_tiers', df)
+        plt.close('all')
+
+    def test_charts_and_tables_number_the_tiers_alike(self):
+        df = make_ecr()
+        # swap the top and an eleventh player's averages so that the first row falls in a later ckmeans group
+        qb = df.index[df['pos'] == 'QB']
+        df.loc[qb[[0, 10]], 'avg'] = df.loc[qb[[10, 0]], 'avg'].to_numpy()
+        self.enterContext(mock.patch.object(tiering, 'model_cache', tiering.ModelCache()))
+        for clf in ('gmm', 'ckmeans'):
+            with mock.patch.object(tiers, 'draw_tier_ranges') as draw:
+                tiers.make_clustering_viz(tier_dict={'QB': 4}, pos_n=20, clf=clf, save=False, df=df)
+            charted = draw.call_args.args[1]['pos_tiers'].to_numpy()
+            tiered = tiers.assign_tier_to_df(df, tier_dict={'QB': 4}, pos_n=20, method=clf)
+            np.testing.assert_array_equal(charted, tiered.loc[tiered['pos'] == 'QB', 'pos_tiers'].head(20), clf)
+        plt.close('all')
+
+    def test_make_clustering_viz_closes_saved_figures(self):
+        open_before = plt.get_fignums()
+        self.enterContext(mock.patch.object(tiering, 'model_cache', tiering.ModelCache()))
+        with tempfile.TemporaryDirectory() as figure_dir, mock.patch.object(tiers, 'FIGURE_DIR', figure_dir):
+            tiers.make_clustering_viz(tier_dict={'QB': 4, 'TE': 3}, pos_n=20, clf='ckmeans', df=make_ecr())
+            self.assertEqual(2, len(os.listdir(figure_dir)))
+        self.assertEqual(open_before, plt.get_fignums())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,227 @@
+import unittest
+from unittest import mock
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+import fantasyfootball.schemas  # Register schemas
+from fantasyfootball.factories.schema_factory import SchemaFactory
+from fantasyfootball.transformers.fantasypros_transformer import RankingsTransfomer
+from fantasyfootball.transformers.profootballreference_transformer import GameByGameTransformer, YearByYearTransformer
+from fantasyfootball.transformers.transform_plan import TransformPlan, is_fillable
+
+DATA_DIR = Path(__file__).resolve().parents[1] / 'data'
+
+class EagerSteps:
+    """The copy-per-step BaseTransformer methods that ran before the steps were queued on a TransformPlan"""
+
+    @property
+    def dataframe(self):
+        return self._dataframe
+
+    @dataframe.setter
+    def dataframe(self, dataframe):
+        self._dataframe = dataframe
+
+    @property
+    def columns(self):
+        return list(self._dataframe.columns)
+
+    def _rename_columns(self, rename_map):
+        self.dataframe = self.dataframe.rename(columns=rename_map)
+        return self
+
+    def _drop_columns(self, columns=None):
+        if columns:
+            self.dataframe = self.dataframe.drop(columns=columns)
+        return self
+
+    def _reindex_and_fill(self, column_order, fill_value=0, dtype_map=None):
+        if list(self.dataframe.columns) != list(column_order):
+            self.dataframe = self.dataframe.reindex(columns=column_order, fill_value=fill_value)
+        if (self.dataframe.dtypes == object).any():
+            self.dataframe = self.dataframe.infer_objects(copy=False)
+        fill_map = {col: fill_value for col, has_na in self.dataframe.isna().any().items()
+                    if has_na and is_fillable(self.dataframe[col].dtype)}
+        if fill_map:
+            self.dataframe = self.dataframe.fillna(fill_map)
+        if self.schema is not None:
+            dtype_map = {**{col: self.schema.dtype_map[col] for col in self.schema.validate(self.dataframe)},
+                         **(dtype_map or {})}
+        if dtype_map:
+            self.dataframe = self.dataframe.astype(dtype_map)
+        return self
+
+    def _drop_rows(self, condition):
+        self.dataframe = self.dataframe.loc[~condition.fillna(False).astype(bool)]
+        return self
+
+    def _drop_invalid_rows(self, col='rk', value=None, condition_type='exact'):
+        if col not in self.dataframe.columns:
+            return self
+        series = self.dataframe[col]
+        condition = {'exact': lambda: series == value,
+                     'contains': lambda: series.astype(str).str.contains(value, na=False),
+                     'na': lambda: series.isna()}[condition_type]()
+        return self._drop_rows(condition)
+
+class EagerYearByYear(EagerSteps, YearByYearTransformer):
+    pass
+
+class EagerGameByGame(EagerSteps, GameByGameTransformer):
+    def _handle_home_away(self):
+        self.dataframe['home/away'] = self.dataframe['home/away'].replace({'@': 'Away'}).fillna('Home')
+        return self
+
+    def _parse_snaps(self):
+        col = 'off. snaps_num'
+        if col in self.dataframe.columns and not pd.api.types.is_numeric_dtype(self.dataframe[col]):
+            self.dataframe[col] = pd.to_numeric(self.dataframe[col], errors='coerce')
+        return self
+
+class EagerRankings(EagerSteps, RankingsTransfomer):
+    pass
+
+def make_year_by_year():
+    """A season table as the datasource parses it, with a repeated header row inside it"""
+    df = (pd.read_csv(DATA_DIR / 'year-by-year' / '2021.csv', nrows=40)
+            .rename(columns={'player_name': 'player', 'pos': 'fantpos', 'year': 'year_', 'games': 'games_g',
+                             'games_started': 'games_gs', 'fumbles': 'fumbles_fmb', 'fumbles_lost': 'fumbles_fl'})
+            .assign(fantasy_fantpt=1.0, fantasy_ppr=2.0, fantasy_dkpt=3.0, fantasy_fdpt=4.0, fantasy_vbd=np.nan))
+    df.loc[:5, 'player'] = df.loc[:5, 'player'].str.strip() + '*+'
+    df.loc[[3, 17], 'receiving_tgt'] = np.nan
+    header = pd.DataFrame([{col: col.split('_')[-1].title() for col in df.columns}]).assign(rk='Rk')
+    return pd.concat([df.iloc[:20], header, df.iloc[20:]], ignore_index=True).astype(str).replace('nan', np.nan)
+
+def make_game_by_game():
+    """Two players' game logs with a season summary row, an inactive game and a game not played"""
+    return pd.DataFrame({
+        'date': ['2023-09-10', '2023-09-17', '2023-09-24', '2023-10-01', '17 Games', '2023-09-10', '2023-09-17'],
+        'week': [1, 2, 3, 4, np.nan, 1, 2],
+        'player_id': ['MahoPa00'] * 5 + ['KelcTr00'] * 2,
+        'player_name': ['Patrick Mahomes'] * 5 + ['Travis Kelce'] * 2,
+        'pos': ['QB'] * 5 + ['TE'] * 2,
+        'year': [2023] * 7,
+        'age': [28.0, 28.0, 28.0, 28.1, np.nan, 33.9, 33.9],
+        'tm': ['KAN'] * 7,
+        '1': [np.nan, '@', np.nan, '@', np.nan, np.nan, '@'],
+        'opp': ['DET', 'JAX', 'CHI', 'NYJ', np.nan, 'DET', 'JAX'],
+        'result': ['L 20-21', 'W 17-9', 'W 41-10', 'W 23-20', np.nan, 'L 20-21', 'W 17-9'],
+        'off. snaps_num': ['64', 'Inactive', '70', 'Did Not Play', '198', 'Inactive', '55'],
+        'passing_cmp': [21, np.nan, 24, np.nan, 45, np.nan, np.nan],
+        'passing_yds': [226, np.nan, 272, np.nan, 498, np.nan, np.nan],
+        'receiving_rec': [np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, 4],
+        'receiving_ctch%': [np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, '80.0%'],
+        'fumbles_fmb': [1, np.nan, 0, np.nan, 1, np.nan, 0],
+        'fumbles_fl': [0, np.nan, 0, np.nan, 0, np.nan, 0],
+    })
+
+def make_rankings():
+    return pd.DataFrame({
+        'rk': [1, 2, 3, 4],
+        'wsis': [np.nan] * 4,
+        'player name': ['Josh Allen (BUF)', 'Jalen Hurts (PHI)', 'Lamar Jackson (BAL)', 'Joe Burrow (CIN)'],
+        'opp': ['vs. NYJ', 'at NE', 'vs. HOU', 'vs. CLE'],
+        'matchup (?)': ['4 out of 5 stars', '3 out of 5 stars', '-', '2 out of 5 stars'],
+        'start/sit': ['A+', 'A', 'B+', 'B'],
+        'proj. fpts': [24.1, 22.3, np.nan, 19.8],
+        'pos': ['QB'] * 4,
+        'as_of_date': ['2023-09-05'] * 4,
+        'year': [2023] * 4,
+        'week': [1] * 4,
+    })
+
+class TestPlannedMatchesEager(unittest.TestCase):
+    def check(self, transformer, eager, raw, schema_name=None):
+        schema = SchemaFactory.create(schema_name) if schema_name else None
+        if schema is not None:
+            raw = schema.apply(raw)
+        expected = eager(schema=schema).transform(dataframe=raw.copy())
+        before = raw.copy()
+        result = transformer(schema=schema).transform(dataframe=raw)
+        assert_frame_equal(before, raw)
+        assert_frame_equal(expected, result, check_dtype=schema is not None)
+        self.assertGreater(len(result), 0)
+        return result
+
+    def test_year_by_year(self):
+        result = self.check(YearByYearTransformer, EagerYearByYear, make_year_by_year())
+        self.assertNotIn('Rk', result['rk'].tolist())
+        self.assertFalse(result['player_name'].str.contains(r'[*+]').any())
+        self.check(YearByYearTransformer, EagerYearByYear, make_year_by_year(), 'prf_year_by_year')
+
+    def test_game_by_game(self):
+        for schema_name in (None, 'prf_game_by_game'):
+            with self.subTest(schema=schema_name):
+                result = self.check(GameByGameTransformer, EagerGameByGame, make_game_by_game(), schema_name)
+                self.assertEqual(['2023-09-10', '2023-09-24', '2023-10-01', '2023-09-17'],
+                                 pd.to_datetime(result['date']).dt.strftime('%Y-%m-%d').tolist())
+                self.assertEqual([1, 0, 0, 0], result['fumbles'].tolist())
+
+    def test_rankings_mask(self):
+        for schema_name in (None, 'fantasy_pros_rankings'):
+            with self.subTest(schema=schema_name):
+                result = self.check(RankingsTransfomer, EagerRankings, make_rankings(), schema_name)
+                self.assertEqual(['Josh Allen', 'Jalen Hurts', 'Joe Burrow'], result['player_name'].tolist())
+
+    def test_game_by_game_runs_the_plan_once(self):
+        executed = []
+        execute = TransformPlan.execute
+        def record(plan, dataframe):
+            if plan:
+                executed.append([kind for kind, _ in plan.steps])
+            return execute(plan, dataframe)
+        with mock.patch.object(TransformPlan, 'execute', record):
+            GameByGameTransformer().transform(dataframe=make_game_by_game())
+        self.assertEqual(1, len(executed))
+        self.assertEqual(['rename', 'map', 'predicate', 'map', 'reindex', 'predicate', 'predicate'], executed[0])
+
+    def test_copy_on_write(self):
+        raw = make_game_by_game()
+        expected = GameByGameTransformer().transform(dataframe=raw.copy())
+        assert_frame_equal(expected, GameByGameTransformer(copy_on_write=True).transform(dataframe=raw))
+
+class TestTransformPlan(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({'a': [1.0, np.nan, 3.0, 4.0], 'b': ['x', 'y', None, 'z'], 'c': [0, 1, 2, 3]})
+
+    def test_steps_resolve_to_one_selection(self):
+        plan = TransformPlan()
+        plan.rename({'a': 'alpha'})
+        plan.drop_columns(['c'])
+        plan.reindex(['b', 'alpha', 'new'], fill_value=0)
+        self.assertEqual(['b', 'alpha', 'new'], plan.columns(self.df))
+        plan.drop_rows_where('alpha', lambda series: series == 0)
+        result = plan.execute(self.df)
+        self.assertFalse(plan)
+        # the predicate sees the filled value of the missing 'alpha'
+        self.assertEqual([0, 2, 3], result.index.tolist())
+        self.assertEqual([0, 0, 0], result['new'].tolist())
+        self.assertEqual(['x', 0, 'z'], result['b'].tolist())
+
+    def test_masks_are_combined(self):
+        plan = TransformPlan()
+        plan.drop_rows(self.df['c'] == 0)
+        plan.drop_rows(pd.Series([pd.NA, True], index=[1, 3], dtype='boolean'))
+        plan.drop_rows_where('b', lambda series: series.isna())
+        assert_frame_equal(self.df.iloc[[1]], plan.execute(self.df))
+
+    def test_maps_are_computed_on_the_input_rows(self):
+        plan = TransformPlan()
+        plan.map_column('b', lambda series: series.fillna('w').str.upper())
+        plan.rename({'b': 'beta'})
+        # the predicate sees the mapped values, and the rows it drops are dropped from them too
+        plan.drop_rows_where('beta', lambda series: series == 'Y')
+        plan.map_column('a', lambda series: series * 10)
+        before = self.df.copy()
+        result = plan.execute(self.df)
+        assert_frame_equal(before, self.df)
+        self.assertEqual(['a', 'beta', 'c'], list(result.columns))
+        self.assertEqual(['X', 'W', 'Z'], result['beta'].tolist())
+        np.testing.assert_array_equal([10.0, 30.0, 40.0], result['a'])
+
+    def test_empty_plan_returns_the_frame(self):
+        self.assertIs(self.df, TransformPlan().execute(self.df))
+
+if __name__ == '__main__':
+    unittest.main()
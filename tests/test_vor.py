@@ -0,0 +1,71 @@
+import glob
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from fantasyfootball import config, vor
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+def legacy_replacement_value(my_df, pos_list, my_dict, method):
+    """The sorted copy and position loop per method the vectorized values must match"""
+    replacement_value = {}
+    my_df = my_df.copy()
+    my_df.sort_values('adp', inplace=True)
+    my_df.reset_index(inplace=True, drop=True)
+    pts = [f'{my_dict["name"]}_custom_pts']
+    for pos in pos_list:
+        if method in ('avg starter', 'last starter'):
+            tdf = my_df.loc[my_df['pos'] == pos.upper(), pts].head(my_dict[pos] * my_dict['team_n'])
+            tdf = tdf if method == 'avg starter' else tdf.tail(3)
+        else:
+            cutoff = (my_dict['rounds'] * my_dict['team_n'] if method == 'replacement player'
+                      else {10: 100, 12: 120, 14: 140}.get(my_dict['team_n'], 100))
+            tdf = my_df.head(cutoff)
+            tdf = tdf.loc[tdf['pos'] == pos.upper(), pts].tail(3)
+        replacement_value[pos.upper()] = float(np.mean(tdf))
+    return replacement_value
+
+class TestReplacementValues(unittest.TestCase):
+    def assert_matches_legacy(self, df, league):
+        values = vor.replacement_values(df, league, vor.POS_LIST)
+        for method in vor.METHODS:
+            expected = legacy_replacement_value(df, vor.POS_LIST, league, method)
+            np.testing.assert_allclose(list(expected.values()), values[method].to_numpy(), rtol=1e-12)
+            self.assertEqual(list(expected), list(values.index))
+
+    def test_matches_legacy_on_synthetic_pools(self):
+        rng = np.random.default_rng(0)
+        for league in config.scoring_List:
+            for n_players in (30, 200, 600):
+                df = pd.DataFrame({
+                    'adp': rng.integers(1, n_players, n_players).astype(float),
+                    'pos': rng.choice(['QB', 'RB', 'WR', 'TE', 'DST', 'K'], n_players),
+                    f'{league["name"]}_custom_pts': rng.gamma(4, 40, n_players),
+                })
+                df.loc[rng.choice(n_players, 5, replace=False), f'{league["name"]}_custom_pts'] = np.nan
+                df.loc[rng.choice(n_players, 5, replace=False), 'adp'] = np.nan
+                self.assert_matches_legacy(df, league)
+
+    def test_matches_legacy_on_draft_history(self):
+        for file_path in sorted(glob.glob(os.path.join(DATA_DIR, 'vor', '*.csv'))):
+            name = os.path.basename(file_path).split('_')[1]
+            league = next(league for league in config.scoring_List if league['name'] == name)
+            df = pd.read_csv(file_path).rename(columns={'custom_points': f'{name}_custom_pts'})
+            self.assert_matches_legacy(df, league)
+
+    def test_missing_position_is_nan(self):
+        df = pd.DataFrame({'adp': [1.0, 2.0], 'pos': ['QB', 'RB'], 'ppr_custom_pts': [300.0, 200.0]})
+        values = vor.replacement_values(df, config.ppr)
+        self.assertTrue(values.loc[['WR', 'TE']].isna().all().all())
+        self.assertEqual(300.0, values.loc['QB', 'avg starter'])
+
+    def test_value_over_replacement_columns(self):
+        df = pd.DataFrame({'adp': [1.0, 2.0, 3.0], 'pos': ['QB', 'QB', 'K'], 'ppr_custom_pts': [300.0, 200.0, 100.0]})
+        result = vor.value_over_replacement(df, config.ppr)
+        self.assertEqual(['vor_avg_starter', 'vor_top_n', 'vor_replacement_player', 'vor_last_starter'], list(result.columns[3:]))
+        self.assertEqual([50.0, -50.0], result['vor_avg_starter'].head(2).tolist())
+        self.assertTrue(np.isnan(result.loc[2, 'vor_avg_starter']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import functools
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from fantasyfootball import archive, config, draft, weeklypoints
+
+DATA_DIR = Path(__file__).resolve().parents[1] / 'data' / 'game-by-game'
+
+class TestWeeklyPoints(unittest.TestCase):
+    def setUp(self):
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.data_dir = os.path.join(tempdir.name, 'game-by-game')
+        self.directory = os.path.join(tempdir.name, 'weekly-points')
+        self.enterContext(mock.patch.object(archive, 'ARCHIVE_CACHE_DIR', os.path.join(tempdir.name, 'archive')))
+        os.makedirs(self.data_dir)
+        for year in (2022, 2023):
+            shutil.copy(DATA_DIR / f'{year}_weekly.csv', self.data_dir)
+
+    def test_build_matches_per_season_csv(self):
+        table = weeklypoints.build_weekly_points(weeklypoints.read_game_by_game(self.data_dir), leagues=[config.sean])
+        df = pd.read_csv(DATA_DIR / '2023_weekly.csv')
+        df.columns = [col.lower() for col in df.columns]
+        expected = (df.pipe(config.unique_id_create)
+                      .pipe(config.pro_football_reference_pts, config.sean)
+                      .sort_values(['player_id', 'week'], kind='stable'))
+        season = table.loc[table['year'] == 2023]
+        np.testing.assert_allclose(expected['sean_custom_pts'], season['sean_custom_pts'])
+        first = season.loc[season['player_id'] == season['player_id'].iloc[0], 'sean_custom_pts']
+        np.testing.assert_allclose(first.mean(), season['sean_custom_pts_season_avg'].iloc[0])
+        np.testing.assert_allclose(first.head(3).mean(), season['sean_custom_pts_form_3'].iloc[2])
+
+    def test_save_load_and_staleness(self):
+        self.assertTrue(weeklypoints.is_stale(self.data_dir, self.directory))
+        table = weeklypoints.save_weekly_points(self.data_dir, self.directory, leagues=[config.sean])
+        self.assertFalse(weeklypoints.is_stale(self.data_dir, self.directory, leagues=[config.sean]))
+        loaded = weeklypoints.load_weekly_points(['id', 'sean_custom_pts'], self.directory, self.data_dir,
+                                                 leagues=[config.sean])
+        self.assertEqual(table['id'].tolist(), loaded['id'].astype(object).tolist())
+        np.testing.assert_allclose(table['sean_custom_pts'], loaded['sean_custom_pts'])
+
+        shutil.copy(DATA_DIR / '2021_weekly.csv', self.data_dir)
+        self.assertTrue(weeklypoints.is_stale(self.data_dir, self.directory))
+        with mock.patch.object(weeklypoints, 'save_weekly_points', wraps=weeklypoints.save_weekly_points) as save:
+            weeklypoints.load_weekly_points(['year'], self.directory, self.data_dir)
+        save.assert_called_once()
+
+    def test_scoring_changes_make_the_table_stale(self):
+        weeklypoints.save_weekly_points(self.data_dir, self.directory, leagues=[config.sean])
+        self.assertTrue(weeklypoints.is_stale(self.data_dir, self.directory, leagues=[config.sean, config.work]))
+        self.assertTrue(weeklypoints.is_stale(self.data_dir, self.directory, leagues=[config.sean], windows=(3, 5)))
+        rescored = {**config.sean, 'receiving_rec': config.sean['receiving_rec'] + 0.5}
+        self.assertTrue(weeklypoints.is_stale(self.data_dir, self.directory, leagues=[rescored]))
+        # settings that are not scoring weights do not matter
+        self.assertFalse(weeklypoints.is_stale(self.data_dir, self.directory, leagues=[{**config.sean, 'team_n': 14}]))
+
+        loaded = weeklypoints.load_weekly_points(['sean_custom_pts'], self.directory, self.data_dir, leagues=[rescored])
+        self.assertFalse(weeklypoints.is_stale(self.data_dir, self.directory, leagues=[rescored]))
+        table = weeklypoints.build_weekly_points(weeklypoints.read_game_by_game(self.data_dir), leagues=[rescored])
+        np.testing.assert_allclose(table['sean_custom_pts'], loaded['sean_custom_pts'])
+
+    def test_source_fingerprint_follows_the_files_and_the_scoring(self):
+        fingerprint = weeklypoints.source_fingerprint(self.data_dir, leagues=[config.sean])
+        self.assertEqual(fingerprint, weeklypoints.source_fingerprint(self.data_dir, leagues=[config.sean]))
+        self.assertNotEqual(fingerprint, weeklypoints.source_fingerprint(self.data_dir, leagues=[config.work]))
+        file_path = sorted(glob.glob(os.path.join(self.data_dir, '*.csv')))[0]
+        os.utime(file_path, (0, os.path.getmtime(file_path) + 60))
+        self.assertNotEqual(fingerprint, weeklypoints.source_fingerprint(self.data_dir, leagues=[config.sean]))
+
+    def test_season_summary_matches_draft(self):
+        summary = weeklypoints.season_summary(config.sean, 2023, self.directory, self.data_dir)
+        expected = (pd.read_csv(DATA_DIR / '2023_weekly.csv')
+                      .pipe(draft.transform_weekly_stats, config.sean)
+                      .pipe(draft.aggregate_weekly_stats, config.sean, 2023))
+        assert_frame_equal(expected, summary.loc[expected.index], check_index_type=False)
+
+    def test_season_summary_without_the_year_or_league(self):
+        self.assertIsNone(weeklypoints.season_summary(config.sean, 2019, self.directory, self.data_dir))
+        self.assertIsNone(weeklypoints.season_summary({'name': 'nobody'}, 2023, self.directory, self.data_dir))
+
+    def test_get_weekly_data_falls_back_on_the_csv(self):
+        season_summary = functools.partial(weeklypoints.season_summary, directory=self.directory,
+                                           data_dir=self.data_dir)
+        with mock.patch.object(weeklypoints, 'season_summary', season_summary), \
+             mock.patch.object(weeklypoints, 'GAME_BY_GAME_DIR', str(DATA_DIR)):
+            weekly = draft.get_weekly_data(league=config.sean, year=2019)
+            # the fallback reads the requested season, not the draft's default one
+            expected = draft.get_weekly_data(str(DATA_DIR / '2019_weekly.csv'), league=config.sean, year=2019)
+            assert_frame_equal(expected, weekly)
+            with self.assertRaises(FileNotFoundError):
+                draft.get_weekly_data(league=config.sean, year=1999)
+        self.assertEqual(['2019_avg_ppg', '2019_std_dev'], weekly.columns.tolist())
+        self.assertGreater(len(weekly), 0)
+
+if __name__ == '__main__':
+    unittest.main()